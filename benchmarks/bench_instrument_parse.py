@@ -0,0 +1,76 @@
+"""
+Compare the legacy whole-body instruments CSV parse with the streaming parser.
+
+    python -m benchmarks.bench_instrument_parse [--rows 200000]
+"""
+import argparse
+import asyncio
+import csv
+import random
+import tempfile
+import time
+import tracemalloc
+from io import StringIO
+from pathlib import Path
+
+from src.tradingai.repository.instrument_repository import parse_instrument_stream, READ_CHUNK_SIZE
+
+HEADER = "instrument_token,exchange_token,tradingsymbol,name,last_price,expiry,strike,tick_size,lot_size,instrument_type,segment,exchange"
+SEGMENTS = [("NSE", "NSE", "EQ"), ("BSE", "BSE", "EQ"), ("NFO-OPT", "NFO", "CE"), ("NFO-FUT", "NFO", "FUT"), ("MCX-OPT", "MCX", "PE")]
+
+def write_fixture(path: Path, rows: int, seed: int = 42) -> None:
+    """Write a synthetic Kite instruments dump with roughly the real segment mix"""
+    rng = random.Random(seed)
+    with path.open("w", newline="") as f:
+        f.write(HEADER + "\n")
+        for i in range(rows):
+            segment, exchange, instrument_type = SEGMENTS[0] if i % 12 == 0 else rng.choice(SEGMENTS[1:])
+            symbol = f"SYM{i}"
+            name = f"\"COMPANY {i}, LTD\"" if i % 7 == 0 else f"COMPANY {i}"
+            f.write(f"{256 * i + 1},{i},{symbol},{name},0,,0,0.05,1,{instrument_type},{segment},{exchange}\n")
+
+def legacy_parse(text: str) -> int:
+    """The previous implementation: whole body in memory, DictReader over every row"""
+    count = 0
+    for row in csv.DictReader(StringIO(text)):
+        if row['segment'] in ['NSE']:
+            count += 1
+    return count
+
+async def file_chunks(path: Path):
+    with path.open("rb") as f:
+        while chunk := f.read(READ_CHUNK_SIZE):
+            yield chunk
+
+async def streaming_parse(path: Path) -> int:
+    count = 0
+    async for batch in parse_instrument_stream(file_chunks(path)):
+        count += len(batch)
+    return count
+
+def measure(label: str, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<10} rows={result:<8} time={elapsed:.3f}s peak_mem={peak / 1e6:.1f}MB")
+    return elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--fixture", type=Path, default=None)
+    args = parser.parse_args()
+
+    fixture = args.fixture or Path(tempfile.gettempdir()) / f"kite_instruments_{args.rows}.csv"
+    if not fixture.exists():
+        write_fixture(fixture, args.rows)
+    print(f"Fixture: {fixture} ({fixture.stat().st_size / 1e6:.1f}MB)")
+
+    measure("legacy", lambda: legacy_parse(fixture.read_text()))
+    measure("streaming", lambda: asyncio.run(streaming_parse(fixture)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Ingestion-loop throughput with the legacy logging setup (synchronous sinks,
+file at DEBUG, eager f-strings) versus setup_logging (enqueued sinks, lazy
+arguments, hot-path messages at DEBUG).
+
+    python -m benchmarks.bench_logging [--symbols 200] [--candles 250]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from loguru import logger
+from sqlalchemy import select
+
+from src.tradingai.config.logging import FILE_FORMAT, CONSOLE_FORMAT, LoggingConfig, setup_logging
+from src.tradingai.domain.models import StockData
+
+BATCH_SIZE = 100
+
+def make_candles(count: int):
+    start = datetime(2024, 1, 1)
+    return [
+        {"timestamp": start + timedelta(days=i), "open": 100.0, "high": 101.0, "low": 99.0, "close": 100.5, "volume": 1000}
+        for i in range(count)
+    ]
+
+def legacy_ingest(symbols, candles) -> int:
+    """Log calls as they were in StockService/StockRepository before the overhaul"""
+    stored = 0
+    logger.info(f"Fetching historical data for symbols: {symbols}")
+    for symbol in symbols:
+        logger.info(f"Found token 12345 for {symbol}")
+        logger.info(f"Processing symbol: {symbol}")
+        query = select(StockData).where(StockData.symbol == symbol)
+        logger.debug(f"Query: {query}")
+        logger.info(f"Found 0 existing records for {symbol}")
+        logger.debug(f"Received {len(candles)} records from Zerodha")
+        values = [{"symbol": symbol, **c} for c in candles]
+        logger.info(f"Skipped 0 existing records for {symbol}")
+        logger.info(f"Inserting {len(values)} new records for {symbol}")
+        for i in range(0, len(values), BATCH_SIZE):
+            batch = values[i:i + BATCH_SIZE]
+            stored += len(batch)
+            logger.info(f"Successfully inserted batch of {len(batch)} records")
+        logger.info(f"Completed processing {len(values)} new records for {symbol}")
+    return stored
+
+def current_ingest(symbols, candles) -> int:
+    """Log calls as they are now"""
+    stored = 0
+    logger.info("Fetching historical data for {} symbols", len(symbols))
+    for symbol in symbols:
+        logger.debug("Found token {} for {}", 12345, symbol)
+        logger.debug("Processing symbol: {}", symbol)
+        query = select(StockData).where(StockData.symbol == symbol)
+        logger.opt(lazy=True).debug("Query: {}", lambda: str(query))
+        logger.debug("Found {} existing records for {}", 0, symbol)
+        logger.debug("Received {} records from Zerodha", len(candles))
+        values = [{"symbol": symbol, **c} for c in candles]
+        logger.debug("Skipped {} existing records for {}", 0, symbol)
+        logger.debug("Inserting {} new records for {}", len(values), symbol)
+        for i in range(0, len(values), BATCH_SIZE):
+            batch = values[i:i + BATCH_SIZE]
+            stored += len(batch)
+            logger.debug("Inserted batch of {} records", len(batch))
+        logger.info("Stored {} new records for {}", len(values), symbol)
+    return stored
+
+def legacy_logging(log_file: Path, console) -> None:
+    logger.remove()
+    logger.add(console, format=CONSOLE_FORMAT, level="INFO")
+    logger.add(log_file, format=FILE_FORMAT, level="DEBUG")
+
+def measure(label: str, configure, ingest, symbols, candles) -> None:
+    configure()
+    start = time.perf_counter()
+    stored = ingest(symbols, candles)
+    elapsed = time.perf_counter() - start
+    logger.complete()
+    print(f"{label:<8} rows={stored:<8} time={elapsed:.3f}s throughput={stored / elapsed:,.0f} rows/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--candles", type=int, default=250)
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i}" for i in range(args.symbols)]
+    candles = make_candles(args.candles)
+    tmp = Path(tempfile.mkdtemp())
+    with open(os.devnull, "w") as console:
+        measure("legacy", lambda: legacy_logging(tmp / "legacy.log", console), legacy_ingest, symbols, candles)
+        measure("current", lambda: setup_logging(LoggingConfig(file=str(tmp / "current.log")), console=console),
+                current_ingest, symbols, candles)
+    logger.remove()
+
+if __name__ == "__main__":
+    main()
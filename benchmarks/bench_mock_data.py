@@ -0,0 +1,56 @@
+"""
+Mock candle generation: the legacy per-candle loop versus the vectorized
+generator, for one-minute candles over a year.
+
+    python -m benchmarks.bench_mock_data [--symbols 20] [--year 2024]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from src.tradingai.repository.mock_data import generate_candles
+
+def legacy_generate(from_date: datetime, to_date: datetime) -> int:
+    """The nested-loop generator as it was before vectorization"""
+    candles = []
+    current_date = from_date
+    base_price = 1700.0
+    while current_date <= to_date:
+        if current_date.weekday() < 5:
+            current_time = current_date.replace(hour=9, minute=15)
+            trading_end = current_date.replace(hour=15, minute=30)
+            while current_time <= trading_end:
+                variation = base_price * 0.01
+                open_price = base_price + random.uniform(-variation, variation)
+                high_price = open_price + random.uniform(0, variation)
+                low_price = open_price - random.uniform(0, variation)
+                close_price = random.uniform(low_price, high_price)
+                candles.append([
+                    current_time.isoformat(), round(open_price, 2), round(high_price, 2),
+                    round(low_price, 2), round(close_price, 2), random.randint(500, 3000)
+                ])
+                base_price = candles[-1][4]
+                current_time += timedelta(minutes=1)
+        current_date += timedelta(days=1)
+    return len(candles)
+
+def measure(label: str, generate, symbols) -> None:
+    start = time.perf_counter()
+    count = sum(generate(symbol) for symbol in symbols)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} candles={count:<10} time={elapsed:.3f}s throughput={count / elapsed:,.0f} candles/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--year", type=int, default=2024)
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i}" for i in range(args.symbols)]
+    from_date, to_date = datetime(args.year, 1, 1), datetime(args.year, 12, 31, 23, 59)
+    measure("legacy", lambda s: legacy_generate(from_date, to_date), symbols)
+    measure("numpy", lambda s: len(generate_candles(s, from_date, to_date, interval="minute")), symbols)
+
+if __name__ == "__main__":
+    main()
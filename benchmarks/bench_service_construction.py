@@ -0,0 +1,69 @@
+"""
+Per-request cost of building the service graph: the legacy handlers built
+every client from scratch, the container path only wraps shared clients.
+
+    python -m benchmarks.bench_service_construction [--requests 200] [--concurrency 20]
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from src.tradingai.config.settings import settings
+from src.tradingai.container import AppContainer
+from src.tradingai.repository.instrument_repository import InstrumentRepository
+from src.tradingai.repository.zerodha import ZerodhaClient
+from src.tradingai.service.analysis_service import AnalysisService
+from src.tradingai.service.instrument_service import InstrumentService
+from src.tradingai.service.stock_service import StockService
+
+def legacy_request(db) -> StockService:
+    """What /analyze/{symbol}/with-decision used to do on every call"""
+    instrument_service = InstrumentService(db, InstrumentRepository())
+    stock_service = StockService(db, ZerodhaClient(instrument_service))
+    AnalysisService(db)  # /analyze/{symbol} built a second graph the same way
+    return stock_service
+
+def container_request(container: AppContainer, db) -> StockService:
+    stock_service = container.stock_service(db)
+    AnalysisService(db, stock_service)
+    return stock_service
+
+async def run(label: str, handler, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_request():
+        async with semaphore:
+            handler(None)
+            await asyncio.sleep(0)
+
+    handler(None)  # Warm up imports and caches
+    tracemalloc.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<10} requests={requests:<6} per_request={elapsed / requests * 1e3:.3f}ms "
+        f"peak_mem={peak / 1e6:.1f}MB"
+    )
+
+async def main_async(requests: int, concurrency: int):
+    container = AppContainer.create()
+    try:
+        await run("legacy", legacy_request, requests, concurrency)
+        await run("container", lambda db: container_request(container, db), requests, concurrency)
+    finally:
+        await container.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    print(f"LLM model: {settings.LLM_MODEL_NAME}")
+    asyncio.run(main_async(args.requests, args.concurrency))
+
+if __name__ == "__main__":
+    main()
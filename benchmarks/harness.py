@@ -0,0 +1,144 @@
+"""
+Timing, result storage and regression comparison for the benchmark suite.
+"""
+import json
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_THRESHOLD = 0.10  # Flag medians more than 10% slower than the baseline
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    iterations: int
+    items: int  # Work units (rows, symbols, requests) per iteration
+    median_seconds: float
+    p95_seconds: float
+    min_seconds: float
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.median_seconds if self.median_seconds else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.name:<18} median={self.median_seconds * 1e3:10.2f}ms p95={self.p95_seconds * 1e3:10.2f}ms "
+            f"items={self.items:<8} throughput={self.items_per_second:,.0f}/s"
+        )
+
+@dataclass
+class Comparison:
+    name: str
+    baseline_seconds: Optional[float]
+    current_seconds: Optional[float]
+    threshold: float
+
+    @property
+    def change(self) -> Optional[float]:
+        if not self.baseline_seconds or self.current_seconds is None:
+            return None
+        return self.current_seconds / self.baseline_seconds - 1.0
+
+    @property
+    def regressed(self) -> bool:
+        return self.change is not None and self.change > self.threshold
+
+    @property
+    def status(self) -> str:
+        if self.baseline_seconds is None:
+            return "new"
+        if self.current_seconds is None:
+            return "missing"
+        if self.regressed:
+            return "REGRESSION"
+        return "improved" if self.change < -self.threshold else "ok"
+
+async def measure(
+    name: str,
+    run: Callable[[], Awaitable[int]],
+    iterations: int,
+    warmup: int = 1,
+    reset: Optional[Callable[[], Awaitable[None]]] = None
+) -> BenchmarkResult:
+    """
+    Time `run` over several iterations after a warmup. `run` returns the number
+    of items it processed; `reset`, if given, runs untimed before each call.
+    """
+    durations: List[float] = []
+    items = 0
+    for i in range(warmup + iterations):
+        if reset is not None:
+            await reset()
+        start = time.perf_counter()
+        items = await run()
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            durations.append(elapsed)
+    return BenchmarkResult(
+        name=name,
+        iterations=iterations,
+        items=items,
+        median_seconds=statistics.median(durations),
+        p95_seconds=float(np.percentile(durations, 95)),
+        min_seconds=min(durations)
+    )
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def save_results(path: Path, results: List[BenchmarkResult], **meta) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            **meta
+        },
+        "results": {result.name: asdict(result) for result in results}
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n")
+
+def load_results(path: Path) -> Dict[str, BenchmarkResult]:
+    document = json.loads(path.read_text())
+    return {name: BenchmarkResult(**result) for name, result in document["results"].items()}
+
+def compare(
+    baseline: Dict[str, BenchmarkResult],
+    current: Dict[str, BenchmarkResult],
+    threshold: float = DEFAULT_THRESHOLD
+) -> List[Comparison]:
+    """Compare median times benchmark by benchmark"""
+    return [
+        Comparison(
+            name=name,
+            baseline_seconds=baseline[name].median_seconds if name in baseline else None,
+            current_seconds=current[name].median_seconds if name in current else None,
+            threshold=threshold
+        )
+        for name in sorted(set(baseline) | set(current))
+    ]
+
+def format_comparison(comparisons: List[Comparison]) -> str:
+    def ms(value: Optional[float]) -> str:
+        return f"{value * 1e3:10.2f}ms" if value is not None else f"{'-':>12}"
+
+    lines = [f"{'benchmark':<18} {'baseline':>12} {'current':>12} {'change':>8}  status"]
+    for c in comparisons:
+        change = f"{c.change:+8.1%}" if c.change is not None else f"{'-':>8}"
+        lines.append(f"{c.name:<18} {ms(c.baseline_seconds)} {ms(c.current_seconds)} {change}  {c.status}")
+    return "\n".join(lines)
@@ -0,0 +1,370 @@
+"""
+End-to-end benchmark suite with JSON baselines.
+
+    python -m benchmarks.suite run [--db] [--only analyze_symbol,ingest] [--quick] [--output PATH]
+    python -m benchmarks.suite compare BASELINE CURRENT [--threshold 0.1]
+
+`run --compare-to BASELINE` runs and compares in one step. `compare` exits
+with status 1 when any benchmark's median is slower than the baseline by more
+than the threshold, so it can gate CI. Keep baselines per machine; timings
+from different hardware are not comparable.
+
+Benchmarks marked "db" only run with --db and write to the configured
+database: ingest, get_stock_data and analyze_route use BENCH* symbols, and
+instrument_sync replaces the instruments table. Point POSTGRES_* at a scratch
+database. Kite is served by devtools.fake_kite, so the real HTTP client,
+parsing and retry code run without network access.
+"""
+import argparse
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+import httpx
+import pandas as pd
+from aiohttp import web
+from loguru import logger
+from sqlalchemy import delete
+
+from src.tradingai.config.settings import settings
+from src.tradingai.container import close_container, init_container
+from src.tradingai.devtools.fake_kite import FAKE_KITE, NSE_EVERY, FakeKite, FakeKiteConfig, create_app as create_fake_kite
+from src.tradingai.domain.llm_trade import LLMTradeAnalyzer
+from src.tradingai.domain.bar_builder import Bar
+from src.tradingai.domain.models import StockData
+from src.tradingai.domain.relative_strength import compute_rs_ratios, rank_relative_strength, to_relative_strength
+from src.tradingai.domain.sector_analysis import aggregate_sectors, compute_market_breadth, compute_symbol_metrics, to_sector_performance
+from src.tradingai.domain.signal_evaluator import SignalEvaluator
+from src.tradingai.domain.stock_analysis import DefaultStockAnalyzer
+from src.tradingai.domain.trading_calendar import IST
+from src.tradingai.domain.symbol_index import InstrumentEntry, SymbolIndex
+from src.tradingai.repository.database import AsyncSessionLocal, AsyncWriteSessionLocal
+from src.tradingai.repository.instrument_repository import InstrumentRepository
+from src.tradingai.repository.mock_data import generate_candles
+from src.tradingai.repository.rate_limiter import AsyncRateLimiter
+from src.tradingai.repository.stock_repository import StockRepository
+from src.tradingai.repository.zerodha import ZerodhaClient
+from src.tradingai.service.instrument_service import InstrumentService, get_symbol_index, set_symbol_index
+from src.tradingai.service.stock_service import StockService
+
+from .harness import (
+    DEFAULT_THRESHOLD, BenchmarkResult, compare, format_comparison, load_results, measure, save_results
+)
+
+DEFAULT_OUTPUT = Path("benchmarks/results/latest.json")
+LOOKBACK_DAYS = 365
+
+@dataclass
+class Workload:
+    run: Callable[[], Awaitable[int]]
+    reset: Optional[Callable[[], Awaitable[None]]] = None
+
+@dataclass
+class Benchmark:
+    name: str
+    description: str
+    setup: Callable[["SuiteConfig"], AsyncIterator[Workload]]
+    needs_db: bool = False
+
+@dataclass
+class SuiteConfig:
+    symbols: int = 50
+    universe: int = 500
+    requests: int = 200
+    concurrency: int = 20
+    instruments: int = 100000
+    iterations: int = 5
+
+    @classmethod
+    def quick(cls) -> "SuiteConfig":
+        return cls(symbols=10, universe=50, requests=40, concurrency=10, instruments=10000, iterations=3)
+
+    @property
+    def bench_symbols(self) -> List[str]:
+        return [f"BENCH{i}" for i in range(self.symbols)]
+
+def _quiet_logging() -> None:
+    """Benchmarks measure the code, not log I/O"""
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+def _frame(symbol: str):
+    end = datetime.now()
+    df = generate_candles(symbol, end - timedelta(days=LOOKBACK_DAYS), end).to_frame()
+    return df.set_index("timestamp")
+
+@asynccontextmanager
+async def fake_kite(config: FakeKiteConfig) -> AsyncIterator[Tuple[str, FakeKite]]:
+    """Run the fake Kite API on a free local port; yields its base URL and state"""
+    app = create_fake_kite(config)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    try:
+        yield f"http://{host}:{port}", app[FAKE_KITE]
+    finally:
+        await runner.cleanup()
+
+@asynccontextmanager
+async def fake_kite_for(symbols: List[str]) -> AsyncIterator[str]:
+    """
+    Fake Kite listing the given symbols, which are also made resolvable through
+    the process symbol index without touching the instruments table
+    """
+    config = FakeKiteConfig(historical_rate_limit=0, instruments=NSE_EVERY * len(symbols), symbols=symbols)
+    async with fake_kite(config) as (base_url, fake):
+        previous = get_symbol_index()
+        entries = list(previous.entries) if previous is not None else []
+        wanted = set(symbols)
+        set_symbol_index(SymbolIndex(entries + [
+            InstrumentEntry(symbol, token, symbol, "NSE", "EQ")
+            for token, symbol in fake.tokens.items() if symbol in wanted
+        ]))
+        try:
+            yield base_url
+        finally:
+            set_symbol_index(previous)
+
+async def _ingest(base_url: str, symbols: List[str], llm_analyzer: LLMTradeAnalyzer) -> int:
+    async with aiohttp.ClientSession() as session:
+        client = ZerodhaClient(session=session, rate_limiter=AsyncRateLimiter(100000, 1))
+        client.base_url = base_url
+        async with AsyncWriteSessionLocal() as db:
+            service = StockService(db, client, llm_analyzer=llm_analyzer)
+            end = datetime.now()
+            stored = await service.fetch_and_store_historical_data(symbols, end - timedelta(days=LOOKBACK_DAYS), end)
+    if not stored:
+        raise RuntimeError("Ingestion stored no rows; check the database and logs")
+    return stored
+
+async def _delete_bench_rows(symbols: List[str]) -> None:
+    async with AsyncWriteSessionLocal() as db:
+        await db.execute(delete(StockData).where(StockData.symbol.in_(symbols)))
+        await db.commit()
+
+@asynccontextmanager
+async def ingested_symbols(config: SuiteConfig) -> AsyncIterator[str]:
+    """Fake Kite URL, with a fresh year of candles for the BENCH symbols in the database"""
+    symbols = config.bench_symbols
+    async with fake_kite_for(symbols) as base_url:
+        await _delete_bench_rows(symbols)
+        await _ingest(base_url, symbols, LLMTradeAnalyzer(model_name=settings.LLM_MODEL_NAME))
+        yield base_url
+
+@asynccontextmanager
+async def ingest_benchmark(config: SuiteConfig) -> AsyncIterator[Workload]:
+    symbols = config.bench_symbols
+    llm_analyzer = LLMTradeAnalyzer(model_name=settings.LLM_MODEL_NAME)
+    async with fake_kite_for(symbols) as base_url:
+        yield Workload(
+            run=lambda: _ingest(base_url, symbols, llm_analyzer),
+            reset=lambda: _delete_bench_rows(symbols)
+        )
+
+@asynccontextmanager
+async def get_stock_data_benchmark(config: SuiteConfig) -> AsyncIterator[Workload]:
+    async def run() -> int:
+        rows = 0
+        async with AsyncSessionLocal() as db:
+            repo = StockRepository(db)
+            for symbol in config.bench_symbols:
+                rows += len(await repo.get_stock_data(symbol, lookback_days=LOOKBACK_DAYS, ensure_latest=False))
+        return rows
+
+    async with ingested_symbols(config):
+        yield Workload(run=run)
+
+@asynccontextmanager
+async def analyze_symbol_benchmark(config: SuiteConfig) -> AsyncIterator[Workload]:
+    df = _frame("BENCH0")
+
+    async def run() -> int:
+        DefaultStockAnalyzer(df).analyze("BENCH0")
+        return 1
+
+    yield Workload(run=run)
+
+@asynccontextmanager
+async def analyze_universe_benchmark(config: SuiteConfig) -> AsyncIterator[Workload]:
+    frames = {f"BENCH{i}": _frame(f"BENCH{i}") for i in range(config.universe)}
+
+    async def run() -> int:
+        for symbol, df in frames.items():
+            DefaultStockAnalyzer(df).analyze(symbol)
+        return len(frames)
+
+    yield Workload(run=run)
+
+@asynccontextmanager
+async def relative_strength_benchmark(config: SuiteConfig) -> AsyncIterator[Workload]:
+    frames = [_frame(f"BENCH{i}").assign(symbol=f"BENCH{i}") for i in range(config.universe)]
+    panel = pd.concat(frames).reset_index()[["symbol", "timestamp", "close"]]
+    benchmark = _frame("NIFTY 50")["close"]
+
+    async def run() -> int:
+        rankings = to_relative_strength(rank_relative_strength(compute_rs_ratios(panel, benchmark)))
+        return len(rankings)
+
+    yield Workload(run=run)
+
+@asynccontextmanager
+async def sector_performance_benchmark(config: SuiteConfig) -> AsyncIterator[Workload]:
+    frames = [_frame(f"BENCH{i}").assign(symbol=f"BENCH{i}") for i in range(config.universe)]
+    panel = pd.concat(frames).reset_index()[["symbol", "timestamp", "close"]]
+    sectors = {f"BENCH{i}": f"SECTOR{i % 20}" for i in range(config.universe)}
+
+    async def run() -> int:
+        metrics = compute_symbol_metrics(panel)
+        compute_market_breadth(metrics)
+        to_sector_performance(aggregate_sectors(metrics, sectors))
+        return len(metrics)
+
+    yield Workload(run=run)
+
+@asynccontextmanager
+async def signal_evaluator_benchmark(config: SuiteConfig) -> AsyncIterator[Workload]:
+    evaluator = SignalEvaluator()
+    live_bars = []
+    for i in range(config.universe):
+        symbol = f"BENCH{i}"
+        df = _frame(symbol)
+        evaluator.seed(symbol, zip(df.index.to_pydatetime(), df["close"], df["volume"]))
+        last = df.iloc[-1]
+        # A session after the seeded history, so every call evaluates the rules
+        session = IST.localize(datetime.combine(df.index[-1].date() + timedelta(days=1), datetime.min.time()))
+        live_bars.append(Bar(symbol, session, last.close, last.close, last.close, last.close, int(last.volume)))
+    minute_closes = 20
+
+    async def run() -> int:
+        for minute in range(minute_closes):
+            for bar in live_bars:
+                bar.close = bar.open * (1.0 + (minute - 10) * 0.002)
+                evaluator.on_live_bar(bar)
+        return minute_closes * len(live_bars)
+
+    yield Workload(run=run)
+
+@asynccontextmanager
+async def analyze_route_benchmark(config: SuiteConfig) -> AsyncIterator[Workload]:
+    # Imported here: importing main builds the module-level app
+    from src.tradingai.main import create_app
+
+    app = create_app()
+    _quiet_logging()  # create_app configures logging from settings
+    app.state.container = init_container()
+    symbols = config.bench_symbols
+
+    async def run() -> int:
+        semaphore = asyncio.Semaphore(config.concurrency)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def one(i: int) -> None:
+                async with semaphore:
+                    response = await client.get(f"{settings.API_V1_PREFIX}/stock/analyze/{symbols[i % len(symbols)]}")
+                    response.raise_for_status()
+            await asyncio.gather(*(one(i) for i in range(config.requests)))
+        return config.requests
+
+    try:
+        async with ingested_symbols(config):
+            yield Workload(run=run)
+    finally:
+        await close_container()
+
+@asynccontextmanager
+async def instrument_sync_benchmark(config: SuiteConfig) -> AsyncIterator[Workload]:
+    async with fake_kite(FakeKiteConfig(instruments=config.instruments)) as (base_url, _):
+        async def run() -> int:
+            async with aiohttp.ClientSession() as session:
+                repository = InstrumentRepository(session=session)
+                repository.base_url = base_url
+                async with AsyncWriteSessionLocal() as db:
+                    summary = await InstrumentService(db, repository).fetch_instruments()
+            return summary.inserted + summary.updated + summary.unchanged
+
+        yield Workload(run=run)
+
+BENCHMARKS: Dict[str, Benchmark] = {b.name: b for b in [
+    Benchmark("analyze_symbol", "DefaultStockAnalyzer.analyze on one year of daily candles", analyze_symbol_benchmark),
+    Benchmark("analyze_universe", "DefaultStockAnalyzer.analyze across a universe", analyze_universe_benchmark),
+    Benchmark("relative_strength", "RS ratios and percentile ranks over a universe close panel", relative_strength_benchmark),
+    Benchmark("sector_performance", "Symbol metrics, sector groupby and market breadth over a universe close panel", sector_performance_benchmark),
+    Benchmark("signal_evaluator", "Incremental rule evaluation of live bars on minute close", signal_evaluator_benchmark),
+    Benchmark("ingest", "Fake Kite -> fetch_and_store_historical_data -> Postgres", ingest_benchmark, needs_db=True),
+    Benchmark("get_stock_data", "StockRepository.get_stock_data DataFrame build", get_stock_data_benchmark, needs_db=True),
+    Benchmark("analyze_route", "GET /stock/analyze/{symbol} under concurrent load", analyze_route_benchmark, needs_db=True),
+    Benchmark("instrument_sync", "Instrument dump from fake Kite -> staging -> upsert", instrument_sync_benchmark, needs_db=True),
+]}
+
+async def run_suite(names: List[str], config: SuiteConfig) -> List[BenchmarkResult]:
+    results = []
+    for name in names:
+        benchmark = BENCHMARKS[name]
+        print(f"running {name}: {benchmark.description}", flush=True)
+        async with benchmark.setup(config) as workload:
+            result = await measure(name, workload.run, config.iterations, reset=workload.reset)
+        print(result.summary(), flush=True)
+        results.append(result)
+    return results
+
+def _selected(only: Optional[str], with_db: bool) -> List[str]:
+    if only:
+        names = [name.strip() for name in only.split(",") if name.strip()]
+        unknown = [name for name in names if name not in BENCHMARKS]
+        if unknown:
+            raise SystemExit(f"Unknown benchmarks: {', '.join(unknown)}; choose from {', '.join(BENCHMARKS)}")
+        return names
+    return [name for name, b in BENCHMARKS.items() if with_db or not b.needs_db]
+
+def _compare(baseline_path: Path, current_path: Path, threshold: float) -> int:
+    comparisons = compare(load_results(baseline_path), load_results(current_path), threshold)
+    print(format_comparison(comparisons))
+    regressions = [c.name for c in comparisons if c.regressed]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run benchmarks and write a results file")
+    run_parser.add_argument("--only", help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    run_parser.add_argument("--db", action="store_true", help="Include benchmarks that write to the database")
+    run_parser.add_argument("--quick", action="store_true", help="Smaller workloads and fewer iterations")
+    run_parser.add_argument("--iterations", type=int)
+    run_parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    run_parser.add_argument("--compare-to", type=Path, help="Baseline to compare against after the run")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    compare_parser = commands.add_parser("compare", help="Compare two results files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        return _compare(args.baseline, args.current, args.threshold)
+
+    config = SuiteConfig.quick() if args.quick else SuiteConfig()
+    if args.iterations:
+        config.iterations = args.iterations
+    _quiet_logging()
+
+    results = asyncio.run(run_suite(_selected(args.only, args.db), config))
+    save_results(args.output, results, quick=args.quick)
+    print(f"results written to {args.output}")
+    if args.compare_to:
+        return _compare(args.compare_to, args.output, args.threshold)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,7 @@
 """
 TradingAI main package
 """
-from loguru import logger
-import sys
+from .config.logging import setup_logging
 
-# Configure loguru
-logger.remove()
-logger.add(
-    sys.stdout,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-    level="INFO"
-)
-logger.add(
-    "logs/tradingai.log",
-    rotation="500 MB",
-    retention="10 days",
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-    level="DEBUG"
-) 
\ No newline at end of file
+# Defaults until the app or worker applies the configured settings
+setup_logging()
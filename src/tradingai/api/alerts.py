@@ -0,0 +1,96 @@
+import asyncio
+import json
+from typing import List, Optional
+from fastapi import APIRouter, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from loguru import logger
+
+from ..domain.signal_evaluator import RULES
+from ..service.alert_broker import RECENT_ALERTS, get_alert_broker
+
+router = APIRouter(prefix="/alerts", tags=["alerts"])
+
+SSE_KEEPALIVE_SECONDS = 15.0
+
+def _split(value: Optional[str]) -> Optional[List[str]]:
+    """Comma-separated query value as a list, None when empty"""
+    if not value:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()] or None
+
+@router.get("")
+async def get_recent_alerts(
+    symbols: Optional[str] = Query(None, description="Comma-separated symbols"),
+    rules: Optional[str] = Query(None, description=f"Comma-separated rules: {', '.join(RULES)}"),
+    limit: int = Query(100, ge=1, le=RECENT_ALERTS)
+) -> List[dict]:
+    """Alerts raised recently in this process, oldest first"""
+    symbol_set, rule_set = set(_split(symbols) or ()), set(_split(rules) or ())
+    alerts = [
+        alert for alert in get_alert_broker().recent()
+        if (not symbol_set or alert.symbol in symbol_set) and (not rule_set or alert.rule in rule_set)
+    ]
+    return [alert.to_dict() for alert in alerts[-limit:]]
+
+@router.get("/stream")
+async def stream_alerts(
+    request: Request,
+    symbols: Optional[str] = Query(None, description="Comma-separated symbols"),
+    rules: Optional[str] = Query(None, description=f"Comma-separated rules: {', '.join(RULES)}")
+):
+    """Server-sent events, one `alert` event per triggered rule"""
+    broker = get_alert_broker()
+    subscription = broker.subscribe(_split(symbols), _split(rules))
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    alert = await asyncio.wait_for(subscription.get(), SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: alert\ndata: {json.dumps(alert.to_dict())}\n\n"
+        finally:
+            broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
+    )
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    """Consume client messages (ignored) until the client goes away"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+@router.websocket("/ws")
+async def alerts_websocket(
+    websocket: WebSocket,
+    symbols: Optional[str] = None,
+    rules: Optional[str] = None
+):
+    """
+    Alerts as JSON text messages.
+    Waiting for an alert is raced against the client's messages, so a
+    disconnect unsubscribes at once even when no alerts are flowing.
+    """
+    await websocket.accept()
+    broker = get_alert_broker()
+    subscription = broker.subscribe(_split(symbols), _split(rules))
+    disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+    try:
+        while True:
+            next_alert = asyncio.create_task(subscription.get())
+            done, _ = await asyncio.wait({next_alert, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected in done:
+                next_alert.cancel()
+                logger.debug("Alert subscriber disconnected")
+                break
+            await websocket.send_json(next_alert.result().to_dict())
+    except WebSocketDisconnect:
+        logger.debug("Alert subscriber disconnected")
+    finally:
+        disconnected.cancel()
+        broker.unsubscribe(subscription)
@@ -0,0 +1,30 @@
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..container import AppContainer
+from ..repository.database import get_db
+from ..service.analysis_service import AnalysisService
+from ..service.instrument_service import InstrumentService
+from ..service.stock_service import StockService
+
+def get_app_container(request: Request) -> AppContainer:
+    """Container built at startup and stored on the app state"""
+    return request.app.state.container
+
+def get_instrument_service(
+    db: AsyncSession = Depends(get_db),
+    container: AppContainer = Depends(get_app_container)
+) -> InstrumentService:
+    return container.instrument_service(db)
+
+def get_stock_service(
+    db: AsyncSession = Depends(get_db),
+    container: AppContainer = Depends(get_app_container)
+) -> StockService:
+    return container.stock_service(db)
+
+def get_analysis_service(
+    db: AsyncSession = Depends(get_db),
+    stock_service: StockService = Depends(get_stock_service)
+) -> AnalysisService:
+    return AnalysisService(db, stock_service)
@@ -1,11 +1,18 @@
 from fastapi import APIRouter
 
+from ..repository.database import pool_stats
+
 router = APIRouter(tags=["health"])
 
 @router.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
+@router.get("/health/db")
+async def database_pool_stats():
+    """Connection pool usage for the primary and replica engines"""
+    return pool_stats()
+
 @router.get("/api/v1/version")
 async def version():
     return {"version": "0.1.0"} 
\ No newline at end of file
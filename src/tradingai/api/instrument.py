@@ -1,30 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query
 from loguru import logger
 
-from ..repository.database import get_db
 from ..service.instrument_service import InstrumentService
-from ..repository.instrument_repository import InstrumentRepository
+from .dependencies import get_instrument_service
 
 router = APIRouter(tags=["instruments"])
 
 @router.post("/instruments/fetch")
 async def fetch_instruments(
-    db: AsyncSession = Depends(get_db)
+    instrument_service: InstrumentService = Depends(get_instrument_service)
 ):
     """
     Fetch and store instruments from Zerodha
     This should be called once at the start of the trading day
     """
     try:
-        instrument_repo = InstrumentRepository()
-        instrument_service = InstrumentService(db, instrument_repo)
-        
-        await instrument_service.fetch_instruments()
+        summary = await instrument_service.fetch_instruments()
         
         return {
             "status": "success",
-            "message": "Successfully fetched and stored instruments"
+            "message": "Successfully fetched and stored instruments",
+            "changes": summary.to_dict()
         }
         
     except Exception as e:
@@ -34,16 +30,33 @@ async def fetch_instruments(
             detail=f"Failed to fetch instruments: {str(e)}"
         )
 
+@router.get("/instruments/search")
+async def search_instruments(
+    q: str = Query(..., min_length=1, description="Symbol or company name fragment"),
+    limit: int = Query(10, ge=1, le=50),
+    instrument_service: InstrumentService = Depends(get_instrument_service)
+):
+    """Ranked prefix and fuzzy search over trading symbols and names"""
+    try:
+        index = await instrument_service.get_symbol_index()
+        return {
+            "query": q,
+            "results": [match.to_dict() for match in index.search(q, limit)]
+        }
+    except Exception as e:
+        logger.error(f"Error searching instruments: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to search instruments: {str(e)}"
+        )
+
 @router.get("/instruments/search/{symbol}")
 async def search_instrument(
     symbol: str,
-    db: AsyncSession = Depends(get_db)
+    instrument_service: InstrumentService = Depends(get_instrument_service)
 ):
     """Search for an instrument by symbol"""
     try:
-        instrument_repo = InstrumentRepository()
-        instrument_service = InstrumentService(db, instrument_repo)
-        
         token = await instrument_service.get_instrument_token(symbol)
         if not token:
             raise HTTPException(
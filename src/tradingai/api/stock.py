@@ -1,6 +1,8 @@
-from datetime import datetime, timedelta
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Security, Request
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+import json
+from fastapi import APIRouter, Depends, HTTPException, Security, Request, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 from pydantic import BaseModel
@@ -9,17 +11,29 @@ from src.tradingai.service.stock_service import StockService
 
 from ..repository.database import get_db
 from ..service.analysis_service import AnalysisService
-from ..domain.validators import HistoricalDataRequest
-from ..tasks.daily_update import run_daily_update
+from ..domain.validators import CorporateActionRequest, HistoricalDataRequest
+from ..repository.screener_repository import ScreenerRepository
+from ..repository.relative_strength_repository import RelativeStrengthRepository
+from ..service.job_service import JobService
+from ..service.market_service import MarketService
+from ..service.corporate_action_service import CorporateActionService
+from ..domain.market_analysis import MarketAnalysis
 from ..config.settings import settings
 from fastapi.security import APIKeyHeader
-from ..repository.instrument_repository import InstrumentRepository
 from ..service.instrument_service import InstrumentService
-from ..repository.zerodha import ZerodhaClient
+from .dependencies import get_analysis_service, get_instrument_service, get_stock_service
 from ..domain.llm_trade import TradingSignal
+from ..domain.trade_gate import get_gate_stats
+from ..service.tick_ingestion_service import get_bar_builder
+from ..domain.timeframes import TIMEFRAMES
 
 router = APIRouter(prefix="/stock", tags=["stock"])
 
+SYMBOLS_MAX_PAGE_SIZE = 5000
+LIVE_MAX_MINUTES = 375
+NDJSON_CHUNK_LINES = 500
+SIGNALS_MAX_SYMBOLS = 1000
+
 API_KEY_NAME = "X-API-Key"
 api_key_header = APIKeyHeader(name=API_KEY_NAME)
 
@@ -45,13 +59,12 @@ async def verify_api_key(api_key: str = Security(api_key_header)):
 @router.get("/analyze/{symbol}")
 async def analyze_stock(
     symbol: str,
-    db: AsyncSession = Depends(get_db)
+    analysis_service: AnalysisService = Depends(get_analysis_service)
 ) -> StockAnalysisResponse:
     """
     Analyze a stock by getting market conditions and technical analysis
     """
     try:
-        analysis_service = AnalysisService(db)
         try:
             result = await analysis_service.analyze_stock(symbol)
             return StockAnalysisResponse(**result)
@@ -69,18 +82,12 @@ async def analyze_stock(
 @router.get("/analyze/{symbol}/with-decision")
 async def analyze_stock_with_decision(
     symbol: str,
-    db: AsyncSession = Depends(get_db)
+    stock_service: StockService = Depends(get_stock_service)
 ) -> StockAnalysisWithDecisionResponse:
     """
     Analyze a stock and get trading decision
     """
     try:
-        # Initialize services
-        instrument_repo = InstrumentRepository()
-        instrument_service = InstrumentService(db, instrument_repo)
-        zerodha_client = ZerodhaClient(instrument_service)
-        stock_service = StockService(db, zerodha_client)
-        
         # Get analysis and decision
         analysis_data, trading_signal = await stock_service.analyze_stock_with_decision(symbol)
         
@@ -95,68 +102,166 @@ async def analyze_stock_with_decision(
         logger.error(f"Error analyzing {symbol}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/stocks/historical")
+@router.get("/analyze/{symbol}/timeframes")
+async def analyze_stock_timeframes(
+    symbol: str,
+    timeframes: str = Query(",".join(TIMEFRAMES), description="Comma-separated: day, week, month"),
+    stock_service: StockService = Depends(get_stock_service)
+) -> dict:
+    """Indicator set per timeframe from one cached daily series"""
+    requested = [t.strip() for t in timeframes.split(",") if t.strip()]
+    unknown = [t for t in requested if t not in TIMEFRAMES]
+    if unknown or not requested:
+        raise HTTPException(status_code=400, detail=f"Timeframes must be from: {', '.join(TIMEFRAMES)}")
+    try:
+        indicators = await stock_service.analyze_timeframes(symbol, requested)
+        return {
+            "symbol": symbol,
+            "timeframes": {timeframe: result.to_dict() for timeframe, result in indicators.items()}
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error analyzing timeframes for {symbol}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _signal_dict(record) -> dict:
+    return {
+        "symbol": record.symbol,
+        "decision": record.decision,
+        "entry_price": record.entry_price,
+        "stop_loss": record.stop_loss,
+        "allocation_percentage": record.allocation_percentage,
+        "reasoning": record.reasoning,
+        "current_price": record.current_price,
+        "as_of": record.as_of.isoformat() if record.as_of else None,
+        "model_name": record.model_name,
+        "created_at": record.created_at.isoformat()
+    }
+
+@router.get("/signals/latest")
+async def get_latest_signals(
+    symbols: str = Query(..., description="Comma-separated watchlist"),
+    stock_service: StockService = Depends(get_stock_service)
+) -> List[dict]:
+    """Latest stored trading signal for each symbol that has one"""
+    watchlist = [s.strip() for s in symbols.split(",") if s.strip()]
+    if len(watchlist) > SIGNALS_MAX_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"At most {SIGNALS_MAX_SYMBOLS} symbols per request")
+    try:
+        latest = await stock_service.get_latest_signals(watchlist)
+        return [_signal_dict(latest[symbol]) for symbol in watchlist if symbol in latest]
+    except Exception as e:
+        logger.error(f"Error getting latest signals: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/signals/{symbol}")
+async def get_signal_history(
+    symbol: str,
+    limit: int = Query(20, ge=1, le=500),
+    stock_service: StockService = Depends(get_stock_service)
+) -> List[dict]:
+    """Stored trading signals for a symbol, newest first"""
+    try:
+        return [_signal_dict(record) for record in await stock_service.trade_repo.get_signal_history(symbol, limit)]
+    except Exception as e:
+        logger.error(f"Error getting signal history for {symbol}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _action_dict(action) -> dict:
+    return {
+        "symbol": action.symbol,
+        "ex_date": action.ex_date.isoformat(),
+        "action_type": action.action_type,
+        "ratio": action.ratio,
+        "factor": action.factor
+    }
+
+@router.post("/corporate-actions", status_code=201)
+async def record_corporate_action(
+    request: CorporateActionRequest,
+    api_key: str = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_db)
+) -> dict:
+    """
+    Record a split, bonus or explicit price adjustment. Analysis, screening
+    and ranking read bars before the ex-date scaled by its factor.
+    """
+    try:
+        action = await CorporateActionService(db).record_action(
+            request.symbol, request.ex_date, request.action_type, request.ratio, request.factor
+        )
+        return _action_dict(action)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error recording corporate action for {request.symbol}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/corporate-actions/{symbol}")
+async def get_corporate_actions(symbol: str, db: AsyncSession = Depends(get_db)) -> List[dict]:
+    """A symbol's recorded corporate actions, oldest first"""
+    try:
+        return [_action_dict(action) for action in await CorporateActionService(db).get_actions(symbol)]
+    except Exception as e:
+        logger.error(f"Error getting corporate actions for {symbol}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/stocks/historical", status_code=202)
 async def fetch_historical_data(
     request: Request,
     historical_request: HistoricalDataRequest,
-    background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    instrument_service: InstrumentService = Depends(get_instrument_service)
 ) -> dict:
-    """Fetch and store historical data for symbols"""
-    # Debug incoming request
-    logger.info(f"Received request at: {request.url}")
-    logger.info(f"Request method: {request.method}")
-    logger.info(f"Request headers: {request.headers}")
-    logger.info(f"Historical request data: {historical_request}")
+    """Queue a job to fetch and store historical data for symbols"""
+    logger.info("Historical data request for {} symbols", len(historical_request.symbols))
     
     try:
-        instrument_repo = InstrumentRepository()
-        instrument_service = InstrumentService(db, instrument_repo)
-        zerodha_client = ZerodhaClient(instrument_service)
-        stock_service = StockService(db, zerodha_client)
-        
-        try:
-            logger.info(f"Valid symbols in DB: {historical_request.symbols}")
-            total_records = await stock_service.fetch_and_store_historical_data(
-                historical_request.symbols,
-                historical_request.from_date,
-                historical_request.to_date
-            )
-            
-            return {
-                "status": "success",
-                "message": f"Successfully fetched and stored {total_records} records",
-                "total_records": total_records
-            }
-            
-        except ValueError as e:
+        is_valid, invalid_symbols = await instrument_service.validate_symbols(historical_request.symbols)
+        if not is_valid:
             # Return invalid symbols in response
             return {
                 "status": "error",
-                "message": str(e),
-                "invalid_symbols": str(e).split(": ")[1].strip("[]").split(", ")
+                "message": f"Invalid symbols found: {invalid_symbols}",
+                "invalid_symbols": invalid_symbols
             }
+        
+        # Job checkpoints match on the stored spelling, so queue the exchange's
+        symbols = await instrument_service.canonical_symbols(historical_request.symbols)
+        job = await JobService(db).submit_historical(
+            symbols,
+            historical_request.from_date,
+            historical_request.to_date
+        )
+        
+        return {
+            "status": "queued",
+            "message": f"Historical data job queued for {len(historical_request.symbols)} symbols",
+            "job_id": job.id,
+            "status_url": str(request.url_for("get_job_status", job_id=job.id))
+        }
             
     except Exception as e:
         logger.error(f"Error in fetch_historical_data: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/stocks/daily-update")
+@router.post("/stocks/daily-update", status_code=202)
 async def trigger_daily_update(
-    background_tasks: BackgroundTasks,
-    api_key: str = Depends(verify_api_key)
+    api_key: str = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_db)
 ) -> dict:
     """
     Trigger daily update for all configured symbols.
-    This runs asynchronously in the background.
+    This is queued and run by the ingestion worker.
     """
     try:
-        # Add the task to background tasks
-        background_tasks.add_task(run_daily_update)
+        job = await JobService(db).submit_daily_update(settings.VALID_SYMBOLS)
         
         return {
-            "status": "success",
-            "message": "Daily update task started"
+            "status": "queued",
+            "message": "Daily update job queued",
+            "job_id": job.id
         }
         
     except Exception as e:
@@ -166,14 +271,240 @@ async def trigger_daily_update(
             detail=f"Failed to trigger daily update: {str(e)}"
         )
 
+@router.post("/screener/run", status_code=202)
+async def trigger_universe_screener(
+    api_key: str = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_db)
+) -> dict:
+    """
+    Trigger the universe screener.
+    This is queued and run by the ingestion worker.
+    """
+    try:
+        job = await JobService(db).submit_universe_screener()
+        
+        return {
+            "status": "queued",
+            "message": "Universe screener job queued",
+            "job_id": job.id
+        }
+        
+    except Exception as e:
+        logger.error(f"Error triggering universe screener: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to trigger universe screener: {str(e)}"
+        )
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(
+    job_id: int,
+    db: AsyncSession = Depends(get_db)
+) -> dict:
+    """Get status and per-symbol progress of a queued job"""
+    try:
+        status = await JobService(db).get_job_status(job_id)
+        if status is None:
+            raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+        return status
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting job {job_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/screener/shortlist")
+async def get_screener_shortlist(
+    run_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_db)
+) -> List[dict]:
+    """Get the ranked screener shortlist, defaulting to the latest run"""
+    try:
+        results = await ScreenerRepository(db).get_shortlist(run_date)
+        return [{
+            "run_date": r.run_date.isoformat(),
+            "rank": r.rank,
+            "symbol": r.symbol,
+            "score": r.score,
+            "close": r.close,
+            "sma_30_week": r.sma_30_week,
+            "macd_histogram": r.macd_histogram,
+            "volume_ratio": r.volume_ratio
+        } for r in results]
+    except Exception as e:
+        logger.error(f"Error getting screener shortlist: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/relative-strength/run", status_code=202)
+async def trigger_relative_strength(
+    api_key: str = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_db)
+) -> dict:
+    """
+    Trigger relative strength ranking of the universe versus RS_BENCHMARK_SYMBOL.
+    This is queued and run by the ingestion worker.
+    """
+    try:
+        job = await JobService(db).submit_relative_strength()
+        
+        return {
+            "status": "queued",
+            "message": "Relative strength job queued",
+            "job_id": job.id
+        }
+        
+    except Exception as e:
+        logger.error(f"Error triggering relative strength: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to trigger relative strength: {str(e)}"
+        )
+
+@router.get("/relative-strength")
+async def get_relative_strength(
+    run_date: Optional[date] = None,
+    limit: int = Query(100, ge=1, le=SYMBOLS_MAX_PAGE_SIZE),
+    min_rating: Optional[int] = Query(None, ge=1, le=99),
+    symbols: Optional[str] = Query(None, description="Comma-separated symbols to restrict to"),
+    db: AsyncSession = Depends(get_db)
+) -> List[dict]:
+    """Universe ranked by RS rating, defaulting to the latest run"""
+    try:
+        watchlist = [s.strip() for s in symbols.split(",") if s.strip()] if symbols else None
+        results = await RelativeStrengthRepository(db).get_rankings(run_date, limit, min_rating, watchlist)
+        return [{
+            "run_date": r.run_date.isoformat(),
+            "rank": r.rank,
+            "symbol": r.symbol,
+            "rating": r.rating,
+            "score": r.score,
+            "close": r.close,
+            "ratios": r.ratios,
+            "ranks": r.ranks
+        } for r in results]
+    except Exception as e:
+        logger.error(f"Error getting relative strength: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/sectors/run", status_code=202)
+async def trigger_sector_performance(
+    api_key: str = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_db)
+) -> dict:
+    """
+    Trigger sector performance and market breadth aggregation of the universe.
+    This is queued and run by the ingestion worker.
+    """
+    try:
+        job = await JobService(db).submit_sector_performance()
+        
+        return {
+            "status": "queued",
+            "message": "Sector performance job queued",
+            "job_id": job.id
+        }
+        
+    except Exception as e:
+        logger.error(f"Error triggering sector performance: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to trigger sector performance: {str(e)}"
+        )
+
+@router.get("/sectors")
+async def get_sector_performance(db: AsyncSession = Depends(get_db)) -> dict:
+    """Sectors ranked by momentum with market breadth, from the latest run"""
+    snapshot = await MarketService(db).get_sector_snapshot()
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="No sector performance stored; run /stock/sectors/run first")
+    return {
+        "run_date": snapshot.run_date.isoformat(),
+        "market_breadth": snapshot.breadth.to_dict(),
+        "sectors": [s.to_dict() for s in snapshot.sectors]
+    }
+
+@router.get("/market", response_model=MarketAnalysis)
+async def get_market_analysis(db: AsyncSession = Depends(get_db)) -> MarketAnalysis:
+    """Market condition, NIFTY trend, sector performance and breadth"""
+    try:
+        return await MarketService(db).get_market_analysis()
+    except Exception as e:
+        logger.error(f"Error getting market analysis: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _ndjson_lines(entries) -> str:
+    """Yield NDJSON in chunks of lines rather than one write per symbol"""
+    lines = []
+    for entry in entries:
+        lines.append(json.dumps({
+            "symbol": entry.tradingsymbol,
+            "exchange": entry.exchange,
+            "instrument_type": entry.instrument_type,
+            "instrument_token": entry.instrument_token
+        }))
+        if len(lines) == NDJSON_CHUNK_LINES:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
 @router.get("/symbols")
 async def get_all_symbols(
-    db: AsyncSession = Depends(get_db)
-) -> List[str]:
-    """Get all available trading symbols"""
+    request: Request,
+    after: Optional[str] = Query(None, description="Keyset cursor: return symbols after this one"),
+    limit: Optional[int] = Query(None, ge=1, le=SYMBOLS_MAX_PAGE_SIZE),
+    exchange: Optional[str] = None,
+    instrument_type: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    instrument_service: InstrumentService = Depends(get_instrument_service)
+):
+    """
+    Get available trading symbols, sorted alphabetically.
+    With `limit`, the next page cursor is returned in the X-Next-Cursor header.
+    The ETag changes only when the instruments are refreshed.
+    """
     try:
-        instrument_service = InstrumentService(db, None)
-        return await instrument_service.get_all_symbols()
+        index = await instrument_service.get_symbol_index()
+
+        etag = f'"{index.version}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+
+        if limit is None:
+            entries = index.iter_entries(after, exchange, instrument_type)
+        else:
+            entries, next_cursor = index.page(limit, after, exchange, instrument_type)
+            if next_cursor is not None:
+                headers["X-Next-Cursor"] = next_cursor
+
+        if format == "ndjson":
+            return StreamingResponse(_ndjson_lines(entries), media_type="application/x-ndjson", headers=headers)
+        return JSONResponse([entry.tradingsymbol for entry in entries], headers=headers)
     except Exception as e:
         logger.error(f"Error getting symbols: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/llm-gate/stats")
+async def get_llm_gate_stats() -> dict:
+    """Get counters of LLM calls made and avoided by the trade gate"""
+    return get_gate_stats().snapshot()
+
+@router.get("/live/{symbol}")
+async def get_live_bars(
+    symbol: str,
+    minutes: int = Query(30, ge=0, le=LIVE_MAX_MINUTES, description="Recent minute bars to include")
+) -> dict:
+    """Live daily and minute bars from the in-process ticker (TICKER_ENABLED)"""
+    builder = get_bar_builder()
+    if builder is None:
+        raise HTTPException(status_code=503, detail="Live ticker is not running in this process")
+    day = builder.live_day(symbol)
+    minute_bars = builder.minute_bars(symbol)
+    if day is None and not minute_bars:
+        raise HTTPException(status_code=404, detail=f"No live data for {symbol}")
+    return {
+        "symbol": symbol,
+        "day": day.to_dict() if day is not None else None,
+        "minutes": [bar.to_dict() for bar in minute_bars[-minutes:]] if minutes else []
+    }
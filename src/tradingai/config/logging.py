@@ -1,20 +1,139 @@
 import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, TextIO, Tuple
 from loguru import logger
 
-# Configure loguru logger
-logger.configure(
-    handlers=[
-        {
-            "sink": sys.stderr,
-            "format": "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-            "level": "INFO",
-        },
-        {
-            "sink": "logs/tradingai.log",
-            "format": "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-            "level": "DEBUG",
-            "rotation": "1 day",
-            "retention": "1 week",
-        },
-    ]
-) 
\ No newline at end of file
+CONSOLE_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+FILE_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+
+SUPPRESSED_SUFFIX = " ({extra[%s]} similar messages suppressed)"
+
+RATE_LIMIT_WINDOW_SECONDS = 60.0
+
+@dataclass
+class LoggingConfig:
+    level: str = "INFO"
+    file: Optional[str] = "logs/tradingai.log"
+    file_level: str = "INFO"
+    module_levels: Dict[str, str] = field(default_factory=dict)
+    enqueue: bool = True
+    rate_limit_per_minute: int = 60
+
+    @classmethod
+    def from_settings(cls, settings) -> "LoggingConfig":
+        return cls(
+            level=settings.LOG_LEVEL,
+            file=settings.LOG_FILE,
+            file_level=settings.LOG_FILE_LEVEL,
+            module_levels=dict(settings.LOG_MODULE_LEVELS),
+            enqueue=settings.LOG_ENQUEUE,
+            rate_limit_per_minute=settings.LOG_RATE_LIMIT_PER_MINUTE
+        )
+
+class LogFilter:
+    """
+    Per-module minimum levels, plus a per-call-site rate limit for INFO and
+    below. Warnings and errors are never dropped. Each sink needs its own
+    instance since loguru calls the filter once per sink. The record is
+    shared by every sink, so the suppressed count goes in
+    record["extra"][suppressed_key] for this sink's format to show.
+    """
+
+    def __init__(
+        self,
+        level: str,
+        module_levels: Dict[str, str],
+        rate_limit_per_minute: int,
+        suppressed_key: str = "suppressed"
+    ):
+        self.suppressed_key = suppressed_key
+        self.level_no = logger.level(level).no
+        # Longest prefix first, so "tradingai.repository.zerodha" beats "tradingai.repository"
+        self.module_levels = sorted(
+            ((name, logger.level(lvl).no) for name, lvl in module_levels.items()),
+            key=lambda item: -len(item[0])
+        )
+        self.rate_limit = rate_limit_per_minute
+        self.warning_no = logger.level("WARNING").no
+        self._module_cache: Dict[str, int] = {}
+        self._sites: Dict[Tuple[str, int], list] = {}  # call site -> [window_start, emitted, suppressed]
+        self._lock = threading.Lock()
+
+    def _min_level(self, name: str) -> int:
+        level_no = self._module_cache.get(name)
+        if level_no is None:
+            level_no = self.level_no
+            for prefix, prefix_level in self.module_levels:
+                if name == prefix or name.startswith(prefix + "."):
+                    level_no = prefix_level
+                    break
+            self._module_cache[name] = level_no
+        return level_no
+
+    def __call__(self, record) -> bool:
+        level_no = record["level"].no
+        if level_no < self._min_level(record["name"] or ""):
+            return False
+        if not self.rate_limit or level_no >= self.warning_no:
+            return True
+
+        key = (record["name"], record["line"])
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= RATE_LIMIT_WINDOW_SECONDS:
+                suppressed = site[2] if site else 0
+                self._sites[key] = [now, 1, 0]
+                if suppressed:
+                    record["extra"][self.suppressed_key] = suppressed
+                return True
+            if site[1] < self.rate_limit:
+                site[1] += 1
+                return True
+            site[2] += 1
+            return False
+
+def with_suppressed(log_format: str, suppressed_key: str) -> Callable[[dict], str]:
+    """Sink format that appends the filter's suppressed count when there is one"""
+    suffix = SUPPRESSED_SUFFIX % suppressed_key
+
+    def format_record(record) -> str:
+        # Callable formats must add the line end and exception themselves
+        extra = suffix if record["extra"].get(suppressed_key) else ""
+        return log_format + extra + "\n{exception}"
+    return format_record
+
+def setup_logging(config: Optional[LoggingConfig] = None, console: TextIO = sys.stdout) -> None:
+    """
+    (Re)configure the loguru sinks.
+    Sinks are enqueued so formatting and I/O happen on a background thread
+    instead of the event loop. Use `logger.debug("... {}", value)` or
+    `logger.opt(lazy=True)` on hot paths so disabled messages are never formatted.
+    """
+    config = config or LoggingConfig()
+    module_levels = list(config.module_levels.values())
+
+    def sink_level(level: str) -> int:
+        # The sink must let through anything a module override asks for
+        return min([logger.level(level).no] + [logger.level(lvl).no for lvl in module_levels])
+
+    logger.remove()
+    logger.add(
+        console,
+        format=with_suppressed(CONSOLE_FORMAT, "console_suppressed"),
+        level=sink_level(config.level),
+        filter=LogFilter(config.level, config.module_levels, config.rate_limit_per_minute, "console_suppressed"),
+        enqueue=config.enqueue
+    )
+    if config.file:
+        logger.add(
+            config.file,
+            format=with_suppressed(FILE_FORMAT, "file_suppressed"),
+            level=sink_level(config.file_level),
+            filter=LogFilter(config.file_level, config.module_levels, config.rate_limit_per_minute, "file_suppressed"),
+            enqueue=config.enqueue,
+            rotation="500 MB",
+            retention="10 days"
+        )
@@ -17,6 +17,9 @@ ANALYSIS PROCESS:
    Analyze candle patterns in recent price action:
    - IC (Indecision Candle): body < 50% of high-low range
    - MC (Momentum Candle): body > 50% of high-low range
+   When "Candle Patterns" are provided, the IC/MC labels, groups and candidate
+   entry/stop levels are already computed. Use them as given instead of
+   re-deriving them from prices.
    
 STOP LOSS RULES:
 1. For bullish setups:
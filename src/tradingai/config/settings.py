@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from datetime import date
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     # App settings
@@ -13,11 +14,23 @@ class Settings(BaseSettings):
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "password"
     POSTGRES_DB: str = "tradingai"
+    POSTGRES_READ_SERVER: Optional[str] = None  # Read replica host; reads use the primary when unset
+    POSTGRES_READ_PORT: Optional[int] = None  # Defaults to POSTGRES_PORT
+    DB_REPLICA_RETRY_SECONDS: float = 30.0  # Reads stay on the primary this long after a replica error
+    
+    # Database engine settings
+    DB_ECHO: bool = False  # Log every SQL statement
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0  # Wait for a free connection before failing
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Replace connections older than this
+    DB_STATEMENT_CACHE_SIZE: int = 500  # asyncpg prepared statements per connection; 0 behind pgbouncer
     
     # Zerodha settings
     ZERODHA_API_KEY: str
     ZERODHA_API_SECRET: str
     ZERODHA_ACCESS_TOKEN: Optional[str] = None
+    ZERODHA_BASE_URL: str = "https://api.kite.trade"  # Point at devtools.fake_kite for offline load tests
     
     # Trading settings
     VALID_SYMBOLS: List[str] = [
@@ -25,8 +38,63 @@ class Settings(BaseSettings):
         # Add more valid symbols
     ]
     
+    # Backfill settings
+    NSE_EXTRA_HOLIDAYS: List[date] = []  # Holidays not yet in the built-in calendar
+    BACKFILL_MAX_SPAN_DAYS: int = 365  # Longest date range requested in one Zerodha call
+    BACKFILL_MAX_GAP_SESSIONS: int = 3  # Stored sessions re-downloaded at most to merge two gaps into one call
+    DAILY_UPDATE_LOOKBACK_DAYS: int = 5
+    
+    # Universe screener settings
+    SCREENER_CHUNK_SIZE: int = 200  # Symbols loaded per batch, bounds memory use
+    SCREENER_SHORTLIST_SIZE: int = 50
+    SCREENER_LOOKBACK_DAYS: int = 365  # Enough history for the 30-week SMA
+    SCREENER_MIN_VOLUME_RATIO: float = 1.2
+    SCREENER_INGEST: bool = True  # Fetch latest candles before screening
+    
+    # Relative strength settings
+    RS_BENCHMARK_SYMBOL: str = "NIFTY 50"  # Index whose daily candles are stored in stock_data
+    RS_LOOKBACK_DAYS: int = 380  # Calendar days covering the longest (252-session) window
+    
+    # Sector analysis settings
+    SECTOR_MAP_FILE: Optional[str] = None  # CSV with Symbol and Industry columns (e.g. NSE index lists), applied to instruments each run
+    SECTOR_LOOKBACK_DAYS: int = 380  # Calendar days covering the 52-week high/low window
+    SECTOR_CACHE_TTL_SECONDS: float = 300.0  # How long a process reuses the loaded sector snapshot
+    
+    # Job queue settings
+    JOB_POLL_INTERVAL_SECONDS: float = 5.0
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: int = 60
+    JOB_LOCK_TIMEOUT_SECONDS: int = 900  # Running jobs without a heartbeat this long are reclaimed
+    JOB_HEARTBEAT_INTERVAL_SECONDS: float = 60.0  # How often a worker refreshes the lock of its running job
+    
+    # Logging settings
+    LOG_LEVEL: str = "INFO"
+    LOG_FILE: Optional[str] = "logs/tradingai.log"
+    LOG_FILE_LEVEL: str = "INFO"  # DEBUG formats every debug message on hot paths
+    LOG_MODULE_LEVELS: Dict[str, str] = {}  # e.g. {"tradingai.repository": "WARNING"}
+    LOG_ENQUEUE: bool = True  # Write logs from a background thread, never blocking the event loop
+    LOG_RATE_LIMIT_PER_MINUTE: int = 60  # INFO/DEBUG messages per call site; 0 disables
+    
+    # Live ticker settings
+    TICKER_ENABLED: bool = False  # Stream ticks in the API process so analysis sees the live bar
+    ZERODHA_TICKER_URL: str = "wss://ws.kite.trade"  # Point at devtools.fake_ticker for offline runs
+    TICKER_SYMBOLS: List[str] = []  # Empty subscribes to NSE equities from the instruments table
+    TICKER_MAX_TOKENS: int = 3000  # Kite's per-connection subscription limit
+    TICKER_MINUTE_BARS: int = 375  # Minute bars kept in memory per symbol (one session)
+    TICKER_FLUSH_SECONDS: float = 5.0  # How often completed daily bars are written to stock_data
+    SIGNAL_ALERTS_ENABLED: bool = True  # Evaluate analyzer rules on live bars while the ticker runs
+    ALERT_VOLUME_SPIKE_RATIO: float = 1.5  # Volume / 30-day volume EMA that raises a volume_spike alert
+    ALERT_SEED_LOOKBACK_DAYS: int = 365  # Daily history loaded to warm up the incremental indicators
+    ALERT_QUEUE_SIZE: int = 1000  # Alerts buffered per subscriber; the oldest are dropped beyond this
+    
+    # Metrics settings
+    METRICS_ENABLED: bool = True  # Collect timings and expose them at /metrics
+    
     # Mock settings
     USE_MOCK_ZERODHA: bool = False  # Set to False to use real API
+    MOCK_ZERODHA_LATENCY_SECONDS: float = 0.0  # Simulated latency per mock API call
+    MOCK_ZERODHA_ERROR_RATE: float = 0.0  # Fraction of mock API calls that fail
+    MOCK_DATA_SEED: int = 42  # Same seed, same mock prices
     
     # API settings
     API_KEY: str = "your-secret-key"
@@ -35,6 +103,26 @@ class Settings(BaseSettings):
     LLM_MODEL_NAME: str = "gpt-4"
     OPENAI_API_KEY: str = "sk-..."
     
+    # LLM gate settings (answer obvious HOLD cases without calling the LLM)
+    LLM_GATE_ENABLED: bool = True
+    LLM_GATE_HOLD_ON_BEARISH_DOWNTREND: bool = True
+    LLM_GATE_HOLD_ON_MISALIGNED_TREND: bool = True
+    LLM_GATE_HOLD_WITHOUT_CANDLE_GROUP: bool = True
+    LLM_GATE_MIN_MARKET_SCORE: Optional[int] = None
+    
+    # Trading signal store
+    SIGNAL_BATCH_SIZE: int = 100  # Buffered signals written per INSERT
+    SIGNAL_FLUSH_SECONDS: float = 2.0  # Max time a signal waits in the buffer
+    SIGNAL_REUSE_SECONDS: int = 1800  # Reuse a stored decision for the same session instead of asking the LLM again; 0 disables
+    
+    # Multi-timeframe analysis
+    SERIES_CACHE_MAX_SYMBOLS: int = 512  # Symbols whose daily/weekly/monthly frames stay in memory
+    SERIES_CACHE_TTL_SECONDS: float = 300.0  # Reload from the database after this long
+    TIMEFRAME_LOOKBACK_DAYS: int = 1100  # Daily history loaded; monthly MACD needs about three years
+    
+    # Corporate action adjustment
+    ADJUSTMENT_CACHE_TTL_SECONDS: float = 300.0  # Reload corporate actions recorded by other processes after this long
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
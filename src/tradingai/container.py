@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+from typing import Optional
+import aiohttp
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config.settings import settings
+from .domain.llm_trade import LLMTradeAnalyzer
+from .domain.symbol_index import SymbolIndex
+from .repository.instrument_repository import InstrumentRepository
+from .repository.rate_limiter import AsyncRateLimiter
+from .repository.trade_repository import SignalWriter
+from .repository.zerodha import ZerodhaClient, MAX_CALLS_PER_MINUTE, ONE_MINUTE
+from .repository.zerodha_factory import get_zerodha_client
+from .service.instrument_service import InstrumentService, get_symbol_index
+from .service.stock_service import StockService
+
+@dataclass
+class AppContainer:
+    """
+    Long-lived, stateless clients built once per process.
+    Per-request services are cheap wrappers that combine these with a DB session.
+    """
+    http_session: aiohttp.ClientSession
+    rate_limiter: AsyncRateLimiter
+    zerodha_client: ZerodhaClient
+    instrument_repository: InstrumentRepository
+    llm_analyzer: LLMTradeAnalyzer
+    signal_writer: SignalWriter
+
+    @classmethod
+    def create(cls) -> "AppContainer":
+        """Build the clients; must be called from a running event loop"""
+        http_session = aiohttp.ClientSession()
+        rate_limiter = AsyncRateLimiter(MAX_CALLS_PER_MINUTE, ONE_MINUTE)
+        return cls(
+            http_session=http_session,
+            rate_limiter=rate_limiter,
+            zerodha_client=get_zerodha_client(session=http_session, rate_limiter=rate_limiter),
+            instrument_repository=InstrumentRepository(session=http_session),
+            llm_analyzer=LLMTradeAnalyzer(model_name=settings.LLM_MODEL_NAME),
+            signal_writer=SignalWriter()
+        )
+
+    @property
+    def symbol_index(self) -> Optional[SymbolIndex]:
+        return get_symbol_index()
+
+    def instrument_service(self, db: AsyncSession) -> InstrumentService:
+        return InstrumentService(db, self.instrument_repository)
+
+    def stock_service(self, db: AsyncSession) -> StockService:
+        return StockService(
+            db, self.zerodha_client, llm_analyzer=self.llm_analyzer, signal_writer=self.signal_writer
+        )
+
+    async def close(self) -> None:
+        await self.signal_writer.close()
+        await self.http_session.close()
+
+_container: Optional[AppContainer] = None
+
+def init_container() -> AppContainer:
+    """Create the process-wide container if it does not exist yet"""
+    global _container
+    if _container is None:
+        _container = AppContainer.create()
+        logger.info("Application container initialized")
+    return _container
+
+def get_container() -> AppContainer:
+    if _container is None:
+        raise RuntimeError("Application container is not initialized")
+    return _container
+
+async def close_container() -> None:
+    global _container
+    if _container is not None:
+        await _container.close()
+        _container = None
@@ -0,0 +1,3 @@
+"""
+Local development and load-testing tools; not used by the API or worker
+"""
@@ -0,0 +1,185 @@
+"""
+Local stand-in for the Kite Connect API, so the real ZerodhaClient,
+InstrumentRepository and ZerodhaAuthRepository (HTTP, JSON/CSV parsing,
+retries and rate limiting) can be load-tested and profiled offline.
+
+    python -m src.tradingai.devtools.fake_kite --port 8765 --instruments 100000 --latency 0.05
+
+Then point the app at it with ZERODHA_BASE_URL=http://127.0.0.1:8765.
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+from aiohttp import web
+from loguru import logger
+
+from ..config.settings import settings
+from ..repository.mock_data import generate_candles
+
+INSTRUMENTS_HEADER = "instrument_token,exchange_token,tradingsymbol,name,last_price,expiry,strike,tick_size,lot_size,instrument_type,segment,exchange"
+# Rough segment mix of the real dump: one NSE equity row in twelve
+OTHER_SEGMENTS = [("BSE", "BSE", "EQ"), ("NFO-OPT", "NFO", "CE"), ("NFO-FUT", "NFO", "FUT"), ("MCX-OPT", "MCX", "PE")]
+NSE_EVERY = 12
+# Index rows as listed by Kite, with their real tokens; NIFTY 50 is the RS benchmark
+INDEX_ROWS = ["256265,1001,NIFTY 50,NIFTY 50,0,,0,0,0,EQ,INDICES,NSE", "260105,1016,NIFTY BANK,NIFTY BANK,0,,0,0,0,EQ,INDICES,NSE"]
+KITE_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+MAX_DAYS_PER_INTERVAL = {"minute": 60, "day": 2000}  # Kite's historical range limits
+STREAM_CHUNK_SIZE = 64 * 1024
+
+@dataclass
+class FakeKiteConfig:
+    latency_seconds: float = 0.0  # Added to every response
+    latency_jitter_seconds: float = 0.0  # Uniform extra latency on top
+    historical_rate_limit: int = 3  # Historical requests per second before 429s; 0 disables
+    throttle_rate: float = 0.0  # Fraction of requests answered with 429 regardless of rate
+    instruments: int = 10000  # Rows in the /instruments dump
+    symbols: Optional[List[str]] = None  # Listed as the first NSE equities; defaults to VALID_SYMBOLS
+    seed: int = 42
+
+def _kite_error(status: int, message: str, error_type: str) -> web.Response:
+    return web.json_response(
+        {"status": "error", "message": message, "error_type": error_type},
+        status=status
+    )
+
+def build_instruments(count: int, symbols: List[str]) -> Tuple[bytes, Dict[int, str]]:
+    """
+    Instruments CSV plus a token -> symbol map. The given symbols become the
+    first NSE equity rows so the usual symbols resolve.
+    """
+    rng = random.Random(count)
+    lines = [INSTRUMENTS_HEADER]
+    tokens: Dict[int, str] = {}
+    named = iter(symbols)
+    for i in range(count):
+        if i % NSE_EVERY == 0:
+            segment, exchange, instrument_type = "NSE", "NSE", "EQ"
+            symbol = next(named, f"SYM{i}")
+        else:
+            segment, exchange, instrument_type = rng.choice(OTHER_SEGMENTS)
+            symbol = f"SYM{i}"
+        token = 256 * i + 1
+        tokens[token] = symbol
+        lines.append(f"{token},{i},{symbol},{symbol} LTD,0,,0,0.05,1,{instrument_type},{segment},{exchange}")
+    for row in INDEX_ROWS:
+        token, _, symbol = row.split(",")[:3]
+        tokens[int(token)] = symbol
+        lines.append(row)
+    return ("\n".join(lines) + "\n").encode(), tokens
+
+class FakeKite:
+    def __init__(self, config: FakeKiteConfig):
+        self.config = config
+        self.instruments_csv, self.tokens = build_instruments(
+            config.instruments, config.symbols if config.symbols is not None else settings.VALID_SYMBOLS
+        )
+        self._historical_calls: Deque[float] = deque()
+        self._rng = random.Random(config.seed)
+        self.stats = {"requests": 0, "throttled": 0, "candles": 0}
+
+    def _throttled(self, request: web.Request) -> bool:
+        if self.config.throttle_rate and self._rng.random() < self.config.throttle_rate:
+            return True
+        if not self.config.historical_rate_limit or not request.path.startswith("/instruments/historical/"):
+            return False
+        now = time.monotonic()
+        while self._historical_calls and now - self._historical_calls[0] >= 1.0:
+            self._historical_calls.popleft()
+        if len(self._historical_calls) >= self.config.historical_rate_limit:
+            return True
+        self._historical_calls.append(now)
+        return False
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler):
+        self.stats["requests"] += 1
+        delay = self.config.latency_seconds + self._rng.uniform(0, self.config.latency_jitter_seconds)
+        if delay:
+            await asyncio.sleep(delay)
+        if self._throttled(request):
+            self.stats["throttled"] += 1
+            return _kite_error(429, "Too many requests", "NetworkException")
+        if request.path != "/session/token" and not request.headers.get("Authorization", "").startswith("token "):
+            return _kite_error(403, "Missing api_key or access_token", "TokenException")
+        return await handler(request)
+
+    async def instruments(self, request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/csv"})
+        await response.prepare(request)
+        for start in range(0, len(self.instruments_csv), STREAM_CHUNK_SIZE):
+            await response.write(self.instruments_csv[start:start + STREAM_CHUNK_SIZE])
+        await response.write_eof()
+        return response
+
+    async def historical(self, request: web.Request) -> web.Response:
+        interval = request.match_info["interval"]
+        if interval not in MAX_DAYS_PER_INTERVAL:
+            return _kite_error(400, f"Unsupported interval: {interval}", "InputException")
+        try:
+            symbol = self.tokens[int(request.match_info["token"])]
+            from_date = datetime.strptime(request.query["from"], KITE_DATE_FORMAT)
+            to_date = datetime.strptime(request.query["to"], KITE_DATE_FORMAT)
+        except (KeyError, ValueError):
+            return _kite_error(400, "Invalid instrument token or date range", "InputException")
+        if (to_date - from_date).days > MAX_DAYS_PER_INTERVAL[interval]:
+            return _kite_error(400, "Interval exceeds max limit", "InputException")
+
+        candles = generate_candles(symbol, from_date, to_date, interval=interval, seed=self.config.seed)
+        self.stats["candles"] += len(candles)
+        return web.json_response({"status": "success", "data": {"candles": candles.to_kite_candles()}})
+
+    async def session_token(self, request: web.Request) -> web.Response:
+        data = await request.post()
+        if not all(data.get(field) for field in ("api_key", "request_token", "checksum")):
+            return _kite_error(400, "Missing api_key, request_token or checksum", "InputException")
+        return web.json_response({
+            "status": "success",
+            "data": {
+                "user_id": "FAKE01",
+                "api_key": data["api_key"],
+                "access_token": f"fake-{data['request_token']}",
+                "login_time": datetime.now().strftime(KITE_DATE_FORMAT)
+            }
+        })
+
+FAKE_KITE = web.AppKey("fake_kite", FakeKite)
+
+def create_app(config: Optional[FakeKiteConfig] = None) -> web.Application:
+    fake = FakeKite(config or FakeKiteConfig())
+    app = web.Application(middlewares=[fake.middleware])
+    app[FAKE_KITE] = fake
+    app.router.add_get("/instruments", fake.instruments)
+    app.router.add_get("/instruments/historical/{token}/{interval}", fake.historical)
+    app.router.add_post("/session/token", fake.session_token)
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform extra latency in seconds")
+    parser.add_argument("--rate-limit", type=int, default=3, help="Historical requests per second; 0 disables")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--instruments", type=int, default=10000, help="Rows in the instruments dump")
+    parser.add_argument("--seed", type=int, default=settings.MOCK_DATA_SEED)
+    args = parser.parse_args()
+
+    config = FakeKiteConfig(
+        latency_seconds=args.latency,
+        latency_jitter_seconds=args.jitter,
+        historical_rate_limit=args.rate_limit,
+        throttle_rate=args.throttle_rate,
+        instruments=args.instruments,
+        seed=args.seed
+    )
+    logger.info("Fake Kite API on http://{}:{} ({} instruments)", args.host, args.port, args.instruments)
+    web.run_app(create_app(config), host=args.host, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Local stand-in for the Kite WebSocket ticker. Accepts subscribe/mode
+messages and streams full-mode binary packets with random-walk prices for
+every subscribed token.
+
+    python -m src.tradingai.devtools.fake_ticker --port 8766 --interval 0.5
+
+Then set ZERODHA_TICKER_URL=ws://127.0.0.1:8766.
+"""
+import argparse
+import asyncio
+import json
+import struct
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Set, Tuple
+import numpy as np
+from aiohttp import WSMsgType, web
+from loguru import logger
+
+from ..config.settings import settings
+from ..repository.kite_ticker import FULL_PACKET_SIZE
+
+HEARTBEAT = b"\x00"
+_FULL_HEAD = struct.Struct(">16I")
+
+@dataclass
+class FakeTickerConfig:
+    interval_seconds: float = 1.0  # Time between tick messages
+    volatility: float = 0.0005  # Log-return volatility per tick
+    seed: int = 42
+
+def pack_full_packet(
+    token: int,
+    price: float,
+    volume: int,
+    exchange_time: int,
+    ohlc: Optional[Tuple[float, float, float]] = None
+) -> bytes:
+    """
+    Full-mode packet with quote fields set and an empty market depth.
+    ohlc is the session's open, high and low, defaulting to the price.
+    """
+    paise = int(round(price * 100))
+    day_open, day_high, day_low = (int(round(value * 100)) for value in (ohlc or (price, price, price)))
+    head = _FULL_HEAD.pack(
+        token, paise, 1, paise, volume, 0, 0, day_open, day_high, day_low, paise,
+        exchange_time, 0, 0, 0, exchange_time
+    )
+    return head + bytes(FULL_PACKET_SIZE - len(head))
+
+def pack_message(packets: Iterable[bytes]) -> bytes:
+    packets = list(packets)
+    parts = [struct.pack(">H", len(packets))]
+    for packet in packets:
+        parts.append(struct.pack(">H", len(packet)))
+        parts.append(packet)
+    return b"".join(parts)
+
+class _Instrument:
+    __slots__ = ("price", "volume", "open", "high", "low")
+
+    def __init__(self, price: float):
+        self.price = price
+        self.volume = 0
+        self.open = self.high = self.low = price
+
+class FakeTicker:
+    def __init__(self, config: FakeTickerConfig):
+        self.config = config
+        self._rng = np.random.default_rng(config.seed)
+        self._instruments: Dict[int, _Instrument] = {}
+
+    def _instrument(self, token: int) -> _Instrument:
+        instrument = self._instruments.get(token)
+        if instrument is None:
+            instrument = self._instruments[token] = _Instrument(float(self._rng.uniform(50.0, 3000.0)))
+        return instrument
+
+    def next_message(self, tokens: Set[int]) -> bytes:
+        """One binary message with a tick for each token"""
+        now = int(time.time())
+        returns = self._rng.normal(0.0, self.config.volatility, len(tokens))
+        volumes = self._rng.integers(1, 500, len(tokens))
+        packets = []
+        for token, ret, traded in zip(sorted(tokens), returns, volumes):
+            instrument = self._instrument(token)
+            instrument.price *= float(np.exp(ret))
+            instrument.volume += int(traded)
+            instrument.high = max(instrument.high, instrument.price)
+            instrument.low = min(instrument.low, instrument.price)
+            packets.append(pack_full_packet(
+                token, instrument.price, instrument.volume, now, (instrument.open, instrument.high, instrument.low)
+            ))
+        return pack_message(packets)
+
+    async def handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        tokens: Set[int] = set()
+
+        async def send_ticks() -> None:
+            try:
+                while not ws.closed:
+                    await ws.send_bytes(self.next_message(tokens) if tokens else HEARTBEAT)
+                    await asyncio.sleep(self.config.interval_seconds)
+            except ConnectionResetError:
+                pass  # Client went away
+
+        sender = asyncio.create_task(send_ticks())
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                request_data = json.loads(message.data)
+                if request_data.get("a") == "subscribe":
+                    tokens.update(int(t) for t in request_data["v"])
+                elif request_data.get("a") == "unsubscribe":
+                    tokens.difference_update(int(t) for t in request_data["v"])
+        finally:
+            sender.cancel()
+        return ws
+
+def create_app(config: Optional[FakeTickerConfig] = None) -> web.Application:
+    ticker = FakeTicker(config or FakeTickerConfig())
+    app = web.Application()
+    app.router.add_get("/", ticker.handle)
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between tick messages")
+    parser.add_argument("--seed", type=int, default=settings.MOCK_DATA_SEED)
+    args = parser.parse_args()
+
+    logger.info("Fake Kite ticker on ws://{}:{}", args.host, args.port)
+    web.run_app(create_app(FakeTickerConfig(interval_seconds=args.interval, seed=args.seed)),
+                host=args.host, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()
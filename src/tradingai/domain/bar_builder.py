@@ -0,0 +1,221 @@
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Deque, Dict, List, Optional
+import pandas as pd
+
+from .trading_calendar import IST, MARKET_CLOSE
+
+IST_OFFSET_SECONDS = 5 * 3600 + 1800
+SECONDS_PER_DAY = 86400
+MARKET_CLOSE_SECONDS = MARKET_CLOSE.hour * 3600 + MARKET_CLOSE.minute * 60
+EPOCH_DATE = date(1970, 1, 1)
+MINUTES_PER_SESSION = 375
+
+@dataclass(frozen=True)
+class Tick:
+    instrument_token: int
+    last_price: float
+    volume_traded: int  # Cumulative volume for the day
+    exchange_time: int  # Epoch seconds
+    # Session open/high/low from quote and full packets; None in LTP mode
+    day_open: Optional[float] = None
+    day_high: Optional[float] = None
+    day_low: Optional[float] = None
+
+@dataclass
+class Bar:
+    symbol: str
+    timestamp: datetime  # Bar start, IST
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+    # Daily bars: False when open/high/low only cover the ticks this process saw
+    session_ohlc: bool = True
+
+    def update(self, price: float) -> None:
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+
+    def to_dict(self) -> Dict:
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume
+        }
+
+def _ist_day(epoch_seconds: int) -> int:
+    return (epoch_seconds + IST_OFFSET_SECONDS) // SECONDS_PER_DAY
+
+def _day_start(day: int) -> datetime:
+    return IST.localize(datetime.combine(EPOCH_DATE + timedelta(days=day), time.min))
+
+class _SymbolBars:
+    __slots__ = ("minute", "minute_key", "day", "day_key", "history", "last_volume")
+
+    def __init__(self, history_size: int):
+        self.minute: Optional[Bar] = None
+        self.minute_key = -1
+        self.day: Optional[Bar] = None
+        self.day_key = -1
+        self.history: Deque[Bar] = deque(maxlen=history_size)
+        self.last_volume: Optional[int] = None
+
+class BarBuilder:
+    """
+    Aggregates ticks into 1-minute and daily OHLCV bars per symbol.
+    Completed minute bars are kept in a fixed-size ring buffer per symbol;
+    completed daily bars are queued until `drain_completed` hands them off
+    for storage. Daily open/high/low come from the exchange's session values
+    when ticks carry them; otherwise the bar is marked `session_ohlc=False`,
+    since ticks before this process started are missing from it. `on_minute_close`, if set, is called with the symbol's live
+    daily bar whenever one of its minute bars completes. Not thread-safe:
+    feed it from a single event loop.
+    """
+
+    def __init__(
+        self,
+        minute_history: int = MINUTES_PER_SESSION,
+        on_minute_close: Optional[Callable[[Bar], None]] = None
+    ):
+        self.minute_history = minute_history
+        self.on_minute_close = on_minute_close
+        self._symbols: Dict[str, _SymbolBars] = {}
+        self._completed: List[Bar] = []
+
+    def on_tick(
+        self,
+        symbol: str,
+        price: float,
+        volume_traded: int,
+        exchange_time: int,
+        day_open: Optional[float] = None,
+        day_high: Optional[float] = None,
+        day_low: Optional[float] = None
+    ) -> None:
+        state = self._symbols.get(symbol)
+        if state is None:
+            state = self._symbols[symbol] = _SymbolBars(self.minute_history)
+
+        # Kite volume is cumulative for the day; a drop means a new session
+        if state.last_volume is None or volume_traded < state.last_volume:
+            delta = 0
+        else:
+            delta = volume_traded - state.last_volume
+        state.last_volume = volume_traded
+
+        day_key = _ist_day(exchange_time)
+        if day_key != state.day_key:
+            if day_key > state.day_key:
+                if state.day is not None:
+                    self._completed.append(state.day)
+                state.day = Bar(
+                    symbol, _day_start(day_key), price, price, price, price, volume_traded, session_ohlc=False
+                )
+                state.day_key = day_key
+                self._apply_session_ohlc(state.day, day_open, day_high, day_low)
+        elif state.day is not None:
+            state.day.update(price)
+            state.day.volume = volume_traded
+            self._apply_session_ohlc(state.day, day_open, day_high, day_low)
+
+        minute_key = exchange_time // 60
+        if minute_key > state.minute_key:
+            if state.minute is not None:
+                state.history.append(state.minute)
+                if self.on_minute_close is not None and state.day is not None:
+                    self.on_minute_close(state.day)
+            state.minute = Bar(
+                symbol, datetime.fromtimestamp(minute_key * 60, IST), price, price, price, price, delta
+            )
+            state.minute_key = minute_key
+        elif minute_key == state.minute_key:
+            state.minute.update(price)
+            state.minute.volume += delta
+
+    @staticmethod
+    def _apply_session_ohlc(
+        day: Bar, day_open: Optional[float], day_high: Optional[float], day_low: Optional[float]
+    ) -> None:
+        # Zero means the exchange has no trade yet for the session
+        if not (day_open and day_high and day_low):
+            return
+        day.open = day_open
+        day.high = max(day.high, day_high)
+        day.low = min(day.low, day_low)
+        day.session_ohlc = True
+
+    def on_ticks(self, ticks: List[Tick], symbols: Dict[int, str]) -> int:
+        """Feed a batch of ticks; returns how many belonged to known instruments"""
+        handled = 0
+        for tick in ticks:
+            symbol = symbols.get(tick.instrument_token)
+            if symbol is not None:
+                self.on_tick(
+                    symbol, tick.last_price, tick.volume_traded, tick.exchange_time,
+                    tick.day_open, tick.day_high, tick.day_low
+                )
+                handled += 1
+        return handled
+
+    def close_sessions(self, now: datetime) -> None:
+        """Queue daily bars whose session has ended by `now`"""
+        now_seconds = int(now.timestamp())
+        today = _ist_day(now_seconds)
+        after_close = (now_seconds + IST_OFFSET_SECONDS) % SECONDS_PER_DAY >= MARKET_CLOSE_SECONDS
+        for state in self._symbols.values():
+            if state.day is not None and (state.day_key < today or after_close):
+                self._completed.append(state.day)
+                state.day = None  # day_key stays, so late ticks do not reopen the session
+
+    def drain_completed(self) -> List[Bar]:
+        """Completed daily bars since the last call"""
+        completed, self._completed = self._completed, []
+        return completed
+
+    def live_minute(self, symbol: str) -> Optional[Bar]:
+        state = self._symbols.get(symbol)
+        return state.minute if state is not None else None
+
+    def live_day(self, symbol: str) -> Optional[Bar]:
+        state = self._symbols.get(symbol)
+        return state.day if state is not None else None
+
+    def minute_bars(self, symbol: str) -> List[Bar]:
+        """Recent completed minute bars, oldest first, followed by the live one"""
+        state = self._symbols.get(symbol)
+        if state is None:
+            return []
+        bars = list(state.history)
+        if state.minute is not None:
+            bars.append(state.minute)
+        return bars
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+def append_live_bar(df: pd.DataFrame, bar: Optional[Bar]) -> pd.DataFrame:
+    """
+    Add the live daily bar to a timestamp-indexed OHLCV frame from stock_data,
+    unless the frame already has that session
+    """
+    if bar is None or df.empty:
+        return df
+    timestamp = pd.Timestamp(bar.timestamp).tz_convert(df.index.tz) if df.index.tz else pd.Timestamp(bar.timestamp)
+    if timestamp <= df.index[-1]:
+        return df
+    live = pd.DataFrame(
+        [[bar.open, bar.high, bar.low, bar.close, bar.volume]],
+        columns=['open', 'high', 'low', 'close', 'volume'],
+        index=pd.DatetimeIndex([timestamp], name=df.index.name)
+    )
+    return pd.concat([df, live])
@@ -0,0 +1,191 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+INDECISION_CANDLE = "IC"
+MOMENTUM_CANDLE = "MC"
+
+BODY_RATIO_THRESHOLD = 0.5  # MC if body > 50% of high-low range
+DEFAULT_LOOKBACK = 10  # Same window the swing trader prompt reasons over
+MIN_GROUP_LENGTH = 2  # A group needs consecutive candles of the same type
+
+@dataclass
+class CandleGroup:
+    candle_type: str
+    start: datetime
+    end: datetime
+    length: int
+    high: float
+    low: float
+
+@dataclass
+class CandlePatterns:
+    labels: List[str]  # Oldest to newest
+    groups: List[CandleGroup] = field(default_factory=list)
+    latest_group: Optional[CandleGroup] = None
+    bullish_entry: Optional[float] = None  # Above latest group high
+    bullish_stop: Optional[float] = None  # Below latest group low
+    bearish_entry: Optional[float] = None  # Below latest group low
+    bearish_stop: Optional[float] = None  # Above latest group high
+
+    @property
+    def has_clear_group(self) -> bool:
+        """True if a group usable for entry/stop placement exists"""
+        return self.latest_group is not None
+
+    def to_dict(self) -> dict:
+        """Serialize for API responses and LLM prompts"""
+        def group_dict(group: CandleGroup) -> dict:
+            return {
+                "type": group.candle_type,
+                "start": group.start.isoformat(),
+                "end": group.end.isoformat(),
+                "length": group.length,
+                "high": group.high,
+                "low": group.low
+            }
+
+        return {
+            "labels": self.labels,
+            "groups": [group_dict(g) for g in self.groups],
+            "latest_group": group_dict(self.latest_group) if self.latest_group else None,
+            "bullish_entry": self.bullish_entry,
+            "bullish_stop": self.bullish_stop,
+            "bearish_entry": self.bearish_entry,
+            "bearish_stop": self.bearish_stop
+        }
+
+def classify_candles(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    threshold: float = BODY_RATIO_THRESHOLD
+) -> np.ndarray:
+    """Return a boolean array that is True for momentum candles"""
+    body = np.abs(np.asarray(close, dtype=float) - np.asarray(open_, dtype=float))
+    candle_range = np.asarray(high, dtype=float) - np.asarray(low, dtype=float)
+    # Zero-range candles (e.g. circuit-locked days) are indecision candles
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(candle_range > 0, body / candle_range, 0.0)
+    return ratio > threshold
+
+def label_candles(df: pd.DataFrame, threshold: float = BODY_RATIO_THRESHOLD) -> pd.Series:
+    """Label each row of an OHLC frame as IC or MC"""
+    is_mc = classify_candles(
+        df['open'].to_numpy(), df['high'].to_numpy(),
+        df['low'].to_numpy(), df['close'].to_numpy(),
+        threshold
+    )
+    return pd.Series(
+        np.where(is_mc, MOMENTUM_CANDLE, INDECISION_CANDLE),
+        index=df.index
+    )
+
+def _summarize_groups(frame: pd.DataFrame, threshold: float) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Group consecutive same-type candles per symbol.
+    Expects columns symbol/timestamp/open/high/low/close sorted by symbol then time.
+    Returns:
+        Tuple of (labelled candles, one row per group)
+    """
+    is_mc = classify_candles(
+        frame['open'].to_numpy(), frame['high'].to_numpy(),
+        frame['low'].to_numpy(), frame['close'].to_numpy(),
+        threshold
+    )
+    symbols = frame['symbol'].to_numpy()
+
+    # A new group starts whenever the symbol or the candle type changes
+    boundary = np.ones(len(frame), dtype=bool)
+    boundary[1:] = (symbols[1:] != symbols[:-1]) | (is_mc[1:] != is_mc[:-1])
+
+    labelled = frame.assign(
+        is_mc=is_mc,
+        group_id=np.cumsum(boundary)
+    )
+    return labelled, labelled.groupby('group_id', sort=True).agg(
+        symbol=('symbol', 'first'),
+        is_mc=('is_mc', 'first'),
+        start=('timestamp', 'first'),
+        end=('timestamp', 'last'),
+        length=('timestamp', 'size'),
+        high=('high', 'max'),
+        low=('low', 'min')
+    )
+
+def _build_patterns(labels: np.ndarray, groups: pd.DataFrame) -> CandlePatterns:
+    candle_groups = [
+        CandleGroup(
+            candle_type=MOMENTUM_CANDLE if row.is_mc else INDECISION_CANDLE,
+            start=row.start,
+            end=row.end,
+            length=int(row.length),
+            high=float(row.high),
+            low=float(row.low)
+        )
+        for row in groups.itertuples(index=False)
+    ]
+    patterns = CandlePatterns(
+        labels=[MOMENTUM_CANDLE if mc else INDECISION_CANDLE for mc in labels],
+        groups=candle_groups
+    )
+
+    latest = next(
+        (g for g in reversed(candle_groups) if g.length >= MIN_GROUP_LENGTH),
+        None
+    )
+    if latest is not None:
+        patterns.latest_group = latest
+        patterns.bullish_entry = latest.high
+        patterns.bullish_stop = latest.low
+        patterns.bearish_entry = latest.low
+        patterns.bearish_stop = latest.high
+    return patterns
+
+def detect_candle_patterns_bulk(
+    panel: pd.DataFrame,
+    lookback: int = DEFAULT_LOOKBACK,
+    threshold: float = BODY_RATIO_THRESHOLD
+) -> Dict[str, CandlePatterns]:
+    """
+    Detect IC/MC labels, groups and entry/stop levels for many symbols at once.
+    Args:
+        panel: Long-format OHLC frame with a 'symbol' column and a timestamp
+               index (or 'timestamp' column)
+        lookback: Number of most recent candles per symbol to consider
+    Returns:
+        Mapping of symbol -> CandlePatterns
+    """
+    if panel.empty:
+        return {}
+
+    frame = panel if 'timestamp' in panel.columns else panel.rename_axis('timestamp').reset_index()
+    frame = (
+        frame.sort_values(['symbol', 'timestamp'], kind='stable')
+        .groupby('symbol', sort=False)
+        .tail(lookback)
+        .reset_index(drop=True)
+    )
+
+    labelled, groups = _summarize_groups(frame, threshold)
+    labels_by_symbol = labelled.groupby('symbol', sort=False)['is_mc']
+
+    return {
+        symbol: _build_patterns(labels_by_symbol.get_group(symbol).to_numpy(), symbol_groups)
+        for symbol, symbol_groups in groups.groupby('symbol', sort=False)
+    }
+
+def detect_candle_patterns(
+    df: pd.DataFrame,
+    lookback: int = DEFAULT_LOOKBACK,
+    threshold: float = BODY_RATIO_THRESHOLD
+) -> CandlePatterns:
+    """Detect IC/MC patterns for a single symbol's timestamp-indexed OHLC frame"""
+    if df.empty:
+        return CandlePatterns(labels=[])
+
+    frame = df.assign(symbol="_")
+    return detect_candle_patterns_bulk(frame, lookback, threshold)["_"]
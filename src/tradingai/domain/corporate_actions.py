@@ -0,0 +1,149 @@
+"""
+Split and bonus adjustment of stored candles.
+
+`stock_data` keeps raw candles. Each corporate action carries a price
+factor for bars before its ex-date; a bar's cumulative factor is the
+product over every action after it, so adjusting a series is one
+multiply of its price columns (and a divide of volume).
+"""
+from datetime import date, datetime
+import time
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from ..config.settings import settings
+from .trading_calendar import IST
+
+SPLIT = "split"  # ratio "old:new" shares, e.g. "1:5" for a face value split from 10 to 2
+BONUS = "bonus"  # ratio "bonus:held", e.g. "1:2" for one bonus share per two held
+ADJUSTMENT = "adjustment"  # explicit price factor, for rights issues, demergers and the like
+ACTION_TYPES = (SPLIT, BONUS, ADJUSTMENT)
+
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+
+def _parse_ratio(ratio: Optional[str]) -> Tuple[float, float]:
+    try:
+        first, second = (float(part) for part in (ratio or "").split(":"))
+    except ValueError:
+        raise ValueError(f"Ratio must look like '1:5', got {ratio!r}")
+    if first <= 0 or second <= 0:
+        raise ValueError(f"Ratio parts must be positive, got {ratio!r}")
+    return first, second
+
+def adjustment_factor(action_type: str, ratio: Optional[str] = None, factor: Optional[float] = None) -> float:
+    """Price multiplier for bars before the ex-date"""
+    if action_type == SPLIT:
+        old, new = _parse_ratio(ratio)
+        return old / new
+    if action_type == BONUS:
+        bonus, held = _parse_ratio(ratio)
+        return held / (held + bonus)
+    if action_type == ADJUSTMENT:
+        if factor is None or factor <= 0:
+            raise ValueError("An adjustment needs a positive factor")
+        return factor
+    raise ValueError(f"Action type must be one of: {', '.join(ACTION_TYPES)}")
+
+def session_dates(timestamps) -> np.ndarray:
+    """IST trading date of each timestamp as datetime64[D]; naive timestamps are taken as IST"""
+    index = pd.DatetimeIndex(timestamps)
+    if index.tz is not None:
+        index = index.tz_convert(IST).tz_localize(None)
+    return index.to_numpy().astype("datetime64[D]")
+
+def apply_factors(df: pd.DataFrame, factors: np.ndarray) -> pd.DataFrame:
+    """Scale OHLC by the per-row factors and volume inversely, in place"""
+    df[PRICE_COLUMNS] = df[PRICE_COLUMNS].to_numpy(dtype=float) * factors[:, None]
+    df["volume"] = np.rint(df["volume"].to_numpy(dtype=float) / factors).astype("int64")
+    return df
+
+class AdjustmentCache:
+    """
+    Every symbol's corporate actions as sorted ex-date and factor arrays.
+    The table is small, so it is loaded whole and reloaded after
+    ttl_seconds; `invalidate` forces a reload when an action is recorded.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0):
+        self.ttl_seconds = ttl_seconds
+        self._actions: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._loaded_at: Optional[float] = None
+
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    def load(self, actions: Iterable[Tuple[str, date, float]]) -> None:
+        """Replace the cached actions with (symbol, ex_date, factor) rows"""
+        by_symbol: Dict[str, list] = {}
+        for symbol, ex_date, factor in actions:
+            by_symbol.setdefault(symbol, []).append((ex_date, factor))
+        self._actions = {}
+        for symbol, rows in by_symbol.items():
+            rows.sort()
+            self._actions[symbol] = (
+                np.array([ex_date for ex_date, _ in rows], dtype="datetime64[D]"),
+                np.array([factor for _, factor in rows], dtype=float)
+            )
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def has_actions(self, symbol: str) -> bool:
+        return symbol in self._actions
+
+    def factors(self, symbol: str, dates: np.ndarray, as_of: Optional[date] = None) -> Optional[np.ndarray]:
+        """
+        Cumulative factor for each bar date: the product of the factors of
+        actions with an ex-date after the bar and on or before as_of (today).
+        None if no action applies, so callers can skip the multiply.
+        """
+        entry = self._actions.get(symbol)
+        if entry is None:
+            return None
+        ex_dates, factors = entry
+        # Announced actions take effect on their ex-date, not before
+        effective = ex_dates <= np.datetime64(as_of or datetime.now(IST).date(), "D")
+        ex_dates, factors = ex_dates[effective], factors[effective]
+        if not len(ex_dates):
+            return None
+        cumulative = np.append(np.cumprod(factors[::-1])[::-1], 1.0)
+        return cumulative[np.searchsorted(ex_dates, dates, side="right")]
+
+    def adjust_frame(self, symbol: str, df: pd.DataFrame, as_of: Optional[date] = None) -> pd.DataFrame:
+        """Adjust a timestamp-indexed OHLCV frame in place"""
+        if df.empty or not self.has_actions(symbol):
+            return df
+        factors = self.factors(symbol, session_dates(df.index), as_of)
+        return df if factors is None else apply_factors(df, factors)
+
+    def adjust_panel(self, panel: pd.DataFrame, as_of: Optional[date] = None) -> pd.DataFrame:
+        """Adjust a long-format panel in place; rows of symbols without actions keep a factor of 1"""
+        if panel.empty:
+            return panel
+        symbols = panel["symbol"].to_numpy()
+        affected = [symbol for symbol in pd.unique(symbols) if self.has_actions(symbol)]
+        if not affected:
+            return panel
+        dates = session_dates(panel["timestamp"])
+        factors = np.ones(len(panel))
+        for symbol in affected:
+            rows = symbols == symbol
+            symbol_factors = self.factors(symbol, dates[rows], as_of)
+            if symbol_factors is not None:
+                factors[rows] = symbol_factors
+        return apply_factors(panel, factors)
+
+_adjustment_cache: Optional[AdjustmentCache] = None
+
+def get_adjustment_cache() -> AdjustmentCache:
+    """Process-wide adjustment cache"""
+    global _adjustment_cache
+    if _adjustment_cache is None:
+        _adjustment_cache = AdjustmentCache(settings.ADJUSTMENT_CACHE_TTL_SECONDS)
+    return _adjustment_cache
+
+def set_adjustment_cache(cache: Optional[AdjustmentCache]) -> None:
+    global _adjustment_cache
+    _adjustment_cache = cache
@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Sequence, Set
+
+from .trading_calendar import TradingCalendar
+
+@dataclass(frozen=True)
+class DateRange:
+    start: date
+    end: date  # Inclusive
+
+    @property
+    def span_days(self) -> int:
+        return (self.end - self.start).days + 1
+
+def find_missing_ranges(sessions: Sequence[date], existing: Set[date]) -> List[DateRange]:
+    """Group trading sessions without stored data into contiguous runs"""
+    ranges: List[DateRange] = []
+    run_start = None
+    run_end = None
+    for session in sessions:
+        if session in existing:
+            if run_start is not None:
+                ranges.append(DateRange(run_start, run_end))
+                run_start = None
+            continue
+        if run_start is None:
+            run_start = session
+        run_end = session
+    if run_start is not None:
+        ranges.append(DateRange(run_start, run_end))
+    return ranges
+
+def merge_ranges(
+    ranges: Iterable[DateRange],
+    max_span_days: int,
+    calendar: Optional[TradingCalendar] = None,
+    max_gap_sessions: Optional[int] = None
+) -> List[DateRange]:
+    """
+    Cover missing ranges with few requests without re-downloading much.
+    Neighbouring ranges are merged while the combined span fits in one
+    request and, given a calendar, at most max_gap_sessions stored sessions
+    lie between them; those sessions are skipped on insert.
+    Ranges longer than max_span_days are split.
+    """
+    def close_enough(previous: DateRange, missing: DateRange) -> bool:
+        if (missing.end - previous.start).days + 1 > max_span_days:
+            return False
+        if calendar is None or max_gap_sessions is None:
+            return True
+        between = calendar.session_days(previous.end + timedelta(days=1), missing.start - timedelta(days=1))
+        return len(between) <= max_gap_sessions
+
+    planned: List[DateRange] = []
+    for missing in sorted(ranges, key=lambda r: r.start):
+        if planned and close_enough(planned[-1], missing):
+            planned[-1] = DateRange(planned[-1].start, max(planned[-1].end, missing.end))
+            continue
+        start = missing.start
+        while (missing.end - start).days + 1 > max_span_days:
+            end = date.fromordinal(start.toordinal() + max_span_days - 1)
+            planned.append(DateRange(start, end))
+            start = date.fromordinal(end.toordinal() + 1)
+        planned.append(DateRange(start, missing.end))
+    return planned
+
+def plan_backfill(
+    calendar: TradingCalendar,
+    start: date,
+    end: date,
+    existing: Set[date],
+    max_span_days: int,
+    max_gap_sessions: Optional[int] = None
+) -> List[DateRange]:
+    """
+    Plan the date ranges to request so every trading session between start
+    and end has data. Gaps separated by more than max_gap_sessions stored
+    sessions are requested separately.
+    """
+    missing = find_missing_ranges(calendar.sessions(start, end), existing)
+    return merge_ranges(missing, max_span_days, calendar, max_gap_sessions)
@@ -0,0 +1,137 @@
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    from .symbol_index import InstrumentEntry
+
+MATCH_EXACT = "exact"
+MATCH_SYMBOL_PREFIX = "symbol_prefix"
+MATCH_NAME_PREFIX = "name_prefix"
+MATCH_FUZZY = "fuzzy"
+
+# Fuzzy candidates below this trigram similarity are dropped
+MIN_FUZZY_SIMILARITY = 0.3
+
+@dataclass(frozen=True)
+class SearchMatch:
+    entry: "InstrumentEntry"
+    match_type: str
+    score: float
+
+    def to_dict(self) -> Dict:
+        return {
+            "symbol": self.entry.tradingsymbol,
+            "name": self.entry.name,
+            "exchange": self.entry.exchange,
+            "instrument_type": self.entry.instrument_type,
+            "instrument_token": self.entry.instrument_token,
+            "match": self.match_type,
+            "score": round(self.score, 3)
+        }
+
+# Sorted keys of one length, with the entry index of each
+KeyBucket = Tuple[int, List[str], List[int]]
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of a case-folded, space-padded string"""
+    padded = f"  {text.casefold()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class InstrumentSearchIndex:
+    """
+    Autocomplete index over trading symbols and names.
+    Prefix matches come from sorted key arrays searched with bisect, one
+    array per key length so the shortest completions are found first; fuzzy
+    matches from an inverted trigram index. Built once per symbol index.
+    """
+
+    def __init__(self, entries: Sequence["InstrumentEntry"]):
+        self._entries = tuple(entries)
+
+        self._symbol_buckets = self._buckets((e.tradingsymbol.casefold(), i) for i, e in enumerate(self._entries))
+        self._name_buckets = self._buckets((e.name.casefold(), i) for i, e in enumerate(self._entries) if e.name)
+
+        postings: Dict[str, List[int]] = defaultdict(list)
+        self._gram_counts: List[int] = []
+        for i, entry in enumerate(self._entries):
+            grams = trigrams(entry.tradingsymbol) | trigrams(entry.name)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                postings[gram].append(i)
+        self._postings = {gram: tuple(ids) for gram, ids in postings.items()}
+
+    @staticmethod
+    def _buckets(keyed: Iterable[Tuple[str, int]]) -> List[KeyBucket]:
+        by_length: Dict[int, List[Tuple[str, int]]] = defaultdict(list)
+        for key, i in keyed:
+            by_length[len(key)].append((key, i))
+        buckets = []
+        for length in sorted(by_length):
+            pairs = sorted(by_length[length])
+            buckets.append((length, [k for k, _ in pairs], [i for _, i in pairs]))
+        return buckets
+
+    @staticmethod
+    def _prefix_ids(buckets: List[KeyBucket], prefix: str, limit: int) -> List[int]:
+        """
+        Up to limit entries whose key starts with prefix, shortest key first.
+        That is the order they rank in, so the limit never drops a better match.
+        """
+        found = []
+        for length, keys, ids in buckets:
+            if length < len(prefix):
+                continue
+            pos = bisect_left(keys, prefix)
+            while pos < len(keys) and keys[pos].startswith(prefix):
+                if len(found) == limit:
+                    return found
+                found.append(ids[pos])
+                pos += 1
+        return found
+
+    def _fuzzy(self, query: str) -> List[Tuple[int, float]]:
+        query_grams = trigrams(query)
+        hits: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for i in self._postings.get(gram, ()):
+                hits[i] += 1
+        scored = []
+        for i, shared in hits.items():
+            similarity = shared / (len(query_grams) + self._gram_counts[i] - shared)
+            if similarity >= MIN_FUZZY_SIMILARITY:
+                scored.append((i, similarity))
+        return scored
+
+    def search(self, query: str, limit: int = 10) -> List[SearchMatch]:
+        """
+        Ranked matches for a query: exact symbol, then symbol prefix, then
+        name prefix, then fuzzy trigram matches.
+        """
+        folded = query.strip().casefold()
+        if not folded or limit <= 0:
+            return []
+
+        matches: Dict[int, SearchMatch] = {}
+
+        def add(i: int, match_type: str, score: float) -> None:
+            if i not in matches or matches[i].score < score:
+                matches[i] = SearchMatch(self._entries[i], match_type, score)
+
+        for i in self._prefix_ids(self._symbol_buckets, folded, limit):
+            symbol = self._entries[i].tradingsymbol.casefold()
+            if symbol == folded:
+                add(i, MATCH_EXACT, 3.0)
+            else:
+                # Shorter completions rank first
+                add(i, MATCH_SYMBOL_PREFIX, 2.0 + len(folded) / len(symbol))
+        for i in self._prefix_ids(self._name_buckets, folded, limit):
+            add(i, MATCH_NAME_PREFIX, 1.0 + len(folded) / len(self._entries[i].name))
+
+        if len(matches) < limit:
+            for i, similarity in self._fuzzy(folded):
+                add(i, MATCH_FUZZY, similarity)
+
+        ranked = sorted(matches.values(), key=lambda m: (-m.score, m.entry.tradingsymbol))
+        return ranked[:limit]
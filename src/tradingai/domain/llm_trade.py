@@ -5,9 +5,11 @@ from langchain.output_parsers import PydanticOutputParser
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema import HumanMessage, SystemMessage
 from enum import Enum
+from loguru import logger
 
 from ..config.settings import settings
 from ..config.prompts.swing_trader import SWING_TRADER_PROMPT
+from ..metrics import LLM_REQUEST_SECONDS, LLM_TOKENS
 
 class TradeDecision(str, Enum):
     BUY = "BUY"
@@ -23,6 +25,7 @@ class TradingSignal(BaseModel):
 
 class LLMTradeAnalyzer:
     def __init__(self, model_name: str = "gpt-4o"):
+        self.model_name = model_name
         self.llm = ChatOpenAI(
             model_name=model_name,
             temperature=0.1,
@@ -31,8 +34,29 @@ class LLMTradeAnalyzer:
         self.output_parser = PydanticOutputParser(pydantic_object=TradingSignal)
         self.system_prompt = SWING_TRADER_PROMPT
         
-    async def analyze(self, market_data: dict, technical_analysis: dict, price_action: List[dict]) -> TradingSignal:
-        """Generate trading signal from market and technical data"""
+    async def analyze(
+        self,
+        market_data: dict,
+        technical_analysis: dict,
+        price_action: List[dict],
+        candle_patterns: Optional[dict] = None
+    ) -> TradingSignal:
+        """
+        Generate trading signal from market and technical data.
+        When precomputed candle patterns are supplied they replace the raw
+        price data in the prompt, so the LLM doesn't re-derive IC/MC groups.
+        """
+        
+        if candle_patterns is not None:
+            price_section = f"""
+        Candle Patterns (precomputed, oldest to newest):
+        {candle_patterns}
+        """
+        else:
+            price_section = f"""
+        Raw Price Data:
+        {price_action}
+        """
         
         analysis_prompt = f"""
         Market Conditions:
@@ -40,10 +64,7 @@ class LLMTradeAnalyzer:
         
         Technical Analysis:
         {technical_analysis}
-        
-        Raw Price Data:
-        {price_action}
-        
+        {price_section}
         Based on this data, generate a trading decision in the required JSON format.
         {self.output_parser.get_format_instructions()}
         """
@@ -53,8 +74,13 @@ class LLMTradeAnalyzer:
             HumanMessage(content=analysis_prompt)
         ]
 
-        print(messages)
+        logger.opt(lazy=True).debug("LLM prompt: {}", lambda: analysis_prompt)
         
-        response = await self.llm.agenerate([messages])
+        with LLM_REQUEST_SECONDS.time(model=self.model_name):
+            response = await self.llm.agenerate([messages])
+        token_usage = (response.llm_output or {}).get("token_usage") or {}
+        for kind in ("prompt_tokens", "completion_tokens"):
+            if token_usage.get(kind):
+                LLM_TOKENS.inc(token_usage[kind], model=self.model_name, kind=kind.replace("_tokens", ""))
         return self.output_parser.parse(response.generations[0][0].text)
     
\ No newline at end of file
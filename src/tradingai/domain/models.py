@@ -1,5 +1,6 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, Date, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, Text, Enum as SQLEnum, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -17,6 +18,11 @@ class StockData(Base):
     volume = Column(Integer, nullable=False)
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        # One bar per symbol and timestamp; concurrent writers insert with ON CONFLICT DO NOTHING
+        Index('uq_stock_data_symbol_timestamp', 'symbol', 'timestamp', unique=True),
+    )
+
     def __repr__(self):
         return f"StockData(symbol={self.symbol}, timestamp={self.timestamp})"
 
@@ -36,6 +42,7 @@ class Instrument(Base):
     instrument_type = Column(String(10))
     tick_size = Column(Float)
     lot_size = Column(Integer)
+    sector = Column(String(64), index=True)  # Not in the Kite dump; set from SECTOR_MAP_FILE
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=datetime.utcnow)
 
@@ -52,4 +59,153 @@ class MarketConditionModel(Base):
     breadth = Column(Float, nullable=True)
 
     def __repr__(self):
-        return f"<MarketCondition(date={self.date}, direction={self.direction}, score={self.score})>" 
\ No newline at end of file
+        return f"<MarketCondition(date={self.date}, direction={self.direction}, score={self.score})>" 
+
+class ScreenerResult(Base):
+    __tablename__ = "screener_shortlist"
+    __table_args__ = (
+        UniqueConstraint('run_date', 'symbol', name='uq_screener_shortlist_run_date_symbol'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    run_date = Column(Date, index=True, nullable=False)
+    symbol = Column(String(32), nullable=False)
+    rank = Column(Integer, nullable=False)
+    score = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    sma_30_week = Column(Float, nullable=False)
+    macd_histogram = Column(Float, nullable=False)
+    volume_ratio = Column(Float, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ScreenerResult(run_date={self.run_date}, rank={self.rank}, symbol={self.symbol})>"
+
+class RelativeStrengthResult(Base):
+    __tablename__ = "relative_strength"
+    __table_args__ = (
+        UniqueConstraint('run_date', 'symbol', name='uq_relative_strength_run_date_symbol'),
+        Index('ix_relative_strength_run_date_rank', 'run_date', 'rank'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    run_date = Column(Date, nullable=False)
+    symbol = Column(String(32), nullable=False)
+    rank = Column(Integer, nullable=False)
+    rating = Column(Integer, nullable=False)  # 1-99
+    score = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    ratios = Column(JSONB, nullable=False)  # Window in sessions -> RS ratio vs the benchmark
+    ranks = Column(JSONB, nullable=False)  # Window in sessions -> percentile rank
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<RelativeStrengthResult(run_date={self.run_date}, rank={self.rank}, symbol={self.symbol})>"
+
+class SectorPerformanceResult(Base):
+    __tablename__ = "sector_performance"
+    __table_args__ = (
+        UniqueConstraint('run_date', 'sector', name='uq_sector_performance_run_date_sector'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    run_date = Column(Date, index=True, nullable=False)
+    sector = Column(String(64), nullable=False)
+    rank = Column(Integer, nullable=False)
+    symbols = Column(Integer, nullable=False)
+    returns = Column(JSONB, nullable=False)  # Window in sessions -> equal-weighted mean return
+    advancers = Column(Integer, nullable=False)
+    decliners = Column(Integer, nullable=False)
+    advance_ratio = Column(Float)
+    pct_above_sma_50 = Column(Float)
+    momentum = Column(Float)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<SectorPerformanceResult(run_date={self.run_date}, rank={self.rank}, sector={self.sector})>"
+
+class MarketBreadthResult(Base):
+    __tablename__ = "market_breadth"
+    
+    id = Column(Integer, primary_key=True)
+    run_date = Column(Date, nullable=False, unique=True)
+    symbols = Column(Integer, nullable=False)
+    advancers = Column(Integer, nullable=False)
+    decliners = Column(Integer, nullable=False)
+    unchanged = Column(Integer, nullable=False)
+    advance_decline_ratio = Column(Float)
+    pct_above_sma_50 = Column(Float)
+    new_highs = Column(Integer, nullable=False)
+    new_lows = Column(Integer, nullable=False)
+    benchmark_returns = Column(JSONB, nullable=False)  # Window in sessions -> RS_BENCHMARK_SYMBOL return
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<MarketBreadthResult(run_date={self.run_date}, symbols={self.symbols})>"
+
+class CorporateAction(Base):
+    __tablename__ = "corporate_actions"
+    __table_args__ = (
+        UniqueConstraint('symbol', 'ex_date', 'action_type', name='uq_corporate_actions_symbol_ex_date_type'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    symbol = Column(String(32), index=True, nullable=False)
+    ex_date = Column(Date, nullable=False)
+    action_type = Column(String(16), nullable=False)  # split, bonus or adjustment
+    ratio = Column(String(16))  # As announced, e.g. "1:5"; None for explicit adjustments
+    factor = Column(Float, nullable=False)  # Price multiplier for bars before ex_date
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<CorporateAction(symbol={self.symbol}, ex_date={self.ex_date}, action_type={self.action_type})>"
+
+class TradingSignalRecord(Base):
+    __tablename__ = "trading_signals"
+    __table_args__ = (
+        Index('ix_trading_signals_symbol_created_at', 'symbol', 'created_at'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    symbol = Column(String(32), nullable=False)
+    decision = Column(String(8), nullable=False)
+    entry_price = Column(Float)
+    stop_loss = Column(Float)
+    allocation_percentage = Column(Float)
+    reasoning = Column(JSONB, nullable=False, default=list)
+    current_price = Column(Float)  # Price the decision was made at
+    as_of = Column(DateTime(timezone=True))  # Last bar in the analysis
+    model_name = Column(String(64))
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<TradingSignalRecord(symbol={self.symbol}, decision={self.decision}, created_at={self.created_at})>"
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class Job(Base):
+    __tablename__ = "jobs"
+    
+    id = Column(Integer, primary_key=True)
+    job_type = Column(String(32), nullable=False)
+    status = Column(String(16), index=True, nullable=False, default=JobStatus.QUEUED)
+    payload = Column(JSONB, nullable=False, default=dict)
+    completed_symbols = Column(JSONB, nullable=False, default=list)  # Per-symbol checkpoints
+    total_symbols = Column(Integer)
+    records_inserted = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    error = Column(Text)
+    locked_by = Column(String(64))
+    locked_at = Column(DateTime(timezone=True))
+    run_after = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=datetime.utcnow)
+    finished_at = Column(DateTime(timezone=True))
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, type={self.job_type}, status={self.status})>"
@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+# Sessions per window: about 1, 3, 6 and 12 months
+RS_WINDOWS = (21, 63, 126, 252)
+# The most recent quarter counts double, as in IBD-style RS ratings
+RS_WEIGHTS = {21: 0.2, 63: 0.4, 126: 0.2, 252: 0.2}
+
+@dataclass
+class RelativeStrength:
+    symbol: str
+    rating: int  # 1-99 percentile of the weighted score across the universe
+    score: float
+    close: float
+    ratios: Dict[int, Optional[float]]  # Window -> (1 + stock return) / (1 + benchmark return)
+    ranks: Dict[int, Optional[float]]  # Window -> percentile rank of the ratio, 0-100
+
+def compute_rs_ratios(
+    panel: pd.DataFrame,
+    benchmark: pd.Series,
+    windows: Sequence[int] = RS_WINDOWS
+) -> pd.DataFrame:
+    """
+    RS ratio of every symbol versus the benchmark over each window.
+    Args:
+        panel: Long-format frame with symbol, timestamp and close columns
+        benchmark: Benchmark closes indexed by timestamp
+    Returns:
+        DataFrame indexed by symbol with close and one rs_<window> column per
+        window; NaN where a symbol has less history than the window
+    """
+    columns = ['close'] + [f'rs_{w}' for w in windows]
+    if panel.empty or benchmark.empty:
+        return pd.DataFrame(columns=columns)
+
+    # Dates x symbols matrix aligned to the benchmark's sessions
+    close = panel.pivot_table(index='timestamp', columns='symbol', values='close', aggfunc='last')
+    close = close.reindex(benchmark.index).ffill(limit=5)
+    prices = close.to_numpy(dtype=float)
+    bench = benchmark.to_numpy(dtype=float)
+
+    latest = prices[-1]
+    result = {'close': latest}
+    for window in windows:
+        if len(bench) <= window:
+            result[f'rs_{window}'] = np.full(prices.shape[1], np.nan)
+            continue
+        # Whole-universe performance over the window in one vector division
+        stock_growth = latest / prices[-1 - window]
+        bench_growth = bench[-1] / bench[-1 - window]
+        result[f'rs_{window}'] = stock_growth / bench_growth
+    return pd.DataFrame(result, index=close.columns, columns=columns)
+
+def rank_relative_strength(
+    ratios: pd.DataFrame,
+    windows: Sequence[int] = RS_WINDOWS,
+    weights: Dict[int, float] = RS_WEIGHTS
+) -> pd.DataFrame:
+    """
+    Percentile-rank the ratios across all symbols. The score is the weighted
+    mean of window ranks over the windows a symbol has history for; the
+    rating is the score's percentile, clipped to 1-99.
+    """
+    ranked = ratios.copy()
+    rank_columns = []
+    for window in windows:
+        column = f'rank_{window}'
+        ranked[column] = ratios[f'rs_{window}'].rank(pct=True) * 100
+        rank_columns.append(column)
+
+    ranks = ranked[rank_columns].to_numpy(dtype=float)
+    weight = np.array([weights.get(w, 0.0) for w in windows])
+    available = ~np.isnan(ranks)
+    weight_sum = (available * weight).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ranked['score'] = np.where(
+            weight_sum > 0, np.nansum(ranks * weight, axis=1) / weight_sum, np.nan
+        )
+    ranked = ranked.dropna(subset=['score'])
+    ranked['rating'] = (ranked['score'].rank(pct=True) * 100).clip(1, 99).round().astype(int)
+    return ranked.sort_values(['score', 'close'], ascending=False)
+
+def to_relative_strength(ranked: pd.DataFrame, windows: Sequence[int] = RS_WINDOWS) -> List[RelativeStrength]:
+    def clean(value) -> Optional[float]:
+        return None if pd.isna(value) else float(value)
+
+    return [
+        RelativeStrength(
+            symbol=str(symbol),
+            rating=int(row['rating']),
+            score=float(row['score']),
+            close=float(row['close']),
+            ratios={w: clean(row[f'rs_{w}']) for w in windows},
+            ranks={w: clean(row[f'rank_{w}']) for w in windows}
+        )
+        for symbol, row in ranked.iterrows()
+    ]
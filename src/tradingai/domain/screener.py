@@ -0,0 +1,122 @@
+import heapq
+from dataclasses import dataclass
+from typing import Iterable, List, Tuple
+import numpy as np
+import pandas as pd
+
+SMA_30_WEEK_PERIOD = 150  # ~30 weeks of trading days, same as DefaultStockAnalyzer
+VOLUME_SHORT_PERIOD = 5
+VOLUME_LONG_PERIOD = 50
+
+@dataclass
+class ScreenCriteria:
+    min_volume_ratio: float = 1.2  # 5-day vs 50-day average volume
+    require_rising_macd: bool = True
+
+@dataclass
+class ScreenCandidate:
+    symbol: str
+    score: float
+    close: float
+    sma_30_week: float
+    macd_histogram: float
+    volume_ratio: float
+
+def compute_screen_indicators(panel: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute the latest screening indicators for every symbol in a panel.
+    Args:
+        panel: Long-format frame with symbol, timestamp, close and volume columns
+    Returns:
+        DataFrame indexed by symbol with close, sma_30_week, macd_histogram,
+        macd_histogram_prev and volume_ratio columns
+    """
+    if panel.empty:
+        return pd.DataFrame(
+            columns=['close', 'sma_30_week', 'macd_histogram', 'macd_histogram_prev', 'volume_ratio']
+        )
+
+    # Wide frames (dates x symbols) let pandas run each indicator over all symbols at once
+    close = panel.pivot_table(index='timestamp', columns='symbol', values='close', aggfunc='last')
+    volume = panel.pivot_table(index='timestamp', columns='symbol', values='volume', aggfunc='last')
+
+    sma_30_week = close.rolling(window=SMA_30_WEEK_PERIOD, min_periods=SMA_30_WEEK_PERIOD).mean()
+
+    exp1 = close.ewm(span=12, adjust=False, ignore_na=True).mean()
+    exp2 = close.ewm(span=26, adjust=False, ignore_na=True).mean()
+    macd = exp1 - exp2
+    histogram = macd - macd.ewm(span=9, adjust=False, ignore_na=True).mean()
+
+    volume_ratio = (
+        volume.rolling(window=VOLUME_SHORT_PERIOD, min_periods=1).mean()
+        / volume.rolling(window=VOLUME_LONG_PERIOD, min_periods=VOLUME_SHORT_PERIOD).mean()
+    )
+
+    # Forward fill so symbols missing the final session still report their last values
+    histogram = histogram.ffill()
+    histogram_prev = histogram.iloc[-2] if len(histogram) > 1 else histogram.iloc[-1] * np.nan
+
+    return pd.DataFrame({
+        'close': close.ffill().iloc[-1],
+        'sma_30_week': sma_30_week.ffill().iloc[-1],
+        'macd_histogram': histogram.iloc[-1],
+        'macd_histogram_prev': histogram_prev,
+        'volume_ratio': volume_ratio.ffill().iloc[-1]
+    })
+
+def filter_stage2(indicators: pd.DataFrame, criteria: ScreenCriteria) -> pd.DataFrame:
+    """Keep Stage-2 uptrend candidates: above 30-week SMA, rising MACD, volume expansion"""
+    mask = (
+        (indicators['close'] > indicators['sma_30_week'])
+        & (indicators['macd_histogram'] > 0)
+        & (indicators['volume_ratio'] >= criteria.min_volume_ratio)
+    )
+    if criteria.require_rising_macd:
+        mask &= indicators['macd_histogram'] > indicators['macd_histogram_prev']
+    return indicators[mask.fillna(False)]
+
+def score_candidates(candidates: pd.DataFrame) -> pd.Series:
+    """
+    Absolute (not cross-sectional) score so chunks can be ranked independently.
+    Combines distance above the 30-week SMA, MACD strength and volume expansion.
+    """
+    pct_above_sma = (candidates['close'] / candidates['sma_30_week'] - 1) * 100
+    macd_strength = candidates['macd_histogram'] / candidates['close'] * 100
+    volume_boost = np.log(candidates['volume_ratio'].clip(lower=1e-9))
+    return pct_above_sma + 10 * macd_strength + 5 * volume_boost
+
+def to_candidates(candidates: pd.DataFrame) -> List[ScreenCandidate]:
+    scores = score_candidates(candidates)
+    return [
+        ScreenCandidate(
+            symbol=str(symbol),
+            score=float(scores[symbol]),
+            close=float(row.close),
+            sma_30_week=float(row.sma_30_week),
+            macd_histogram=float(row.macd_histogram),
+            volume_ratio=float(row.volume_ratio)
+        )
+        for symbol, row in candidates.iterrows()
+    ]
+
+class Shortlist:
+    """Best `size` candidates seen so far, kept in a min-heap on score"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._heap: List[Tuple[float, str, ScreenCandidate]] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def add(self, candidates: Iterable[ScreenCandidate]) -> None:
+        for candidate in candidates:
+            entry = (candidate.score, candidate.symbol, candidate)
+            if len(self._heap) < self.size:
+                heapq.heappush(self._heap, entry)
+            else:
+                heapq.heappushpop(self._heap, entry)
+
+    def ranked(self) -> List[ScreenCandidate]:
+        """Highest score first"""
+        return [candidate for _, _, candidate in sorted(self._heap, reverse=True)]
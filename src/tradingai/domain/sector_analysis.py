@@ -0,0 +1,202 @@
+"""
+Sector returns, breadth and momentum aggregated from the universe close panel.
+
+Per-symbol metrics are computed on the dates x symbols close matrix in a
+handful of vector operations; sector figures are one groupby over those
+metrics, so the cost does not grow with the number of sectors.
+"""
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from typing import Dict, List, Mapping, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+# Sessions per window: a day, a week, a month and a quarter
+SECTOR_RETURN_WINDOWS = (1, 5, 21, 63)
+# Windows whose cross-sector percentile ranks make up the momentum score
+SECTOR_MOMENTUM_WINDOWS = (5, 21, 63)
+BREADTH_SMA_PERIOD = 50
+HIGH_LOW_WINDOW = 252  # 52-week highs and lows
+
+def _clean(value) -> Optional[float]:
+    return None if pd.isna(value) else float(value)
+
+@dataclass
+class SectorPerformance:
+    sector: str
+    rank: int  # 1 is the strongest momentum
+    symbols: int
+    returns: Dict[int, Optional[float]]  # Window in sessions -> equal-weighted mean return
+    advancers: int
+    decliners: int
+    advance_ratio: Optional[float]  # Advancers / (advancers + decliners)
+    pct_above_sma_50: Optional[float]  # Fraction of members closing above their 50-day SMA
+    momentum: Optional[float]  # 0-100, mean percentile rank of the 1-week, 1-month and 3-month returns
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+@dataclass
+class MarketBreadth:
+    symbols: int
+    advancers: int
+    decliners: int
+    unchanged: int
+    advance_decline_ratio: Optional[float]
+    pct_above_sma_50: Optional[float]
+    new_highs: int  # At a 52-week closing high
+    new_lows: int
+    benchmark_returns: Dict[int, Optional[float]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+@dataclass
+class SectorSnapshot:
+    """One day's sector table and market breadth, with each symbol's sector"""
+    run_date: date
+    breadth: MarketBreadth
+    sectors: List[SectorPerformance]
+    symbol_sectors: Dict[str, str]
+
+    def sector_context(self, symbol: str) -> Optional[Dict]:
+        """Compact summary of a symbol's sector for analyses and LLM prompts"""
+        name = self.symbol_sectors.get(symbol)
+        sector = next((s for s in self.sectors if s.sector == name), None)
+        if sector is None:
+            return None
+        return {
+            "name": sector.sector,
+            "rank": sector.rank,
+            "sectors": len(self.sectors),
+            "return_1w": sector.returns.get(5),
+            "return_1m": sector.returns.get(21),
+            "advance_ratio": sector.advance_ratio,
+            "pct_above_sma_50": sector.pct_above_sma_50,
+            "momentum": sector.momentum,
+            "as_of": self.run_date.isoformat()
+        }
+
+def compute_symbol_metrics(
+    panel: pd.DataFrame,
+    sessions: Optional[pd.Index] = None,
+    windows: Sequence[int] = SECTOR_RETURN_WINDOWS
+) -> pd.DataFrame:
+    """
+    Per-symbol inputs to sector and breadth aggregation.
+    Args:
+        panel: Long-format frame with symbol, timestamp and close columns
+        sessions: Session timestamps to align to, normally the benchmark's, so
+            every chunk of the universe is measured over the same sessions;
+            defaults to the panel's own timestamps
+    Returns:
+        DataFrame indexed by symbol with close, one return_<window> column per
+        window, and above_sma_50/new_high/new_low as 1.0/0.0 (NaN where a
+        symbol has too little history). Symbols without a close within five
+        sessions of the latest are left out; return_1 is NaN for those that
+        did not trade on the latest session.
+    """
+    columns = ['close'] + [f'return_{w}' for w in windows] + ['above_sma_50', 'new_high', 'new_low']
+    if panel.empty:
+        return pd.DataFrame(columns=columns)
+
+    close = panel.pivot_table(index='timestamp', columns='symbol', values='close', aggfunc='last')
+    close = close.reindex(sessions) if sessions is not None else close.sort_index()
+    traded = close.iloc[-1].notna()
+    close = close.ffill(limit=5)
+    kept = close.iloc[-1].notna()
+    close = close.loc[:, kept]
+    traded = traded[kept].to_numpy()
+    prices = close.to_numpy(dtype=float)
+    latest = prices[-1]
+
+    result = {'close': latest}
+    for window in windows:
+        if len(prices) <= window:
+            result[f'return_{window}'] = np.full(prices.shape[1], np.nan)
+        else:
+            result[f'return_{window}'] = latest / prices[-1 - window] - 1
+    # A carried-forward close is not an unchanged day; keep it out of advance/decline
+    if 1 in windows:
+        result['return_1'] = np.where(traded, result['return_1'], np.nan)
+
+    # The mean of the tail is NaN for any symbol with a gap in it
+    sma = prices[-BREADTH_SMA_PERIOD:].mean(axis=0) if len(prices) >= BREADTH_SMA_PERIOD else np.full_like(latest, np.nan)
+    result['above_sma_50'] = np.where(np.isnan(sma), np.nan, latest > sma)
+
+    tail = close.iloc[-HIGH_LOW_WINDOW:]
+    enough = (tail.count() >= HIGH_LOW_WINDOW).to_numpy()
+    result['new_high'] = np.where(enough, latest >= tail.max().to_numpy(), np.nan)
+    result['new_low'] = np.where(enough, latest <= tail.min().to_numpy(), np.nan)
+    return pd.DataFrame(result, index=close.columns, columns=columns)
+
+def aggregate_sectors(
+    metrics: pd.DataFrame,
+    sectors: Mapping[str, str],
+    windows: Sequence[int] = SECTOR_RETURN_WINDOWS,
+    momentum_windows: Sequence[int] = SECTOR_MOMENTUM_WINDOWS
+) -> pd.DataFrame:
+    """
+    Group symbol metrics by sector. Symbols without a sector are ignored.
+    Returns:
+        DataFrame indexed by sector, strongest momentum first
+    """
+    frame = metrics.assign(sector=metrics.index.map(sectors)).dropna(subset=['sector'])
+    frame = frame.assign(advancing=frame['return_1'] > 0, declining=frame['return_1'] < 0)
+    aggregated = frame.groupby('sector').agg(
+        symbols=('close', 'size'),
+        advancers=('advancing', 'sum'),
+        decliners=('declining', 'sum'),
+        pct_above_sma_50=('above_sma_50', 'mean'),
+        **{f'return_{w}': (f'return_{w}', 'mean') for w in windows}
+    )
+    moved = aggregated['advancers'] + aggregated['decliners']
+    aggregated['advance_ratio'] = (aggregated['advancers'] / moved).where(moved > 0)
+    # Ranked against the other sectors, so it reads the same in any market
+    momentum_ranks = aggregated[[f'return_{w}' for w in momentum_windows]].rank(pct=True) * 100
+    aggregated['momentum'] = momentum_ranks.mean(axis=1)
+    return aggregated.sort_values(['momentum', 'symbols'], ascending=False)
+
+def to_sector_performance(aggregated: pd.DataFrame, windows: Sequence[int] = SECTOR_RETURN_WINDOWS) -> List[SectorPerformance]:
+    return [
+        SectorPerformance(
+            sector=str(sector),
+            rank=rank,
+            symbols=int(row['symbols']),
+            returns={w: _clean(row[f'return_{w}']) for w in windows},
+            advancers=int(row['advancers']),
+            decliners=int(row['decliners']),
+            advance_ratio=_clean(row['advance_ratio']),
+            pct_above_sma_50=_clean(row['pct_above_sma_50']),
+            momentum=_clean(row['momentum'])
+        )
+        for rank, (sector, row) in enumerate(aggregated.iterrows(), start=1)
+    ]
+
+def compute_market_breadth(
+    metrics: pd.DataFrame,
+    benchmark_returns: Optional[Dict[int, Optional[float]]] = None
+) -> MarketBreadth:
+    """Advance/decline, SMA and 52-week high/low breadth over every symbol"""
+    daily = metrics['return_1'].dropna()
+    advancers = int((daily > 0).sum())
+    decliners = int((daily < 0).sum())
+    return MarketBreadth(
+        symbols=len(metrics),
+        advancers=advancers,
+        decliners=decliners,
+        unchanged=int((daily == 0).sum()),
+        advance_decline_ratio=advancers / decliners if decliners else None,
+        pct_above_sma_50=_clean(metrics['above_sma_50'].mean()),
+        new_highs=int((metrics['new_high'] == 1).sum()),
+        new_lows=int((metrics['new_low'] == 1).sum()),
+        benchmark_returns=benchmark_returns or {}
+    )
+
+def benchmark_returns(close: pd.Series, windows: Sequence[int] = SECTOR_RETURN_WINDOWS) -> Dict[int, Optional[float]]:
+    """Benchmark index return over each window, None where history is short"""
+    prices = close.dropna().to_numpy(dtype=float)
+    return {
+        w: float(prices[-1] / prices[-1 - w] - 1) if len(prices) > w else None
+        for w in windows
+    }
@@ -0,0 +1,255 @@
+"""
+Incremental version of the DefaultStockAnalyzer rule set.
+
+Each symbol keeps O(1) indicator state (running sums over ring buffers and
+EMA recurrences), so evaluating a bar costs a few dozen float operations
+instead of recomputing pandas indicators over a year of history. Completed
+daily bars are committed; the live daily bar is evaluated provisionally on
+every minute close without changing the committed state.
+"""
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date, datetime
+import math
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from .bar_builder import Bar
+from .trading_calendar import to_ist_date
+
+# Same parameters as DefaultStockAnalyzer
+SMA_30_WEEK_PERIOD = 150
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+BOLLINGER_PERIOD = 20
+VOLUME_EMA_SPAN = 30
+RESUM_EVERY = 1000  # Rebuild running sums periodically to bound float drift
+
+RULE_SMA_CROSS = "sma_30_week_cross"
+RULE_MACD_FLIP = "macd_histogram_flip"
+RULE_BOLLINGER_CORRECTION = "bollinger_correction"
+RULE_VOLUME_SPIKE = "volume_spike"
+RULES = (RULE_SMA_CROSS, RULE_MACD_FLIP, RULE_BOLLINGER_CORRECTION, RULE_VOLUME_SPIKE)
+
+BULLISH = "bullish"
+BEARISH = "bearish"
+
+@dataclass
+class Alert:
+    symbol: str
+    rule: str
+    direction: str
+    timestamp: datetime  # Bar timestamp
+    price: float
+    provisional: bool  # True when raised from the live bar before the session closed
+    details: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        return {
+            "symbol": self.symbol,
+            "rule": self.rule,
+            "direction": self.direction,
+            "timestamp": self.timestamp.isoformat(),
+            "price": self.price,
+            "provisional": self.provisional,
+            "details": self.details
+        }
+
+@dataclass(frozen=True)
+class Indicators:
+    close: float
+    volume: float
+    sma_30_week: float  # NaN until 150 bars
+    macd_histogram: float
+    bollinger_middle: float  # NaN until 20 bars
+    volume_ema_30: float
+
+    @property
+    def is_above_30_week(self) -> Optional[bool]:
+        return None if math.isnan(self.sma_30_week) else self.close > self.sma_30_week
+
+    @property
+    def is_correction(self) -> Optional[bool]:
+        return None if math.isnan(self.bollinger_middle) else self.close < self.bollinger_middle
+
+def _ema_alpha(span: int) -> float:
+    return 2.0 / (span + 1.0)
+
+ALPHA_FAST = _ema_alpha(MACD_FAST)
+ALPHA_SLOW = _ema_alpha(MACD_SLOW)
+ALPHA_SIGNAL = _ema_alpha(MACD_SIGNAL)
+VOLUME_DECAY = 1.0 - _ema_alpha(VOLUME_EMA_SPAN)
+
+class _Window:
+    """Fixed-size window with a running sum"""
+    __slots__ = ("values", "size", "total", "updates")
+
+    def __init__(self, size: int):
+        self.values: Deque[float] = deque(maxlen=size)
+        self.size = size
+        self.total = 0.0
+        self.updates = 0
+
+    def mean_with(self, x: float) -> float:
+        """Window mean if x were appended, NaN until the window is full"""
+        if len(self.values) == self.size:
+            return (self.total - self.values[0] + x) / self.size
+        if len(self.values) == self.size - 1:
+            return (self.total + x) / self.size
+        return math.nan
+
+    def push(self, x: float) -> None:
+        if len(self.values) == self.size:
+            self.total -= self.values[0]
+        self.total += x
+        self.values.append(x)
+        self.updates += 1
+        if self.updates % RESUM_EVERY == 0:
+            self.total = math.fsum(self.values)
+
+class SymbolIndicators:
+    """Committed indicator state for one symbol"""
+    __slots__ = (
+        "sma", "bollinger", "ema_fast", "ema_slow", "ema_signal",
+        "volume_num", "volume_den", "last", "last_day"
+    )
+
+    def __init__(self):
+        self.sma = _Window(SMA_30_WEEK_PERIOD)
+        self.bollinger = _Window(BOLLINGER_PERIOD)
+        self.ema_fast: Optional[float] = None
+        self.ema_slow: Optional[float] = None
+        self.ema_signal: Optional[float] = None
+        # Volume uses ewm(span=30) with adjust=True, like the analyzer
+        self.volume_num = 0.0
+        self.volume_den = 0.0
+        self.last: Optional[Indicators] = None
+        self.last_day: Optional[date] = None
+
+    def _compute(self, close: float, volume: float) -> Tuple[Indicators, Tuple[float, float, float, float, float]]:
+        if self.ema_fast is None:
+            fast = slow = close
+            macd = 0.0
+            signal = 0.0
+        else:
+            fast = self.ema_fast + ALPHA_FAST * (close - self.ema_fast)
+            slow = self.ema_slow + ALPHA_SLOW * (close - self.ema_slow)
+            macd = fast - slow
+            signal = self.ema_signal + ALPHA_SIGNAL * (macd - self.ema_signal)
+        volume_num = volume + VOLUME_DECAY * self.volume_num
+        volume_den = 1.0 + VOLUME_DECAY * self.volume_den
+
+        indicators = Indicators(
+            close=close,
+            volume=volume,
+            sma_30_week=self.sma.mean_with(close),
+            macd_histogram=macd - signal,
+            bollinger_middle=self.bollinger.mean_with(close),
+            volume_ema_30=volume_num / volume_den
+        )
+        return indicators, (fast, slow, signal, volume_num, volume_den)
+
+    def peek(self, close: float, volume: float) -> Indicators:
+        """Indicators if a bar closed at these values, without committing it"""
+        return self._compute(close, volume)[0]
+
+    def commit(self, close: float, volume: float, day: Optional[date] = None) -> Indicators:
+        indicators, (fast, slow, signal, volume_num, volume_den) = self._compute(close, volume)
+        self.ema_fast, self.ema_slow, self.ema_signal = fast, slow, signal
+        self.volume_num, self.volume_den = volume_num, volume_den
+        self.sma.push(close)
+        self.bollinger.push(close)
+        self.last = indicators
+        self.last_day = day
+        return indicators
+
+class SignalEvaluator:
+    """
+    Evaluates the analyzer rules per symbol as bars close. Each rule fires on
+    a state change (e.g. close crossing the 30-week SMA) at most once per
+    symbol, rule and session, whether raised provisionally or on close.
+    """
+
+    def __init__(self, volume_spike_ratio: float = 1.5):
+        """
+        Args:
+            volume_spike_ratio: Volume / 30-day volume EMA that counts as a spike;
+                1.0 matches the analyzer's is_volume_high
+        """
+        self.volume_spike_ratio = volume_spike_ratio
+        self._symbols: Dict[str, SymbolIndicators] = {}
+        self._fired: Dict[str, Tuple[date, Set[str]]] = {}
+
+    def _state(self, symbol: str) -> SymbolIndicators:
+        state = self._symbols.get(symbol)
+        if state is None:
+            state = self._symbols[symbol] = SymbolIndicators()
+        return state
+
+    def seed(self, symbol: str, bars: Iterable[Tuple[datetime, float, float]]) -> None:
+        """Warm up from stored daily history: (timestamp, close, volume), oldest first"""
+        state = self._state(symbol)
+        for timestamp, close, volume in bars:
+            state.commit(float(close), float(volume), to_ist_date(timestamp))
+
+    def indicators(self, symbol: str) -> Optional[Indicators]:
+        state = self._symbols.get(symbol)
+        return state.last if state is not None else None
+
+    def _rules(self, bar: Bar, prev: Optional[Indicators], now: Indicators, provisional: bool) -> List[Alert]:
+        alerts = []
+
+        def alert(rule: str, direction: str, **details) -> None:
+            alerts.append(Alert(bar.symbol, rule, direction, bar.timestamp, now.close, provisional, details))
+
+        if prev is not None:
+            above, was_above = now.is_above_30_week, prev.is_above_30_week
+            if above is not None and was_above is not None and above != was_above:
+                alert(RULE_SMA_CROSS, BULLISH if above else BEARISH, sma_30_week=now.sma_30_week)
+
+            if now.macd_histogram > 0 >= prev.macd_histogram:
+                alert(RULE_MACD_FLIP, BULLISH, macd_histogram=now.macd_histogram)
+            elif now.macd_histogram < 0 <= prev.macd_histogram:
+                alert(RULE_MACD_FLIP, BEARISH, macd_histogram=now.macd_histogram)
+
+            if now.is_correction and prev.is_correction is False:
+                alert(RULE_BOLLINGER_CORRECTION, BEARISH, bollinger_middle=now.bollinger_middle)
+
+        if now.volume_ema_30 and now.volume >= self.volume_spike_ratio * now.volume_ema_30:
+            alert(
+                RULE_VOLUME_SPIKE, BULLISH if bar.close >= bar.open else BEARISH,
+                volume=now.volume, volume_ema_30=now.volume_ema_30
+            )
+        return alerts
+
+    def _dedupe(self, symbol: str, day: date, alerts: List[Alert]) -> List[Alert]:
+        fired_day, fired = self._fired.get(symbol, (None, None))
+        if fired_day != day:
+            fired = set()
+            self._fired[symbol] = (day, fired)
+        fresh = [a for a in alerts if a.rule not in fired]
+        fired.update(a.rule for a in fresh)
+        return fresh
+
+    def on_live_bar(self, bar: Bar) -> List[Alert]:
+        """Provisional evaluation of the session's live daily bar"""
+        state = self._state(bar.symbol)
+        day = bar.timestamp.date()
+        if state.last_day == day:
+            return []  # Session already committed
+        now = state.peek(bar.close, bar.volume)
+        return self._dedupe(bar.symbol, day, self._rules(bar, state.last, now, provisional=True))
+
+    def on_day_close(self, bar: Bar) -> List[Alert]:
+        """Commit a completed daily bar and evaluate it"""
+        state = self._state(bar.symbol)
+        day = bar.timestamp.date()
+        if state.last_day is not None and day <= state.last_day:
+            return []  # Already in the seeded history
+        prev = state.last
+        now = state.commit(bar.close, bar.volume, day)
+        return self._dedupe(bar.symbol, day, self._rules(bar, prev, now, provisional=False))
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
@@ -6,6 +6,9 @@ import pandas as pd
 import numpy as np
 from typing import Protocol
 
+from .candle_patterns import CandlePatterns, detect_candle_patterns
+from ..metrics import STOCK_ANALYSIS_SECONDS, timed
+
 @dataclass
 class DailyData:
     date: datetime
@@ -38,6 +41,7 @@ class StockAnalysis:
     volume_increase_pct: float
     is_volume_high: bool
     last_10_days: List[DailyData]
+    candle_patterns: Optional[CandlePatterns] = None
 
 class StockAnalyzer(Protocol):
     """Interface for stock analysis implementations"""
@@ -67,6 +71,7 @@ class DefaultStockAnalyzer:
         
         return macd.iloc[-1], signal_line.iloc[-1], histogram.iloc[-1]
     
+    @timed(STOCK_ANALYSIS_SECONDS)
     def analyze(self, symbol: str) -> StockAnalysis:
         """
         Analyze stock data and return technical analysis results
@@ -115,12 +120,18 @@ class DefaultStockAnalyzer:
             upper_band = middle_band + (std * std_dev)
             lower_band = middle_band - (std * std_dev)
             
-            # Monthly upper band (for resistance)
-            monthly_upper = self.df['high'].resample('M').max().iloc[-1]
+            # Monthly upper band (for resistance): highest high of the latest calendar month.
+            # Same as resample('M').max().iloc[-1], which newer pandas no longer accepts
+            index = self.df.index
+            latest = index[-1]
+            monthly_upper = self.df['high'][(index.year == latest.year) & (index.month == latest.month)].max()
             
             # Check if in correction (price below middle band)
             is_correction = bool(current_price < middle_band.iloc[-1])
             
+            # Classify recent candles as IC/MC and derive group entry/stop levels
+            candle_patterns = detect_candle_patterns(self.df)
+            
             bollinger = BollingerBands(
                 upper=upper_band.iloc[-1],
                 middle=middle_band.iloc[-1],
@@ -142,7 +153,8 @@ class DefaultStockAnalyzer:
                 volume_increase_pct=volume_increase_pct,
                 is_volume_high=is_volume_high,
                 bollinger=bollinger,
-                last_10_days=last_10_days
+                last_10_days=last_10_days,
+                candle_patterns=candle_patterns
             )
 
         except Exception as e:
@@ -0,0 +1,120 @@
+import hashlib
+from bisect import bisect_right
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .instrument_search import InstrumentSearchIndex, SearchMatch
+
+INDICES_SEGMENT = "INDICES"
+
+@dataclass(frozen=True)
+class InstrumentEntry:
+    tradingsymbol: str
+    instrument_token: int
+    name: str = ""
+    exchange: str = ""
+    instrument_type: str = ""
+    segment: str = ""
+
+    @property
+    def is_index(self) -> bool:
+        """Kite lists index values with exchange NSE and type EQ; only the segment tells them apart"""
+        return self.segment == INDICES_SEGMENT
+
+class SymbolIndex:
+    """
+    Immutable in-memory snapshot of the instruments table.
+    A new index is built on every refresh and swapped in whole, so readers
+    never see a partially updated index.
+    """
+
+    def __init__(self, entries: Iterable[InstrumentEntry]):
+        unique = {}
+        for entry in entries:
+            unique.setdefault(entry.tradingsymbol, entry)
+        self._entries: Tuple[InstrumentEntry, ...] = tuple(sorted(unique.values(), key=lambda e: e.tradingsymbol))
+        self._symbols = tuple(e.tradingsymbol for e in self._entries)
+        self._by_symbol = MappingProxyType({e.tradingsymbol: e for e in self._entries})
+        folded = {}
+        for entry in self._entries:
+            folded.setdefault(entry.tradingsymbol.casefold(), entry)
+        self._by_folded = MappingProxyType(folded)
+        self.version = self._compute_version()
+        self._search = InstrumentSearchIndex(self._entries)
+
+    def _compute_version(self) -> str:
+        """Content hash, identical across processes holding the same instruments"""
+        digest = hashlib.blake2b(digest_size=8)
+        for e in self._entries:
+            digest.update(f"{e.tradingsymbol}|{e.instrument_token}|{e.name}|{e.exchange}|{e.instrument_type}|{e.segment}\n".encode())
+        return digest.hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, symbol: str) -> bool:
+        return self.lookup(symbol) is not None
+
+    @property
+    def entries(self) -> Tuple[InstrumentEntry, ...]:
+        """All entries sorted by trading symbol"""
+        return self._entries
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def iter_entries(
+        self,
+        after: Optional[str] = None,
+        exchange: Optional[str] = None,
+        instrument_type: Optional[str] = None
+    ) -> Iterator[InstrumentEntry]:
+        """Entries sorted by symbol, starting after a keyset cursor, optionally filtered"""
+        start = bisect_right(self._symbols, after) if after else 0
+        for position in range(start, len(self._entries)):
+            entry = self._entries[position]
+            if exchange and entry.exchange != exchange:
+                continue
+            if instrument_type and entry.instrument_type != instrument_type:
+                continue
+            yield entry
+
+    def page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        exchange: Optional[str] = None,
+        instrument_type: Optional[str] = None
+    ) -> Tuple[List[InstrumentEntry], Optional[str]]:
+        """
+        One page of entries and the cursor for the next page
+        Returns:
+            Tuple of (entries, next_cursor); next_cursor is None on the last page
+        """
+        entries = []
+        for entry in self.iter_entries(after, exchange, instrument_type):
+            if len(entries) == limit:
+                return entries, entries[-1].tradingsymbol
+            entries.append(entry)
+        return entries, None
+
+    def lookup(self, symbol: str) -> Optional[InstrumentEntry]:
+        """Exact match first, then case-insensitive"""
+        entry = self._by_symbol.get(symbol)
+        if entry is None:
+            entry = self._by_folded.get(symbol.casefold())
+        return entry
+
+    def get_token(self, symbol: str) -> Optional[int]:
+        entry = self.lookup(symbol)
+        return entry.instrument_token if entry else None
+
+    def invalid_symbols(self, symbols: Iterable[str]) -> List[str]:
+        """Symbols not present in the index (case-insensitive)"""
+        return [s for s in symbols if s.casefold() not in self._by_folded]
+
+    def search(self, query: str, limit: int = 10) -> List[SearchMatch]:
+        """Ranked prefix and fuzzy matches over symbols and names"""
+        return self._search.search(query, limit)
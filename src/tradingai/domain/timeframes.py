@@ -0,0 +1,194 @@
+"""
+Daily, weekly and monthly views of one daily OHLCV series.
+
+Weekly and monthly bars are aggregated from daily bars grouped by IST
+calendar period, labelled with the timestamp of the period's last session.
+`SeriesCache` keeps the daily frame and its derived frames per symbol so a
+request for several timeframes loads from the database and resamples once.
+"""
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+import math
+import time
+from typing import Dict, Iterable, Optional, Tuple
+import pandas as pd
+
+from ..config.settings import settings
+from ..metrics import SERIES_CACHE_REQUESTS
+from .bar_builder import Bar, append_live_bar
+from .trading_calendar import IST
+
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+TIMEFRAMES = (DAY, WEEK, MONTH)
+
+# pandas period aliases; NSE weeks end on Friday
+_PERIODS = {WEEK: "W-FRI", MONTH: "M"}
+
+# Bars spanning the 30-week trend SMA in each timeframe
+TREND_SMA_PERIODS = {DAY: 150, WEEK: 30, MONTH: 7}
+BOLLINGER_PERIOD = 20
+BOLLINGER_STD = 2
+VOLUME_EMA_SPAN = 30
+
+_OHLCV_AGG = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+def _periods(index: pd.DatetimeIndex, timeframe: str) -> pd.PeriodIndex:
+    """Calendar period of each timestamp, taken in IST"""
+    if index.tz is not None:
+        index = index.tz_convert(IST).tz_localize(None)
+    return index.to_period(_PERIODS[timeframe])
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Aggregate a timestamp-indexed daily OHLCV frame into weekly or monthly bars"""
+    if timeframe == DAY or df.empty:
+        return df
+    # Label each period with its last session rather than a synthetic period end
+    bars = df.assign(last_session=df.index).groupby(_periods(df.index, timeframe), sort=True).agg(
+        {**_OHLCV_AGG, "last_session": "last"}
+    )
+    return bars.set_index(pd.DatetimeIndex(bars.pop("last_session"), name=df.index.name))
+
+def derive_timeframes(daily: pd.DataFrame, timeframes: Iterable[str] = TIMEFRAMES) -> Dict[str, pd.DataFrame]:
+    return {timeframe: resample_ohlcv(daily, timeframe) for timeframe in timeframes}
+
+def apply_live_bar(frame: pd.DataFrame, bar: Optional[Bar], timeframe: str) -> pd.DataFrame:
+    """
+    Fold the live daily bar into a timeframe's frame: a new daily row, or an
+    update of the current week/month (or a new period if it just started).
+    The input frame is not modified.
+    """
+    if timeframe == DAY:
+        return append_live_bar(frame, bar)
+    if bar is None or frame.empty:
+        return frame
+    timestamp = pd.Timestamp(bar.timestamp)
+    if frame.index.tz is not None:
+        timestamp = timestamp.tz_convert(frame.index.tz)
+    last = frame.index[-1]
+    if timestamp <= last:
+        return frame
+    live_period = _periods(pd.DatetimeIndex([timestamp]), timeframe)[0]
+    if live_period == _periods(frame.index[-1:], timeframe)[0]:
+        row = frame.iloc[-1]
+        updated = [row["open"], max(row["high"], bar.high), min(row["low"], bar.low), bar.close, row["volume"] + bar.volume]
+        head = frame.iloc[:-1]
+    else:
+        updated = [bar.open, bar.high, bar.low, bar.close, bar.volume]
+        head = frame
+    live = pd.DataFrame([updated], columns=["open", "high", "low", "close", "volume"],
+                        index=pd.DatetimeIndex([timestamp], name=frame.index.name))
+    return pd.concat([head, live])
+
+def _last(series: pd.Series) -> Optional[float]:
+    value = float(series.iloc[-1]) if len(series) else math.nan
+    return None if math.isnan(value) else value
+
+@dataclass
+class TimeframeIndicators:
+    timeframe: str
+    bars: int
+    timestamp: str  # Last bar
+    close: float
+    sma_30_week: Optional[float]  # None until the timeframe has enough bars
+    is_above_30_week: Optional[bool]
+    macd: float
+    macd_signal: float
+    macd_histogram: float
+    is_bullish_macd: bool
+    bollinger_upper: Optional[float]
+    bollinger_middle: Optional[float]
+    bollinger_lower: Optional[float]
+    volume_ema_30: float
+    is_volume_high: bool
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+def compute_indicators(frame: pd.DataFrame, timeframe: str) -> TimeframeIndicators:
+    """DefaultStockAnalyzer's indicator set on one timeframe's bars"""
+    close = frame["close"]
+    current = float(close.iloc[-1])
+
+    sma = _last(close.rolling(window=TREND_SMA_PERIODS[timeframe]).mean())
+    macd_line = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    signal_line = macd_line.ewm(span=9, adjust=False).mean()
+    histogram = float(macd_line.iloc[-1] - signal_line.iloc[-1])
+    middle = close.rolling(window=BOLLINGER_PERIOD).mean()
+    std = close.rolling(window=BOLLINGER_PERIOD).std()
+    volume_ema = float(frame["volume"].ewm(span=VOLUME_EMA_SPAN).mean().iloc[-1])
+
+    middle_last = _last(middle)
+    std_last = _last(std)
+    return TimeframeIndicators(
+        timeframe=timeframe,
+        bars=len(frame),
+        timestamp=frame.index[-1].isoformat(),
+        close=current,
+        sma_30_week=sma,
+        is_above_30_week=None if sma is None else current > sma,
+        macd=float(macd_line.iloc[-1]),
+        macd_signal=float(signal_line.iloc[-1]),
+        macd_histogram=histogram,
+        is_bullish_macd=histogram > 0,
+        bollinger_upper=None if middle_last is None else middle_last + BOLLINGER_STD * std_last,
+        bollinger_middle=middle_last,
+        bollinger_lower=None if middle_last is None else middle_last - BOLLINGER_STD * std_last,
+        volume_ema_30=volume_ema,
+        is_volume_high=bool(frame["volume"].iloc[-1] > volume_ema)
+    )
+
+class SeriesCache:
+    """
+    LRU of per-symbol daily frames and the weekly/monthly frames derived from
+    them. Entries expire after ttl_seconds so newly stored sessions show up;
+    `invalidate` drops a symbol immediately when its stored history changes.
+    """
+
+    def __init__(self, max_symbols: int = 512, ttl_seconds: float = 300.0):
+        self.max_symbols = max_symbols
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, pd.DataFrame]]]" = OrderedDict()
+
+    def get(self, symbol: str) -> Optional[Dict[str, pd.DataFrame]]:
+        """Cached frames by timeframe, or None if missing or expired"""
+        entry = self._entries.get(symbol)
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            SERIES_CACHE_REQUESTS.inc(result="miss")
+            return None
+        self._entries.move_to_end(symbol)
+        SERIES_CACHE_REQUESTS.inc(result="hit")
+        return entry[1]
+
+    def put(self, symbol: str, daily: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """Store a freshly loaded daily frame; returns it with its derived frames"""
+        frames = derive_timeframes(daily)
+        self._entries[symbol] = (time.monotonic(), frames)
+        self._entries.move_to_end(symbol)
+        while len(self._entries) > self.max_symbols:
+            self._entries.popitem(last=False)
+        return frames
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Drop one symbol, or everything"""
+        if symbol is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(symbol, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+_series_cache: Optional[SeriesCache] = None
+
+def get_series_cache() -> SeriesCache:
+    """Process-wide series cache"""
+    global _series_cache
+    if _series_cache is None:
+        _series_cache = SeriesCache(settings.SERIES_CACHE_MAX_SYMBOLS, settings.SERIES_CACHE_TTL_SECONDS)
+    return _series_cache
+
+def set_series_cache(cache: Optional[SeriesCache]) -> None:
+    global _series_cache
+    _series_cache = cache
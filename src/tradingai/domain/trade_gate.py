@@ -0,0 +1,162 @@
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Dict, List, Optional
+
+from .llm_trade import TradeDecision, TradingSignal
+from .market_analysis import MarketCondition, MarketDirection
+from .stock_analysis import StockAnalysis
+from ..config.settings import settings
+
+# Rule names, also used as counter keys
+RULE_BEARISH_DOWNTREND = "bearish_downtrend"
+RULE_MISALIGNED_TREND = "misaligned_trend"
+RULE_NO_CANDLE_GROUP = "no_candle_group"
+RULE_WEAK_MARKET_SCORE = "weak_market_score"
+
+@dataclass
+class TradeGateConfig:
+    enabled: bool = True
+    hold_on_bearish_downtrend: bool = True
+    hold_on_misaligned_trend: bool = True
+    hold_without_candle_group: bool = True
+    min_market_score: Optional[int] = None  # None disables the score rule
+
+    @classmethod
+    def from_settings(cls) -> "TradeGateConfig":
+        return cls(
+            enabled=settings.LLM_GATE_ENABLED,
+            hold_on_bearish_downtrend=settings.LLM_GATE_HOLD_ON_BEARISH_DOWNTREND,
+            hold_on_misaligned_trend=settings.LLM_GATE_HOLD_ON_MISALIGNED_TREND,
+            hold_without_candle_group=settings.LLM_GATE_HOLD_WITHOUT_CANDLE_GROUP,
+            min_market_score=settings.LLM_GATE_MIN_MARKET_SCORE
+        )
+
+@dataclass
+class GateResult:
+    skip_llm: bool
+    rule: Optional[str] = None
+    reasons: List[str] = field(default_factory=list)
+
+    def hold_signal(self) -> TradingSignal:
+        """Build the HOLD signal returned instead of calling the LLM"""
+        return TradingSignal(
+            decision=TradeDecision.HOLD,
+            entry_price=None,
+            stop_loss=None,
+            allocation_percentage=0.0,
+            reasoning=self.reasons
+        )
+
+STORED_SIGNAL_RULE = "stored_signal"
+
+class TradeGateStats:
+    """Process-wide counters of gate outcomes"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.evaluated = 0
+        self.llm_calls = 0
+        self.skipped_by_rule: Dict[str, int] = {}
+
+    def record(self, result: GateResult) -> None:
+        with self._lock:
+            self.evaluated += 1
+            if result.skip_llm:
+                self.skipped_by_rule[result.rule] = self.skipped_by_rule.get(result.rule, 0) + 1
+            else:
+                self.llm_calls += 1
+
+    def record_reuse(self) -> None:
+        """An LLM call the gate allowed was answered from a stored signal instead"""
+        with self._lock:
+            self.llm_calls -= 1
+            self.skipped_by_rule[STORED_SIGNAL_RULE] = self.skipped_by_rule.get(STORED_SIGNAL_RULE, 0) + 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            skipped = sum(self.skipped_by_rule.values())
+            return {
+                "evaluated": self.evaluated,
+                "llm_calls": self.llm_calls,
+                "llm_calls_avoided": skipped,
+                "avoided_pct": (skipped / self.evaluated * 100) if self.evaluated else 0.0,
+                "avoided_by_rule": dict(self.skipped_by_rule)
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.evaluated = 0
+            self.llm_calls = 0
+            self.skipped_by_rule = {}
+
+_gate_stats = TradeGateStats()
+
+def get_gate_stats() -> TradeGateStats:
+    """Get the process-wide gate counters"""
+    return _gate_stats
+
+class TradeGate:
+    """
+    Deterministic pre-filter that answers obvious HOLD cases locally,
+    mirroring the hard rules in the swing trader prompt.
+    """
+
+    def __init__(self, config: Optional[TradeGateConfig] = None, stats: Optional[TradeGateStats] = None):
+        self.config = config or TradeGateConfig.from_settings()
+        self.stats = stats or get_gate_stats()
+
+    def evaluate(self, market_condition: MarketCondition, stock_analysis: StockAnalysis) -> GateResult:
+        """Decide whether the setup needs the LLM, recording the outcome"""
+        result = self._evaluate(market_condition, stock_analysis)
+        self.stats.record(result)
+        return result
+
+    def _evaluate(self, market_condition: MarketCondition, stock_analysis: StockAnalysis) -> GateResult:
+        config = self.config
+        if not config.enabled:
+            return GateResult(skip_llm=False)
+
+        direction = market_condition.direction
+        is_uptrend = stock_analysis.is_above_30_week and stock_analysis.macd_histogram > 0
+        is_downtrend = not stock_analysis.is_above_30_week and stock_analysis.macd_histogram < 0
+
+        if config.hold_on_bearish_downtrend and direction == MarketDirection.BEARISH and is_downtrend:
+            return GateResult(
+                skip_llm=True,
+                rule=RULE_BEARISH_DOWNTREND,
+                reasons=[
+                    "Market direction is bearish",
+                    "Price is below the 30-week SMA with a negative MACD histogram"
+                ]
+            )
+
+        if config.hold_on_misaligned_trend and (
+            (direction == MarketDirection.BEARISH and is_uptrend)
+            or (direction == MarketDirection.BULLISH and is_downtrend)
+        ):
+            return GateResult(
+                skip_llm=True,
+                rule=RULE_MISALIGNED_TREND,
+                reasons=[
+                    f"Stock trend is not aligned with {direction.value.lower()} market direction"
+                ]
+            )
+
+        if config.min_market_score is not None and market_condition.score < config.min_market_score:
+            return GateResult(
+                skip_llm=True,
+                rule=RULE_WEAK_MARKET_SCORE,
+                reasons=[
+                    f"Market score {market_condition.score} is below the minimum of {config.min_market_score}"
+                ]
+            )
+
+        patterns = stock_analysis.candle_patterns
+        if config.hold_without_candle_group and patterns is not None and not patterns.has_clear_group:
+            return GateResult(
+                skip_llm=True,
+                rule=RULE_NO_CANDLE_GROUP,
+                reasons=["No clear IC/MC candle group available for stop loss placement"]
+            )
+
+        return GateResult(skip_llm=False)
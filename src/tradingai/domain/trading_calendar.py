@@ -0,0 +1,112 @@
+from datetime import date, datetime, time
+from typing import Iterable, List, Optional, Set, Tuple
+import numpy as np
+import pytz
+from loguru import logger
+
+from ..config.settings import settings
+
+IST = pytz.timezone('Asia/Kolkata')
+MARKET_OPEN = time(9, 15)
+MARKET_CLOSE = time(15, 30)
+
+# NSE equity trading holidays (weekday closures only)
+NSE_HOLIDAYS = frozenset([
+    # 2024
+    date(2024, 1, 22), date(2024, 1, 26), date(2024, 3, 8), date(2024, 3, 25),
+    date(2024, 3, 29), date(2024, 4, 11), date(2024, 4, 17), date(2024, 5, 1),
+    date(2024, 5, 20), date(2024, 6, 17), date(2024, 7, 17), date(2024, 8, 15),
+    date(2024, 10, 2), date(2024, 11, 1), date(2024, 11, 15), date(2024, 11, 20),
+    date(2024, 12, 25),
+    # 2025
+    date(2025, 2, 26), date(2025, 3, 14), date(2025, 3, 31), date(2025, 4, 10),
+    date(2025, 4, 14), date(2025, 4, 18), date(2025, 5, 1), date(2025, 8, 15),
+    date(2025, 8, 27), date(2025, 10, 2), date(2025, 10, 21), date(2025, 10, 22),
+    date(2025, 11, 5), date(2025, 12, 25),
+    # 2026
+    date(2026, 1, 15), date(2026, 1, 26), date(2026, 3, 3), date(2026, 3, 26),
+    date(2026, 3, 31), date(2026, 4, 3), date(2026, 4, 14), date(2026, 5, 1),
+    date(2026, 5, 28), date(2026, 6, 26), date(2026, 9, 14), date(2026, 10, 2),
+    date(2026, 10, 20), date(2026, 11, 10), date(2026, 11, 24), date(2026, 12, 25),
+])
+
+class TradingCalendar:
+    """NSE trading calendar: weekdays excluding exchange holidays"""
+
+    def __init__(self, holidays: Optional[Iterable[date]] = None):
+        self.holidays = frozenset(NSE_HOLIDAYS if holidays is None else holidays)
+        self._busdaycal = np.busdaycalendar(
+            weekmask="1111100",
+            holidays=np.array(sorted(self.holidays), dtype="datetime64[D]")
+        )
+        # Years with a holiday list; other years would treat every holiday as a session
+        self.covered_years = frozenset(day.year for day in self.holidays)
+        self._warned_years: Set[int] = set()
+
+    def _check_coverage(self, start: date, end: date) -> None:
+        """Warn once per year when a range reaches a year without a holiday list"""
+        if not self.covered_years:
+            return
+        for year in range(start.year, end.year + 1):
+            if year not in self.covered_years and year not in self._warned_years:
+                self._warned_years.add(year)
+                logger.warning(
+                    f"NSE holidays for {year} are not in the trading calendar; "
+                    f"add them to NSE_EXTRA_HOLIDAYS or holidays will be treated as missing sessions"
+                )
+
+    def is_trading_day(self, day: date) -> bool:
+        return bool(np.is_busday(np.datetime64(day, "D"), busdaycal=self._busdaycal))
+
+    def session_days(self, start: date, end: date) -> np.ndarray:
+        """Trading days between start and end, inclusive, as datetime64[D]"""
+        if end < start:
+            return np.array([], dtype="datetime64[D]")
+        self._check_coverage(start, end)
+        days = np.arange(
+            np.datetime64(start, "D"),
+            np.datetime64(end, "D") + 1,
+            dtype="datetime64[D]"
+        )
+        return days[np.is_busday(days, busdaycal=self._busdaycal)]
+
+    def sessions(self, start: date, end: date) -> List[date]:
+        """All trading days between start and end, inclusive"""
+        return self.session_days(start, end).astype(object).tolist()
+
+    def previous_session(self, day: date) -> date:
+        """Most recent trading day strictly before day"""
+        return np.busday_offset(
+            np.datetime64(day, "D"), -1, roll="forward", busdaycal=self._busdaycal
+        ).astype(object)
+
+    def last_complete_session(self, now: Optional[datetime] = None) -> date:
+        """Most recent trading day whose session has closed"""
+        now = (now or datetime.now(pytz.UTC)).astimezone(IST)
+        today = now.date()
+        self._check_coverage(today, today)
+        if self.is_trading_day(today) and now.time() >= MARKET_CLOSE:
+            return today
+        return self.previous_session(today)
+
+def to_ist_date(dt: datetime) -> date:
+    """Trading date of a timestamp; naive datetimes are assumed to be IST"""
+    if dt.tzinfo is None:
+        return dt.date()
+    return dt.astimezone(IST).date()
+
+def session_bounds(start: date, end: date) -> Tuple[datetime, datetime]:
+    """IST datetimes covering the whole days start..end"""
+    return (
+        IST.localize(datetime.combine(start, time.min)),
+        IST.localize(datetime.combine(end, time(23, 59, 59)))
+    )
+
+_calendar: Optional[TradingCalendar] = None
+
+def get_trading_calendar() -> TradingCalendar:
+    """Get or create the NSE trading calendar"""
+    global _calendar
+    if _calendar is None:
+        _calendar = TradingCalendar(NSE_HOLIDAYS | frozenset(settings.NSE_EXTRA_HOLIDAYS))
+    return _calendar
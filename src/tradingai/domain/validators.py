@@ -1,5 +1,5 @@
-from datetime import datetime, timedelta
-from typing import List
+from datetime import date, datetime, timedelta
+from typing import List, Optional
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from ..config.settings import settings
 
@@ -29,4 +29,11 @@ class HistoricalDataRequest(BaseModel):
         
         if v > datetime.now():
             raise ValueError("to_date cannot be in the future")
-        return v 
\ No newline at end of file
+        return v
+
+class CorporateActionRequest(BaseModel):
+    symbol: str
+    ex_date: date
+    action_type: str  # split, bonus or adjustment
+    ratio: Optional[str] = None  # "old:new" shares for a split, "bonus:held" for a bonus
+    factor: Optional[float] = Field(None, gt=0)  # Price multiplier before ex_date, for adjustments
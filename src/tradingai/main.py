@@ -1,20 +1,21 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 import yaml
 from pathlib import Path
 from loguru import logger
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from .config.settings import settings
-from .api import health, stock, auth, instrument
-from .repository.database import init_models
-from .repository.instrument_repository import InstrumentRepository
-from .service.instrument_service import InstrumentService
-from .repository.zerodha import ZerodhaClient
-from .service.stock_service import StockService
+from .config.logging import LoggingConfig, setup_logging
+from .api import health, stock, auth, instrument, metrics, alerts
+from .metrics import registry as metrics_registry
+from .repository.database import init_models, AsyncSessionLocal
+from .container import init_container, close_container
+from .tasks.ticker import run_ticker
 
 def create_app() -> FastAPI:
+    setup_logging(LoggingConfig.from_settings(settings))
     app = FastAPI(
         title=settings.APP_NAME,
         debug=settings.DEBUG,
@@ -31,18 +32,36 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    if metrics_registry.enabled:
+        app.add_middleware(metrics.RouteTimingMiddleware)
+
     # Add routers
     app.include_router(health.router, prefix=settings.API_V1_PREFIX)
     app.include_router(stock.router, prefix=settings.API_V1_PREFIX)
     app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
     app.include_router(instrument.router, prefix=settings.API_V1_PREFIX)
+    app.include_router(alerts.router, prefix=settings.API_V1_PREFIX)
+    app.include_router(metrics.router)
 
     @app.on_event("startup")
     async def startup_event():
         logger.info("Initializing database...")
         await init_models()
+        container = init_container()
+        app.state.container = container
+        async with AsyncSessionLocal() as db:
+            await container.instrument_service(db).load_symbol_index()
+        app.state.ticker_task = asyncio.create_task(run_ticker(container)) if settings.TICKER_ENABLED else None
         logger.info(f"Application {settings.APP_NAME} initialized")
 
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        ticker_task = getattr(app.state, "ticker_task", None)
+        if ticker_task is not None:
+            ticker_task.cancel()
+            await asyncio.gather(ticker_task, return_exceptions=True)
+        await close_container()
+
     def custom_openapi():
         """Load OpenAPI spec from yaml file"""
         try:
@@ -83,10 +102,3 @@ def create_app() -> FastAPI:
     return app
 
 app = create_app()
-
-async def setup_services(db: AsyncSession):
-    instrument_repo = InstrumentRepository()
-    instrument_service = InstrumentService(db, instrument_repo)
-    zerodha_client = ZerodhaClient(instrument_service)
-    stock_service = StockService(db, zerodha_client, instrument_service)
-    return stock_service 
\ No newline at end of file
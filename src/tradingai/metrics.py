@@ -0,0 +1,247 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+Instrument hot paths with the `timed` decorator or a histogram's `time()`
+context manager. When METRICS_ENABLED is off, `timed` returns the function
+unchanged and `time()` returns a shared no-op context, so disabled metrics
+cost one attribute check at most.
+"""
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .config.settings import settings
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_NOOP = nullcontext()
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    @property
+    def family_name(self) -> str:
+        """Name on the HELP and TYPE lines"""
+        return self.name
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.family_name} {self.documentation}", f"# TYPE {self.family_name} {self.type_name}"]
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    @property
+    def family_name(self) -> str:
+        # The 0.0.4 text format names a counter's family after its samples
+        return f"{self.name}_total"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [f"{self.family_name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in values.items()]
+
+class Gauge(_Metric):
+    """Gauge whose samples are read from a callback at scrape time"""
+    type_name = "gauge"
+
+    def __init__(self, *args, callback: Callable[[], Iterable[Tuple[Dict[str, str], float]]], **kw):
+        super().__init__(*args, **kw)
+        self.callback = callback
+
+    def collect(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, self._key(labels))} {_format_value(value)}"
+            for labels, value in self.callback()
+        ]
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kw):
+        super().__init__(*args, **kw)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: bucket counts (last slot is +Inf), sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1][0] += value
+
+    def time(self, **labels):
+        """Context manager that observes the elapsed wall time in seconds"""
+        if not self.registry.enabled:
+            return _NOOP
+        return self._timer(labels)
+
+    @contextmanager
+    def _timer(self, labels: Dict[str, str]):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            series = {k: (list(counts), total[0]) for k, (counts, total) in self._series.items()}
+        lines = []
+        for key, (counts, total) in series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = (("le", _format_value(bound)),)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, documentation, labelnames, buckets=buckets))
+
+    def gauge(self, name: str, documentation: str, callback, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(self, name, documentation, labelnames, callback=callback))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            samples = metric.collect()
+            if samples:
+                lines.extend(metric.header())
+                lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry(enabled=settings.METRICS_ENABLED)
+
+def timed(histogram: Histogram, **labels):
+    """
+    Decorator observing a sync or async function's duration.
+    Returns the function unchanged when metrics are disabled.
+    """
+    def decorator(fn):
+        if not histogram.registry.enabled:
+            return fn
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kw):
+                with histogram._timer(labels):
+                    return await fn(*args, **kw)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kw):
+            with histogram._timer(labels):
+                return fn(*args, **kw)
+        return wrapper
+    return decorator
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "tradingai_http_request_seconds", "API request latency by route", ("method", "route", "status")
+)
+ZERODHA_REQUEST_SECONDS = registry.histogram(
+    "tradingai_zerodha_request_seconds", "Zerodha API call latency", ("endpoint",)
+)
+ZERODHA_RATE_LIMIT_WAIT_SECONDS = registry.histogram(
+    "tradingai_zerodha_rate_limit_wait_seconds", "Time spent waiting for the Zerodha rate limiter"
+)
+DB_QUERY_SECONDS = registry.histogram(
+    "tradingai_db_query_seconds", "Database query time", ("query",)
+)
+DATAFRAME_BUILD_SECONDS = registry.histogram(
+    "tradingai_dataframe_build_seconds", "Time to build DataFrames from query results", ("source",)
+)
+STOCK_ANALYSIS_SECONDS = registry.histogram(
+    "tradingai_stock_analysis_seconds", "DefaultStockAnalyzer.analyze time"
+)
+LLM_REQUEST_SECONDS = registry.histogram(
+    "tradingai_llm_request_seconds", "LLM call latency", ("model",)
+)
+LLM_TOKENS = registry.counter(
+    "tradingai_llm_tokens", "LLM tokens used", ("model", "kind")
+)
+TICKER_TICKS = registry.counter(
+    "tradingai_ticker_ticks", "Ticks applied to live bars"
+)
+TICKER_BARS_STORED = registry.counter(
+    "tradingai_ticker_bars_stored", "Completed live daily bars written to stock_data"
+)
+SIGNAL_ALERTS = registry.counter(
+    "tradingai_signal_alerts", "Alerts raised by the live signal evaluator", ("rule",)
+)
+ALERTS_DROPPED = registry.counter(
+    "tradingai_alerts_dropped", "Alerts dropped because a subscriber fell behind"
+)
+SERIES_CACHE_REQUESTS = registry.counter(
+    "tradingai_series_cache_requests", "Multi-timeframe series cache lookups", ("result",)
+)
+
+def _db_pool_samples():
+    from .repository.database import pool_stats
+    for engine_name, stats in pool_stats().items():
+        for field in ("checked_out", "checked_in", "overflow", "saturation"):
+            yield {"engine": engine_name, "state": field}, stats[field]
+
+DB_POOL = registry.gauge(
+    "tradingai_db_pool", "Connection pool usage by engine", _db_pool_samples, ("engine", "state")
+)
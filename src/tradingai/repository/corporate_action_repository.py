@@ -0,0 +1,71 @@
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+from ..domain.models import CorporateAction
+
+class CorporateActionRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record_action(
+        self,
+        symbol: str,
+        ex_date: date,
+        action_type: str,
+        factor: float,
+        ratio: Optional[str] = None
+    ) -> CorporateAction:
+        """Store an action; recording the same symbol, ex-date and type again replaces it"""
+        try:
+            query = insert(CorporateAction).values(
+                symbol=symbol,
+                ex_date=ex_date,
+                action_type=action_type,
+                ratio=ratio,
+                factor=factor,
+                created_at=datetime.utcnow()
+            )
+            query = query.on_conflict_do_update(
+                constraint='uq_corporate_actions_symbol_ex_date_type',
+                set_={"ratio": query.excluded.ratio, "factor": query.excluded.factor}
+            ).returning(CorporateAction)
+            # A replaced row may already be in the session; refresh it from the returned values
+            result = await self.db.execute(query, execution_options={"populate_existing": True})
+            action = result.scalar_one()
+            await self.db.commit()
+            return action
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error recording {action_type} for {symbol} on {ex_date}: {str(e)}")
+            raise
+
+    async def get_actions(self, symbol: str) -> List[CorporateAction]:
+        """A symbol's actions, oldest first"""
+        try:
+            result = await self.db.execute(
+                select(CorporateAction).where(CorporateAction.symbol == symbol).order_by(CorporateAction.ex_date)
+            )
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error(f"Error getting corporate actions for {symbol}: {str(e)}")
+            raise
+
+    async def get_all_factors(self) -> List[Tuple[str, date, float]]:
+        """
+        (symbol, ex_date, factor) for every action, to load an AdjustmentCache.
+        Read from the primary: the cache is reloaded right after an action is
+        recorded and keeps what it reads until it goes stale again.
+        """
+        try:
+            result = await self.db.execute(
+                select(CorporateAction.symbol, CorporateAction.ex_date, CorporateAction.factor)
+                .execution_options(use_primary=True)
+            )
+            return [tuple(row) for row in result.all()]
+        except Exception as e:
+            logger.error(f"Error getting corporate action factors: {str(e)}")
+            raise
@@ -1,16 +1,29 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+import threading
+import time
+from typing import Dict, Optional
+from sqlalchemy import Select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 from loguru import logger
 from ..config.settings import settings
 from .database_init import init_database
 
-# Simplified connection URL first
-DATABASE_URL = (
-    f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
-    f"@{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
-)
+def _database_url(server: str, port: int) -> str:
+    return (
+        f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
+        f"@{server}:{port}/{settings.POSTGRES_DB}"
+        f"?prepared_statement_cache_size={settings.DB_STATEMENT_CACHE_SIZE}"
+    )
 
-logger.info(f"Connecting to database: {DATABASE_URL}")
+DATABASE_URL = _database_url(settings.POSTGRES_SERVER, settings.POSTGRES_PORT)
+READ_DATABASE_URL: Optional[str] = None
+if settings.POSTGRES_READ_SERVER:
+    READ_DATABASE_URL = _database_url(
+        settings.POSTGRES_READ_SERVER,
+        settings.POSTGRES_READ_PORT or settings.POSTGRES_PORT
+    )
 
 async def test_connection():
     import asyncpg
@@ -29,15 +42,128 @@ async def test_connection():
         logger.error(f"Direct asyncpg connection test failed: {str(e)}")
         raise
 
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=True,  # Enable full SQL logging
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10
-)
+def create_engine(url: str) -> AsyncEngine:
+    """Async engine with the production pool profile from settings"""
+    engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        pool_pre_ping=True,  # Checks connections on checkout, so sessions need no health query
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        connect_args={"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    )
+    logger.info(f"Connecting to database: {engine.url.render_as_string(hide_password=True)}")
+    return engine
+
+class ReplicaHealth:
+    """Tracks replica failures so reads fall back to the primary for a while"""
+
+    def __init__(self, retry_seconds: float):
+        self.retry_seconds = retry_seconds
+        self._failed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def mark_failed(self) -> None:
+        with self._lock:
+            self._failed_at = time.monotonic()
+
+    def is_available(self) -> bool:
+        with self._lock:
+            if self._failed_at is None:
+                return True
+            if time.monotonic() - self._failed_at >= self.retry_seconds:
+                self._failed_at = None
+                return True
+            return False
+
+# Session.info key set once a session touches the primary; it then stays there
+PINNED_TO_PRIMARY = "pinned_to_primary"
+# Statement execution option that keeps a plain SELECT on the primary
+USE_PRIMARY = "use_primary"
+
+class RoutingSession(Session):
+    """
+    Sends plain SELECTs to the read replica and everything else to the primary.
+    SELECT ... FOR UPDATE, statements issued while flushing, raw connections,
+    and any session that has already used the primary stay on the primary, so
+    a request always reads its own writes.
+
+    Consistency contract: a session reads its own writes, but rows written by
+    other sessions (another request, the worker) may be missing from the
+    replica for as long as it lags. Reads that must see such writes, such as
+    job status polling or loads that seed a process cache, set
+    `.execution_options(use_primary=True)` on the statement, or use an
+    AsyncWriteSessionLocal session.
+    """
+
+    def __init__(self, primary: Engine, replica: Optional[Engine] = None,
+                 replica_health: Optional[ReplicaHealth] = None, **kw):
+        super().__init__(**kw)
+        self.primary = primary
+        self.replica = replica
+        self.replica_health = replica_health
+        self.last_bind_was_replica = False
+
+    def _use_replica(self, clause) -> bool:
+        if self.replica is None or self.info.get(PINNED_TO_PRIMARY) or self._flushing:
+            return False
+        if not isinstance(clause, Select) or clause._for_update_arg is not None:
+            return False
+        if clause.get_execution_options().get(USE_PRIMARY):
+            return False
+        return self.replica_health is None or self.replica_health.is_available()
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        self.last_bind_was_replica = self._use_replica(clause)
+        if self.last_bind_was_replica:
+            return self.replica
+        self.info[PINNED_TO_PRIMARY] = True
+        return self.primary
+
+def _is_connection_error(error: Exception) -> bool:
+    if isinstance(error, OSError):
+        return True
+    return isinstance(error, (InterfaceError, OperationalError)) or (
+        isinstance(error, DBAPIError) and error.connection_invalidated
+    )
 
+class RoutingAsyncSession(AsyncSession):
+    """Retries a replica read on the primary when the replica cannot be reached"""
+
+    async def execute(self, statement, *args, **kw):
+        try:
+            return await super().execute(statement, *args, **kw)
+        except Exception as e:
+            sync_session = self.sync_session
+            if not (sync_session.last_bind_was_replica and _is_connection_error(e)):
+                raise
+            logger.warning(f"Read replica unavailable, using primary for {settings.DB_REPLICA_RETRY_SECONDS}s: {str(e)}")
+            if sync_session.replica_health is not None:
+                sync_session.replica_health.mark_failed()
+            # Nothing was written yet (writes pin the session to the primary)
+            await self.rollback()
+            sync_session.info[PINNED_TO_PRIMARY] = True
+            return await super().execute(statement, *args, **kw)
+
+engine = create_engine(DATABASE_URL)
+read_engine: Optional[AsyncEngine] = create_engine(READ_DATABASE_URL) if READ_DATABASE_URL else None
+replica_health = ReplicaHealth(settings.DB_REPLICA_RETRY_SECONDS)
+
+# Default sessions route reads to the replica when one is configured
 AsyncSessionLocal = sessionmaker(
+    class_=RoutingAsyncSession,
+    sync_session_class=RoutingSession,
+    primary=engine.sync_engine,
+    replica=read_engine.sync_engine if read_engine is not None else None,
+    replica_health=replica_health,
+    expire_on_commit=False,
+    autoflush=False
+)
+
+# Primary-only sessions for ingestion, where replica lag could hide just-written rows
+AsyncWriteSessionLocal = sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False,
@@ -54,19 +180,26 @@ async def init_models():
         raise
 
 async def get_db():
-    try:
-        async with AsyncSessionLocal() as db:
-            try:
-                logger.debug("Creating new database session")
-                # Test the connection
-                await db.execute("SELECT 1")
-                yield db
-            except Exception as e:
-                logger.error(f"Database session error: {str(e)}")
-                raise
-            finally:
-                logger.debug("Closing database session")
-                await db.close()
-    except Exception as e:
-        logger.error(f"Database connection error: {str(e)}")
-        raise 
\ No newline at end of file
+    """Session that routes reads to the replica and writes to the primary"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def _pool_stats(engine: AsyncEngine) -> Dict:
+    pool = engine.sync_engine.pool
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    checked_out = pool.checkedout()
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_out": checked_out,
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "saturation": round(checked_out / capacity, 3) if capacity else 0.0
+    }
+
+def pool_stats() -> Dict[str, Dict]:
+    """Connection pool usage per engine; saturation near 1.0 means requests queue for connections"""
+    stats = {"primary": _pool_stats(engine)}
+    if read_engine is not None:
+        stats["replica"] = {**_pool_stats(read_engine), "available": replica_health.is_available()}
+    return stats
@@ -3,6 +3,23 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy import text
 from ..domain.models import Base
 
+# Columns and indexes added after their table was first created
+_ADDED_COLUMNS = (
+    "ALTER TABLE instruments ADD COLUMN IF NOT EXISTS sector VARCHAR(64)",
+    "CREATE INDEX IF NOT EXISTS ix_instruments_sector ON instruments (sector)",
+    # Duplicates left by racing writers must go before the unique index can be built
+    """
+    DO $$
+    BEGIN
+        IF to_regclass('uq_stock_data_symbol_timestamp') IS NULL THEN
+            DELETE FROM stock_data a USING stock_data b
+            WHERE a.symbol = b.symbol AND a.timestamp = b.timestamp AND a.id > b.id;
+            CREATE UNIQUE INDEX uq_stock_data_symbol_timestamp ON stock_data (symbol, timestamp);
+        END IF;
+    END $$
+    """,
+)
+
 async def init_database(engine: AsyncEngine):
     """Initialize database tables"""
     try:
@@ -16,6 +33,9 @@ async def init_database(engine: AsyncEngine):
         async with engine.begin() as conn:
             # Only create tables if they don't exist
             await conn.run_sync(Base.metadata.create_all)
+            # create_all does not add columns to existing tables
+            for statement in _ADDED_COLUMNS:
+                await conn.execute(text(statement))
         logger.info("Database tables created successfully")
         
     except Exception as e:
@@ -1,51 +1,119 @@
 from datetime import datetime
+import codecs
 import csv
-from io import StringIO
 import aiohttp
-from typing import List, Dict
+from typing import AsyncIterator, Dict, Iterable, List, Optional
 from loguru import logger
 
 from ..config.settings import settings
+from ..domain.symbol_index import INDICES_SEGMENT
+
+INSTRUMENT_BATCH_SIZE = 1000
+READ_CHUNK_SIZE = 64 * 1024
+DEFAULT_SEGMENTS = ("NSE", INDICES_SEGMENT)  # NSE equity, and indices such as the RS benchmark NIFTY 50
+
+def _to_instrument(row: Dict[str, str], created_at: datetime) -> Dict:
+    return {
+        "instrument_token": int(row['instrument_token']),
+        "exchange_token": int(row['exchange_token']),
+        "tradingsymbol": row['tradingsymbol'],
+        "name": row['name'],
+        "exchange": row['exchange'],
+        "segment": row['segment'],
+        "instrument_type": row['instrument_type'],
+        "tick_size": float(row['tick_size']),
+        "lot_size": int(row['lot_size']),
+        "created_at": created_at
+    }
+
+async def parse_instrument_stream(
+    chunks: AsyncIterator[bytes],
+    segments: Iterable[str] = DEFAULT_SEGMENTS,
+    batch_size: int = INSTRUMENT_BATCH_SIZE
+) -> AsyncIterator[List[Dict]]:
+    """
+    Incrementally parse the Kite instruments CSV, yielding batches of
+    instruments in the wanted segments. Only one chunk plus one batch of
+    rows is held in memory at a time.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    wanted = {f",{segment}," for segment in segments}
+    created_at = datetime.utcnow()
+    header = None
+    pending = ""
+    lines: List[str] = []
+
+    def parse(batch_lines: List[str]) -> List[Dict]:
+        return [
+            _to_instrument(dict(zip(header, fields)), created_at)
+            for fields in csv.reader(batch_lines)
+        ]
+
+    def wanted_line(line: str) -> bool:
+        # segment and exchange are the last two columns and never quoted, so
+        # rows can be filtered before paying for a full CSV parse
+        last = line.rfind(",")
+        return line[line.rfind(",", 0, last):last + 1] in wanted
+
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *complete, pending = pending.split("\n")
+        for line in complete:
+            line = line.rstrip("\r")
+            if header is None:
+                header = next(csv.reader([line]))
+                continue
+            if line and wanted_line(line):
+                lines.append(line)
+                if len(lines) >= batch_size:
+                    yield parse(lines)
+                    lines = []
+
+    pending += decoder.decode(b"", final=True)
+    if pending.strip() and header is not None and wanted_line(pending.rstrip("\r")):
+        lines.append(pending.rstrip("\r"))
+    if lines:
+        yield parse(lines)
 
 class InstrumentRepository:
-    def __init__(self):
-        self.base_url = "https://api.kite.trade"
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        self.base_url = settings.ZERODHA_BASE_URL
+        self.session = session
 
-    async def fetch_instruments(self) -> List[Dict]:
-        """Fetch instruments from Zerodha API"""
+    async def fetch_instrument_batches(
+        self,
+        segments: Iterable[str] = DEFAULT_SEGMENTS,
+        batch_size: int = INSTRUMENT_BATCH_SIZE
+    ) -> AsyncIterator[List[Dict]]:
+        """Stream instruments from Zerodha API in batches"""
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "X-Kite-Version": "3",
-                    "Authorization": f"token {settings.ZERODHA_API_KEY}:{settings.ZERODHA_ACCESS_TOKEN}"
-                }
+            headers = {
+                "X-Kite-Version": "3",
+                "Authorization": f"token {settings.ZERODHA_API_KEY}:{settings.ZERODHA_ACCESS_TOKEN}"
+            }
+            session = self.session or aiohttp.ClientSession()
+            try:
                 async with session.get(f"{self.base_url}/instruments", headers=headers) as response:
                     if response.status != 200:
                         raise Exception(f"Failed to fetch instruments: {response.status}")
-                    
-                    # Parse CSV data
-                    csv_data = StringIO(await response.text())
-                    reader = csv.DictReader(csv_data)
-                    
-                    instruments = []
-                    for row in reader:
-                        if row['segment'] in ['NSE']:  # Filter for NSE equity
-                            instrument = {
-                                "instrument_token": int(row['instrument_token']),
-                                "exchange_token": int(row['exchange_token']),
-                                "tradingsymbol": row['tradingsymbol'],
-                                "name": row['name'],
-                                "exchange": row['exchange'],
-                                "segment": row['segment'],
-                                "instrument_type": row['instrument_type'],
-                                "tick_size": float(row['tick_size']),
-                                "lot_size": int(row['lot_size']),
-                                "created_at": datetime.utcnow()
-                            }
-                            instruments.append(instrument)
-                    
-                    return instruments
-                    
+
+                    async for batch in parse_instrument_stream(
+                        response.content.iter_chunked(READ_CHUNK_SIZE),
+                        segments=segments,
+                        batch_size=batch_size
+                    ):
+                        yield batch
+            finally:
+                if session is not self.session:
+                    await session.close()
+
         except Exception as e:
             logger.error(f"Error fetching instruments: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+    async def fetch_instruments(self) -> List[Dict]:
+        """Fetch instruments from Zerodha API"""
+        instruments = []
+        async for batch in self.fetch_instrument_batches():
+            instruments.extend(batch)
+        return instruments
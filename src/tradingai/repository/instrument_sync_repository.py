@@ -0,0 +1,127 @@
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+STAGING_TABLE = "instruments_staging"
+
+# Columns supplied by the Kite instruments dump, in COPY order
+INSTRUMENT_COLUMNS = (
+    "instrument_token",
+    "exchange_token",
+    "tradingsymbol",
+    "name",
+    "exchange",
+    "segment",
+    "instrument_type",
+    "tick_size",
+    "lot_size",
+)
+
+_CREATE_STAGING = text(f"""
+    CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+        instrument_token INTEGER PRIMARY KEY,
+        exchange_token INTEGER,
+        tradingsymbol VARCHAR(32) NOT NULL,
+        name VARCHAR(100),
+        exchange VARCHAR(10) NOT NULL,
+        segment VARCHAR(10),
+        instrument_type VARCHAR(10),
+        tick_size DOUBLE PRECISION,
+        lot_size INTEGER
+    ) ON COMMIT DROP
+""")
+
+_DATA_COLUMNS = INSTRUMENT_COLUMNS[1:]
+
+# Only rows that are new or actually differ are written; unchanged rows produce no tuple
+_UPSERT_CHANGED = text(f"""
+    INSERT INTO instruments ({", ".join(INSTRUMENT_COLUMNS)}, created_at)
+    SELECT {", ".join(INSTRUMENT_COLUMNS)}, now() FROM {STAGING_TABLE}
+    ON CONFLICT (instrument_token) DO UPDATE SET
+        {", ".join(f"{c} = EXCLUDED.{c}" for c in _DATA_COLUMNS)},
+        updated_at = now()
+    WHERE ({", ".join(f"instruments.{c}" for c in _DATA_COLUMNS)})
+        IS DISTINCT FROM ({", ".join(f"EXCLUDED.{c}" for c in _DATA_COLUMNS)})
+    RETURNING (xmax = 0) AS inserted
+""")
+
+# Instruments of the synced exchanges that are no longer in the dump
+_DELETE_DELISTED = text(f"""
+    DELETE FROM instruments i
+    WHERE i.exchange IN (SELECT DISTINCT exchange FROM {STAGING_TABLE})
+      AND NOT EXISTS (
+          SELECT 1 FROM {STAGING_TABLE} s WHERE s.instrument_token = i.instrument_token
+      )
+""")
+
+@dataclass
+class InstrumentSyncSummary:
+    staged: int = 0
+    inserted: int = 0
+    updated: int = 0
+    delisted: int = 0
+
+    @property
+    def unchanged(self) -> int:
+        return self.staged - self.inserted - self.updated
+
+    def to_dict(self) -> Dict:
+        return {**asdict(self), "unchanged": self.unchanged}
+
+class InstrumentSyncRepository:
+    """
+    Bulk instrument sync: rows are COPYed into a temporary staging table and
+    diffed against `instruments` in SQL within a single transaction.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.summary = InstrumentSyncSummary()
+
+    async def _driver_connection(self):
+        """The asyncpg connection behind the session's current transaction"""
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        return raw.driver_connection
+
+    async def create_staging(self) -> None:
+        """Create the staging table for this transaction"""
+        await self.db.execute(_CREATE_STAGING)
+        self.summary = InstrumentSyncSummary()
+
+    async def copy_batch(self, instruments: Iterable[Dict]) -> int:
+        """COPY a batch of instrument dicts into the staging table"""
+        records = [tuple(i[c] for c in INSTRUMENT_COLUMNS) for i in instruments]
+        if not records:
+            return 0
+        driver_connection = await self._driver_connection()
+        await driver_connection.copy_records_to_table(
+            STAGING_TABLE, records=records, columns=INSTRUMENT_COLUMNS
+        )
+        self.summary.staged += len(records)
+        return len(records)
+
+    async def apply(self, delete_delisted: bool = True) -> InstrumentSyncSummary:
+        """Upsert changed rows and remove delisted instruments, then commit"""
+        try:
+            result = await self.db.execute(_UPSERT_CHANGED)
+            for (inserted,) in result.all():
+                if inserted:
+                    self.summary.inserted += 1
+                else:
+                    self.summary.updated += 1
+
+            if delete_delisted and self.summary.staged:
+                result = await self.db.execute(_DELETE_DELISTED)
+                self.summary.delisted = result.rowcount
+            elif delete_delisted:
+                logger.warning("Instrument dump was empty, skipping delisting")
+
+            await self.db.commit()
+            return self.summary
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error applying instrument sync: {str(e)}")
+            raise
@@ -0,0 +1,186 @@
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import pytz
+from sqlalchemy import select, update, or_, and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+from ..config.settings import settings
+from ..domain.models import Job, JobStatus
+
+class JobLockLost(Exception):
+    """The job was reclaimed by another worker; its holder must stop working on it"""
+
+class JobRepository:
+    """Postgres-backed job queue, claimed with FOR UPDATE SKIP LOCKED"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue(self, job_type: str, payload: Dict, total_symbols: Optional[int] = None) -> Job:
+        """Add a job to the queue"""
+        try:
+            job = Job(
+                job_type=job_type,
+                status=JobStatus.QUEUED,
+                payload=payload,
+                completed_symbols=[],
+                total_symbols=total_symbols,
+                max_attempts=settings.JOB_MAX_ATTEMPTS,
+                run_after=datetime.now(pytz.UTC)
+            )
+            self.db.add(job)
+            await self.db.commit()
+            await self.db.refresh(job)
+            logger.info(f"Enqueued {job_type} job {job.id}")
+            return job
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error enqueueing {job_type} job: {str(e)}")
+            raise
+
+    async def claim_next(self, worker_id: str) -> Optional[Job]:
+        """
+        Claim the oldest runnable job.
+        Running jobs whose lock has gone stale (worker died) are reclaimed
+        and resume from their last checkpoint.
+        """
+        try:
+            now = datetime.now(pytz.UTC)
+            stale_before = now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT_SECONDS)
+            query = select(Job).where(
+                or_(
+                    and_(Job.status == JobStatus.QUEUED, Job.run_after <= now),
+                    and_(Job.status == JobStatus.RUNNING, Job.locked_at < stale_before)
+                )
+            ).order_by(Job.created_at).limit(1).with_for_update(skip_locked=True)
+
+            result = await self.db.execute(query)
+            job = result.scalar_one_or_none()
+            if job is None:
+                # End the transaction without expiring objects loaded in this session
+                await self.db.commit()
+                return None
+
+            job.status = JobStatus.RUNNING
+            job.attempts += 1
+            job.locked_by = worker_id
+            job.locked_at = now
+            await self.db.commit()
+            await self.db.refresh(job)
+            return job
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error claiming job: {str(e)}")
+            raise
+
+    async def checkpoint(self, job_id: int, worker_id: str, symbol: str, records: int) -> None:
+        """
+        Record a completed symbol and refresh the job's lock heartbeat.
+        Raises:
+            JobLockLost if another worker has reclaimed the job
+        """
+        try:
+            result = await self.db.execute(
+                update(Job).where(Job.id == job_id, Job.locked_by == worker_id).values(
+                    completed_symbols=Job.completed_symbols.op('||')(func.jsonb_build_array(symbol)),
+                    records_inserted=Job.records_inserted + records,
+                    locked_at=datetime.now(pytz.UTC)
+                )
+            )
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error checkpointing job {job_id} at {symbol}: {str(e)}")
+            raise
+        if result.rowcount == 0:
+            raise JobLockLost(f"Worker {worker_id} lost the lock on job {job_id}")
+
+    async def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """
+        Refresh the lock of a job this worker still holds.
+        Returns:
+            False if the lock was lost (the job was reclaimed by another worker)
+        """
+        try:
+            result = await self.db.execute(
+                update(Job).where(
+                    Job.id == job_id,
+                    Job.status == JobStatus.RUNNING,
+                    Job.locked_by == worker_id
+                ).values(locked_at=datetime.now(pytz.UTC))
+            )
+            await self.db.commit()
+            return result.rowcount > 0
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error refreshing heartbeat for job {job_id}: {str(e)}")
+            raise
+
+    async def complete(self, job_id: int, worker_id: str) -> bool:
+        """
+        Mark a job as completed.
+        Returns:
+            False if the lock was lost and the job was left to its new holder
+        """
+        return await self._finish(job_id, worker_id, status=JobStatus.COMPLETED, error=None)
+
+    async def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        """
+        Requeue a failed job with backoff, or mark it failed once out of attempts.
+        Returns:
+            False if the lock was lost and the job was left to its new holder
+        """
+        job = await self.get(job_id)
+        if job is None or job.locked_by != worker_id:
+            return False
+        if job.attempts < job.max_attempts:
+            backoff = settings.JOB_RETRY_BACKOFF_SECONDS * job.attempts
+            updated = await self._update(
+                job_id,
+                worker_id,
+                status=JobStatus.QUEUED,
+                error=error,
+                locked_by=None,
+                locked_at=None,
+                run_after=datetime.now(pytz.UTC) + timedelta(seconds=backoff)
+            )
+            if updated:
+                logger.warning(f"Job {job_id} failed (attempt {job.attempts}), retrying in {backoff}s")
+            return updated
+        updated = await self._finish(job_id, worker_id, status=JobStatus.FAILED, error=error)
+        if updated:
+            logger.error(f"Job {job_id} failed permanently after {job.attempts} attempts")
+        return updated
+
+    async def get(self, job_id: int) -> Optional[Job]:
+        """Get a job by id, from the primary since workers update it from other sessions"""
+        query = select(Job).where(Job.id == job_id).execution_options(populate_existing=True, use_primary=True)
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+
+    async def _finish(self, job_id: int, worker_id: str, status: str, error: Optional[str]) -> bool:
+        return await self._update(
+            job_id,
+            worker_id,
+            status=status,
+            error=error,
+            locked_by=None,
+            locked_at=None,
+            finished_at=datetime.now(pytz.UTC)
+        )
+
+    async def _update(self, job_id: int, worker_id: str, **values) -> bool:
+        """Update a job this worker still holds; False if another worker has reclaimed it"""
+        try:
+            result = await self.db.execute(
+                update(Job).where(Job.id == job_id, Job.locked_by == worker_id).values(**values)
+            )
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error updating job {job_id}: {str(e)}")
+            raise
+        if result.rowcount == 0:
+            logger.warning(f"Worker {worker_id} lost the lock on job {job_id}; leaving it to the new holder")
+        return result.rowcount > 0
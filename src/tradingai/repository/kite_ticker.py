@@ -0,0 +1,114 @@
+import asyncio
+import struct
+import time
+from typing import AsyncIterator, List, Optional
+import aiohttp
+from loguru import logger
+
+from ..config.settings import settings
+from ..domain.bar_builder import Tick
+
+MODE_LTP = "ltp"
+MODE_QUOTE = "quote"
+MODE_FULL = "full"
+
+LTP_PACKET_SIZE = 8
+QUOTE_PACKET_SIZE = 44
+FULL_PACKET_SIZE = 184
+RECONNECT_MAX_DELAY_SECONDS = 60
+
+# Prices are integers scaled per segment (low byte of the token)
+SEGMENT_CDS = 3
+SEGMENT_BCD = 6
+PRICE_DIVISORS = {SEGMENT_CDS: 10000000.0, SEGMENT_BCD: 10000.0}
+DEFAULT_PRICE_DIVISOR = 100.0
+
+_COUNT = struct.Struct(">H")
+_LTP = struct.Struct(">II")
+_QUOTE = struct.Struct(">11I")  # token, ltp, last qty, avg price, volume, buy qty, sell qty, ohlc
+OHLC_FIELDS = slice(7, 10)  # Session open, high, low; the fourth is the previous close
+_FULL_HEAD = struct.Struct(">16I")  # quote fields, last trade time, oi, oi high, oi low, exchange time
+
+def parse_ticks(message: bytes, received_at: Optional[int] = None) -> List[Tick]:
+    """
+    Decode a Kite ticker binary message: a packet count, then length-prefixed
+    packets. One-byte messages are heartbeats. Index packets are skipped.
+    Quote and full packets also carry the session's open, high and low.
+    """
+    if len(message) < _COUNT.size:
+        return []
+    received_at = received_at if received_at is not None else int(time.time())
+    (count,) = _COUNT.unpack_from(message, 0)
+    offset = _COUNT.size
+    ticks = []
+    for _ in range(count):
+        (length,) = _COUNT.unpack_from(message, offset)
+        offset += _COUNT.size
+        ohlc = None
+        if length == LTP_PACKET_SIZE:
+            token, price = _LTP.unpack_from(message, offset)
+            volume, exchange_time = 0, received_at
+        elif length >= FULL_PACKET_SIZE:
+            fields = _FULL_HEAD.unpack_from(message, offset)
+            token, price, volume, exchange_time = fields[0], fields[1], fields[4], fields[15] or received_at
+            ohlc = fields[OHLC_FIELDS]
+        elif length >= QUOTE_PACKET_SIZE:
+            fields = _QUOTE.unpack_from(message, offset)
+            token, price, volume, exchange_time = fields[0], fields[1], fields[4], received_at
+            ohlc = fields[OHLC_FIELDS]
+        else:
+            offset += length
+            continue
+        offset += length
+        divisor = PRICE_DIVISORS.get(token & 0xff, DEFAULT_PRICE_DIVISOR)
+        if ohlc is None:
+            ticks.append(Tick(token, price / divisor, volume, exchange_time))
+        else:
+            day_open, day_high, day_low = (value / divisor for value in ohlc)
+            ticks.append(Tick(token, price / divisor, volume, exchange_time, day_open, day_high, day_low))
+    return ticks
+
+class KiteTickerClient:
+    """
+    asyncio client for the Kite WebSocket ticker. Reconnects with exponential
+    backoff and re-subscribes after every reconnect.
+    """
+
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None, url: Optional[str] = None):
+        self.session = session
+        self.url = url or settings.ZERODHA_TICKER_URL
+
+    async def _subscribe(self, ws: aiohttp.ClientWebSocketResponse, tokens: List[int], mode: str) -> None:
+        await ws.send_json({"a": "subscribe", "v": tokens})
+        await ws.send_json({"a": "mode", "v": [mode, tokens]})
+
+    async def stream(self, tokens: List[int], mode: str = MODE_FULL) -> AsyncIterator[List[Tick]]:
+        """Yield batches of ticks for the subscribed tokens until cancelled"""
+        params = {"api_key": settings.ZERODHA_API_KEY, "access_token": settings.ZERODHA_ACCESS_TOKEN or ""}
+        session = self.session or aiohttp.ClientSession()
+        delay = 1.0
+        try:
+            while True:
+                try:
+                    async with session.ws_connect(self.url, params=params, heartbeat=30) as ws:
+                        await self._subscribe(ws, tokens, mode)
+                        logger.info(f"Ticker connected, subscribed to {len(tokens)} instruments")
+                        delay = 1.0
+                        async for message in ws:
+                            if message.type == aiohttp.WSMsgType.BINARY:
+                                ticks = parse_ticks(message.data)
+                                if ticks:
+                                    yield ticks
+                            elif message.type == aiohttp.WSMsgType.TEXT:
+                                logger.debug("Ticker message: {}", message.data)
+                            elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+                    logger.warning("Ticker connection closed")
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logger.warning(f"Ticker connection failed: {str(e)}")
+                logger.info(f"Reconnecting to ticker in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY_SECONDS)
+        finally:
+            if session is not self.session:
+                await session.close()
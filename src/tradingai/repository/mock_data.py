@@ -1,53 +1,158 @@
-from datetime import datetime, timedelta
-import random
-import pytz
-
-IST = pytz.timezone('Asia/Kolkata')
-
-def generate_mock_candle(date: datetime, base_price: float = 1700.0) -> list:
-    """Generate a single mock candle with realistic OHLCV data"""
-    # Create random price movements within 1% of base price
-    variation = base_price * 0.01
-    open_price = base_price + random.uniform(-variation, variation)
-    high_price = open_price + random.uniform(0, variation)
-    low_price = open_price - random.uniform(0, variation)
-    close_price = random.uniform(low_price, high_price)
-    volume = random.randint(500, 3000)
-    
-    return [
-        date.astimezone(IST).isoformat(),
-        round(open_price, 2),
-        round(high_price, 2),
-        round(low_price, 2),
-        round(close_price, 2),
-        volume
-    ]
-
-def get_mock_historical_data(symbol: str, from_date: datetime, to_date: datetime) -> dict:
-    """Generate mock historical data for given date range"""
-    candles = []
-    current_date = from_date
-    base_price = 1700.0  # Starting price
-    
-    while current_date <= to_date:
-        # Generate data for trading days (Monday to Friday)
-        if current_date.weekday() < 5:  # 0-4 represents Monday to Friday
-            # Generate candles for trading hours (9:15 AM to 3:30 PM)
-            trading_start = current_date.replace(hour=9, minute=15)
-            trading_end = current_date.replace(hour=15, minute=30)
-            current_time = trading_start
-            
-            while current_time <= trading_end:
-                candle = generate_mock_candle(current_time, base_price)
-                candles.append(candle)
-                base_price = candle[4]  # Use last close as next base price
-                current_time += timedelta(minutes=1)
-        
-        current_date += timedelta(days=1)
-    
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import List, Optional
+import zlib
+import numpy as np
+import pandas as pd
+
+from ..domain.trading_calendar import IST, TradingCalendar, get_trading_calendar
+
+MINUTES_PER_SESSION = 375  # 09:15 to 15:29 one-minute candles
+SESSION_OPEN = np.timedelta64(9 * 60 + 15, "m")
+INTERVAL_MINUTE = "minute"
+INTERVAL_DAY = "day"
+
+# Random-walk parameters per candle interval (log-return volatility)
+MINUTE_VOLATILITY = 0.0008
+DAILY_VOLATILITY = 0.018
+DAILY_DRIFT = 0.0003
+WICK_SCALE = 0.5  # Wick size relative to the interval's volatility
+VOLUME_NOISE = 0.3  # Log-normal spread of volume around the symbol's base volume
+# Daily walks step through every calendar day from here (weekends and holidays
+# become gaps), so any window is a slice of one series per symbol and seed
+MOCK_EPOCH = date(2015, 1, 1)
+
+@dataclass
+class MockCandles:
+    """Columnar OHLCV candles; timestamps are naive IST like parsed Kite responses"""
+    timestamp: np.ndarray  # datetime64[m]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "timestamp": self.timestamp.astype("datetime64[ns]"),
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+        })
+
+    def to_kite_candles(self) -> List[list]:
+        """Rows in the Kite historical API format"""
+        stamps = np.datetime_as_string(self.timestamp, unit="s")
+        return [
+            [f"{ts}+0530", o, h, l, c, v]
+            for ts, o, h, l, c, v in zip(
+                stamps.tolist(), self.open.tolist(), self.high.tolist(),
+                self.low.tolist(), self.close.tolist(), self.volume.tolist()
+            )
+        ]
+
+def _to_ist_naive(dt: datetime) -> datetime:
+    return dt.astimezone(IST).replace(tzinfo=None) if dt.tzinfo else dt
+
+def _volume_profile() -> np.ndarray:
+    """U-shaped intraday volume: heavy at the open and close, quiet at lunch"""
+    x = np.linspace(-1.0, 1.0, MINUTES_PER_SESSION)
+    profile = 0.4 + 1.6 * x ** 2
+    return profile / profile.mean()
+
+_VOLUME_PROFILE = _volume_profile()
+
+def symbol_seed(symbol: str, seed: int = 0) -> int:
+    """Stable per-symbol seed, so each symbol gets its own reproducible walk"""
+    return zlib.crc32(symbol.encode()) ^ seed
+
+def _stream(symbol: str, seed: int, *key: int) -> np.random.Generator:
+    """Independent random stream per symbol, seed and key"""
+    return np.random.default_rng([symbol_seed(symbol, seed), *key])
+
+def generate_candles(
+    symbol: str,
+    from_date: datetime,
+    to_date: datetime,
+    interval: str = INTERVAL_DAY,
+    seed: int = 0,
+    calendar: Optional[TradingCalendar] = None
+) -> MockCandles:
+    """
+    Seeded geometric random walk over NSE sessions.
+    The daily walk is anchored at MOCK_EPOCH and the requested range is a
+    slice of it; minute candles are drawn per session from that day's open.
+    Splitting a range into pieces therefore yields the same candles.
+    """
+    calendar = calendar or get_trading_calendar()
+    start, end = _to_ist_naive(from_date), _to_ist_naive(to_date)
+    if start.date() < MOCK_EPOCH:
+        raise ValueError(f"Mock data starts at {MOCK_EPOCH}")
+    days = calendar.session_days(start.date(), end.date())
+    rng = np.random.default_rng(symbol_seed(symbol, seed))
+    base_price = rng.uniform(50.0, 3000.0)
+    base_volume = rng.uniform(5e4, 5e6)
+
+    # Every calendar day since the epoch moves the price; sessions read the walk
+    offsets = (days - np.datetime64(MOCK_EPOCH, "D")).astype(np.int64)
+    span = int(offsets[-1]) + 1 if len(days) else 0
+    walk = np.concatenate(([0.0], np.cumsum(_stream(symbol, seed, 0, 0).normal(DAILY_DRIFT, DAILY_VOLATILITY, span))))
+    day_open = base_price * np.exp(walk[offsets])
+    day_close = base_price * np.exp(walk[offsets + 1])
+
+    if interval == INTERVAL_MINUTE:
+        minutes = np.arange(MINUTES_PER_SESSION).astype("timedelta64[m]")
+        timestamps = (days.astype("datetime64[m]")[:, None] + SESSION_OPEN + minutes).ravel()
+        # One stream per session: returns, two wicks and volume noise
+        noise = np.array(
+            [_stream(symbol, seed, 1, int(offset)).standard_normal((4, MINUTES_PER_SESSION)) for offset in offsets]
+        ).reshape(len(days), 4, MINUTES_PER_SESSION)
+        close_2d = day_open[:, None] * np.exp(np.cumsum(MINUTE_VOLATILITY * noise[:, 0], axis=1))
+        open_ = np.concatenate([day_open[:, None], close_2d[:, :-1]], axis=1).ravel()
+        close = close_2d.ravel()
+        wicks = np.abs(MINUTE_VOLATILITY * WICK_SCALE * noise[:, 1:3]).transpose(1, 0, 2).reshape(2, -1)
+        volume_noise = np.exp(VOLUME_NOISE * noise[:, 3]).ravel()
+        volume_shape = np.tile(_VOLUME_PROFILE, len(days)) / MINUTES_PER_SESSION
+    elif interval == INTERVAL_DAY:
+        timestamps = days.astype("datetime64[m]")
+        open_, close = day_open, day_close
+        wicks = np.abs(_stream(symbol, seed, 0, 1).normal(0.0, DAILY_VOLATILITY * WICK_SCALE, (span, 2))[offsets].T)
+        volume_noise = _stream(symbol, seed, 0, 2).lognormal(0.0, VOLUME_NOISE, span)[offsets]
+        volume_shape = np.ones(len(days))
+    else:
+        raise ValueError(f"Unsupported mock interval: {interval}")
+
+    high = np.maximum(open_, close) * (1.0 + wicks[0])
+    low = np.minimum(open_, close) * (1.0 - wicks[1])
+    volume = (base_volume * volume_shape * volume_noise).astype(np.int64)
+
+    mask = (timestamps >= np.datetime64(start, "m")) & (timestamps <= np.datetime64(end, "m"))
+    return MockCandles(
+        timestamp=timestamps[mask],
+        open=np.round(open_[mask], 2),
+        high=np.round(high[mask], 2),
+        low=np.round(low[mask], 2),
+        close=np.round(close[mask], 2),
+        volume=volume[mask],
+    )
+
+def get_mock_historical_data(
+    symbol: str,
+    from_date: datetime,
+    to_date: datetime,
+    interval: str = INTERVAL_DAY,
+    seed: int = 0
+) -> dict:
+    """Mock historical data in the Kite API response format"""
+    candles = generate_candles(symbol, from_date, to_date, interval=interval, seed=seed)
     return {
         "status": "success",
         "data": {
-            "candles": candles
+            "candles": candles.to_kite_candles()
         }
-    } 
\ No newline at end of file
+    }
@@ -1,37 +1,65 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 import asyncio
+import numpy as np
 from loguru import logger
-from .mock_data import get_mock_historical_data
-from ..domain.models import StockData
+from ..config.settings import settings
+from .mock_data import MockCandles, generate_candles
+from .zerodha import HistoricalData
+
+class MockZerodhaError(Exception):
+    """Injected failure, standing in for a Zerodha API error"""
 
 class MockZerodhaClient:
-    def __init__(self):
-        pass
-    
-    async def fetch_historical_data(self, symbol: str, from_date: datetime, to_date: datetime) -> List[StockData]:
+    def __init__(
+        self,
+        latency_seconds: Optional[float] = None,
+        error_rate: Optional[float] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            latency_seconds: Simulated API latency per call
+            error_rate: Fraction of calls that raise MockZerodhaError
+            seed: Seed for the generated prices and injected errors
+        """
+        self.latency_seconds = settings.MOCK_ZERODHA_LATENCY_SECONDS if latency_seconds is None else latency_seconds
+        self.error_rate = settings.MOCK_ZERODHA_ERROR_RATE if error_rate is None else error_rate
+        self.seed = settings.MOCK_DATA_SEED if seed is None else seed
+        self._errors = np.random.default_rng(self.seed)
+
+    async def fetch_candles(
+        self,
+        symbol: str,
+        from_date: datetime,
+        to_date: datetime,
+        interval: str = "day"
+    ) -> MockCandles:
+        """Columnar candles, for load tests that do not need row objects"""
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        if self.error_rate and self._errors.random() < self.error_rate:
+            raise MockZerodhaError(f"Injected error fetching {symbol}")
+        return generate_candles(symbol, from_date, to_date, interval=interval, seed=self.seed)
+
+    async def fetch_historical_data(
+        self,
+        symbol: str,
+        from_date: datetime,
+        to_date: datetime,
+        interval: str = "day"
+    ) -> List[HistoricalData]:
         try:
-            logger.info(f"Fetching mock data for {symbol} from {from_date} to {to_date}")
-            
-            # Get mock data
-            response = get_mock_historical_data(symbol, from_date, to_date)
-            data = response["data"]["candles"]
-            
-            # Simulate API delay
-            await asyncio.sleep(0.5)
-            
+            logger.debug("Fetching mock data for {} from {} to {}", symbol, from_date, to_date)
+            candles = await self.fetch_candles(symbol, from_date, to_date, interval)
             return [
-                StockData(
-                    symbol=symbol,
-                    timestamp=datetime.fromisoformat(record[0].replace("+0530", "")),
-                    open=float(record[1]),
-                    high=float(record[2]),
-                    low=float(record[3]),
-                    close=float(record[4]),
-                    volume=int(record[5])
-                ) for record in data
+                HistoricalData(timestamp=ts, open=o, high=h, low=l, close=c, volume=v)
+                for ts, o, h, l, c, v in zip(
+                    candles.timestamp.astype("datetime64[us]").tolist(),
+                    candles.open.tolist(), candles.high.tolist(), candles.low.tolist(),
+                    candles.close.tolist(), candles.volume.tolist()
+                )
             ]
-            
         except Exception as e:
             logger.error(f"Error generating mock data: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
@@ -0,0 +1,68 @@
+from datetime import date, datetime
+from typing import List, Optional, Sequence
+from sqlalchemy import select, delete, insert, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+from ..domain.models import RelativeStrengthResult
+from ..domain.relative_strength import RelativeStrength
+
+INSERT_BATCH_SIZE = 1000  # Rows per INSERT, well under the bind parameter limit
+
+class RelativeStrengthRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def replace_rankings(self, run_date: date, rankings: List[RelativeStrength]) -> int:
+        """Replace the rankings for a run date, in one transaction"""
+        try:
+            await self.db.execute(delete(RelativeStrengthResult).where(RelativeStrengthResult.run_date == run_date))
+            now = datetime.utcnow()
+            rows = [
+                {
+                    "run_date": run_date,
+                    "symbol": rs.symbol,
+                    "rank": rank,
+                    "rating": rs.rating,
+                    "score": rs.score,
+                    "close": rs.close,
+                    "ratios": {str(w): v for w, v in rs.ratios.items()},
+                    "ranks": {str(w): v for w, v in rs.ranks.items()},
+                    "created_at": now
+                }
+                for rank, rs in enumerate(rankings, start=1)
+            ]
+            for i in range(0, len(rows), INSERT_BATCH_SIZE):
+                await self.db.execute(insert(RelativeStrengthResult), rows[i:i + INSERT_BATCH_SIZE])
+            await self.db.commit()
+            return len(rows)
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error storing relative strength for {run_date}: {str(e)}")
+            raise
+
+    async def get_rankings(
+        self,
+        run_date: Optional[date] = None,
+        limit: int = 100,
+        min_rating: Optional[int] = None,
+        symbols: Optional[Sequence[str]] = None
+    ) -> List[RelativeStrengthResult]:
+        """Ranked results for a run date, defaulting to the latest run"""
+        try:
+            if run_date is None:
+                result = await self.db.execute(select(func.max(RelativeStrengthResult.run_date)))
+                run_date = result.scalar_one_or_none()
+                if run_date is None:
+                    return []
+
+            query = select(RelativeStrengthResult).where(RelativeStrengthResult.run_date == run_date)
+            if min_rating is not None:
+                query = query.where(RelativeStrengthResult.rating >= min_rating)
+            if symbols:
+                query = query.where(RelativeStrengthResult.symbol.in_(list(symbols)))
+            result = await self.db.execute(query.order_by(RelativeStrengthResult.rank).limit(limit))
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error(f"Error getting relative strength rankings: {str(e)}")
+            raise
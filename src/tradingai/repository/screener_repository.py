@@ -0,0 +1,57 @@
+from datetime import date, datetime
+from typing import List, Optional
+from sqlalchemy import select, delete, insert, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+from ..domain.models import ScreenerResult
+from ..domain.screener import ScreenCandidate
+
+class ScreenerRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def replace_shortlist(self, run_date: date, candidates: List[ScreenCandidate]) -> int:
+        """Replace the shortlist for a run date with the ranked candidates"""
+        try:
+            await self.db.execute(delete(ScreenerResult).where(ScreenerResult.run_date == run_date))
+            if candidates:
+                now = datetime.utcnow()
+                await self.db.execute(insert(ScreenerResult).values([
+                    {
+                        "run_date": run_date,
+                        "symbol": candidate.symbol,
+                        "rank": rank,
+                        "score": candidate.score,
+                        "close": candidate.close,
+                        "sma_30_week": candidate.sma_30_week,
+                        "macd_histogram": candidate.macd_histogram,
+                        "volume_ratio": candidate.volume_ratio,
+                        "created_at": now
+                    }
+                    for rank, candidate in enumerate(candidates, start=1)
+                ]))
+            await self.db.commit()
+            return len(candidates)
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error storing shortlist for {run_date}: {str(e)}")
+            raise
+
+    async def get_shortlist(self, run_date: Optional[date] = None) -> List[ScreenerResult]:
+        """Get the ranked shortlist for a run date, defaulting to the latest run"""
+        try:
+            if run_date is None:
+                result = await self.db.execute(select(func.max(ScreenerResult.run_date)))
+                run_date = result.scalar_one_or_none()
+                if run_date is None:
+                    return []
+            
+            query = select(ScreenerResult).where(
+                ScreenerResult.run_date == run_date
+            ).order_by(ScreenerResult.rank)
+            result = await self.db.execute(query)
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error(f"Error getting shortlist: {str(e)}")
+            raise
@@ -0,0 +1,176 @@
+import csv
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from sqlalchemy import select, delete, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+from ..domain.models import Instrument, MarketBreadthResult, SectorPerformanceResult
+from ..domain.sector_analysis import MarketBreadth, SectorPerformance, SectorSnapshot
+from ..domain.symbol_index import INDICES_SEGMENT
+
+# Header names accepted for the symbol and sector columns, compared case-insensitively
+_SYMBOL_HEADERS = ("symbol", "tradingsymbol")
+_SECTOR_HEADERS = ("industry", "sector")
+
+# One statement for the whole map; unnest pairs the two arrays row by row
+_UPDATE_SECTORS = text("""
+    UPDATE instruments i SET sector = m.sector, updated_at = now()
+    FROM (
+        SELECT unnest(CAST(:symbols AS VARCHAR[])) AS symbol,
+               unnest(CAST(:sectors AS VARCHAR[])) AS sector
+    ) m
+    WHERE i.tradingsymbol = m.symbol
+      AND i.exchange = :exchange
+      AND i.sector IS DISTINCT FROM m.sector
+""")
+
+def load_sector_map(path: str) -> Dict[str, str]:
+    """
+    Symbol -> sector from a CSV such as NSE's index constituent lists
+    (Company Name, Industry, Symbol, Series, ISIN Code)
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        headers = {name.strip().lower(): name for name in reader.fieldnames or []}
+        symbol_column = next((headers[h] for h in _SYMBOL_HEADERS if h in headers), None)
+        sector_column = next((headers[h] for h in _SECTOR_HEADERS if h in headers), None)
+        if symbol_column is None or sector_column is None:
+            raise ValueError(f"{path} needs a Symbol and an Industry or Sector column")
+        return {
+            row[symbol_column].strip(): row[sector_column].strip()
+            for row in reader
+            if row[symbol_column] and row[sector_column] and row[sector_column].strip()
+        }
+
+def _to_breadth(row: MarketBreadthResult) -> MarketBreadth:
+    return MarketBreadth(
+        symbols=row.symbols,
+        advancers=row.advancers,
+        decliners=row.decliners,
+        unchanged=row.unchanged,
+        advance_decline_ratio=row.advance_decline_ratio,
+        pct_above_sma_50=row.pct_above_sma_50,
+        new_highs=row.new_highs,
+        new_lows=row.new_lows,
+        benchmark_returns={int(w): v for w, v in (row.benchmark_returns or {}).items()}
+    )
+
+def _to_sector(row: SectorPerformanceResult) -> SectorPerformance:
+    return SectorPerformance(
+        sector=row.sector,
+        rank=row.rank,
+        symbols=row.symbols,
+        returns={int(w): v for w, v in row.returns.items()},
+        advancers=row.advancers,
+        decliners=row.decliners,
+        advance_ratio=row.advance_ratio,
+        pct_above_sma_50=row.pct_above_sma_50,
+        momentum=row.momentum
+    )
+
+class SectorRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def update_sectors(self, sectors: Dict[str, str], exchange: str = "NSE") -> int:
+        """Set instrument sectors from a symbol -> sector map; returns the rows changed"""
+        if not sectors:
+            return 0
+        try:
+            result = await self.db.execute(_UPDATE_SECTORS, {
+                "symbols": list(sectors.keys()),
+                "sectors": list(sectors.values()),
+                "exchange": exchange
+            })
+            await self.db.commit()
+            return result.rowcount
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error updating instrument sectors: {str(e)}")
+            raise
+
+    async def get_symbol_sectors(self, exchange: str = "NSE", instrument_type: str = "EQ") -> Dict[str, str]:
+        """Symbol -> sector for instruments that have one"""
+        try:
+            result = await self.db.execute(
+                select(Instrument.tradingsymbol, Instrument.sector).where(
+                    Instrument.exchange == exchange,
+                    Instrument.instrument_type == instrument_type,
+                    Instrument.segment.is_distinct_from(INDICES_SEGMENT),
+                    Instrument.sector.is_not(None)
+                )
+            )
+            return {symbol: sector for symbol, sector in result.all()}
+        except Exception as e:
+            logger.error(f"Error getting instrument sectors: {str(e)}")
+            raise
+
+    async def replace_snapshot(self, run_date: date, sectors: List[SectorPerformance], breadth: MarketBreadth) -> None:
+        """Replace a run date's sector table and breadth, in one transaction"""
+        try:
+            await self.db.execute(delete(SectorPerformanceResult).where(SectorPerformanceResult.run_date == run_date))
+            await self.db.execute(delete(MarketBreadthResult).where(MarketBreadthResult.run_date == run_date))
+            now = datetime.utcnow()
+            if sectors:
+                await self.db.execute(insert(SectorPerformanceResult), [
+                    {
+                        "run_date": run_date,
+                        "sector": s.sector,
+                        "rank": s.rank,
+                        "symbols": s.symbols,
+                        "returns": {str(w): v for w, v in s.returns.items()},
+                        "advancers": s.advancers,
+                        "decliners": s.decliners,
+                        "advance_ratio": s.advance_ratio,
+                        "pct_above_sma_50": s.pct_above_sma_50,
+                        "momentum": s.momentum,
+                        "created_at": now
+                    }
+                    for s in sectors
+                ])
+            await self.db.execute(insert(MarketBreadthResult).values(
+                run_date=run_date,
+                symbols=breadth.symbols,
+                advancers=breadth.advancers,
+                decliners=breadth.decliners,
+                unchanged=breadth.unchanged,
+                advance_decline_ratio=breadth.advance_decline_ratio,
+                pct_above_sma_50=breadth.pct_above_sma_50,
+                new_highs=breadth.new_highs,
+                new_lows=breadth.new_lows,
+                benchmark_returns={str(w): v for w, v in breadth.benchmark_returns.items()},
+                created_at=now
+            ))
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error storing sector performance for {run_date}: {str(e)}")
+            raise
+
+    async def get_snapshot(self, run_date: Optional[date] = None) -> Optional[SectorSnapshot]:
+        """Sector table, breadth and symbol sectors for a run date, defaulting to the latest run"""
+        try:
+            query = select(MarketBreadthResult)
+            if run_date is not None:
+                query = query.where(MarketBreadthResult.run_date == run_date)
+            result = await self.db.execute(query.order_by(MarketBreadthResult.run_date.desc()).limit(1))
+            rows = result.scalars().all()
+            if not rows:
+                return None
+            breadth = rows[0]
+
+            result = await self.db.execute(
+                select(SectorPerformanceResult).where(
+                    SectorPerformanceResult.run_date == breadth.run_date
+                ).order_by(SectorPerformanceResult.rank)
+            )
+            return SectorSnapshot(
+                run_date=breadth.run_date,
+                breadth=_to_breadth(breadth),
+                sectors=[_to_sector(row) for row in result.scalars().all()],
+                symbol_sectors=await self.get_symbol_sectors()
+            )
+        except Exception as e:
+            logger.error(f"Error getting sector snapshot: {str(e)}")
+            raise
@@ -1,27 +1,47 @@
 from datetime import datetime, timedelta
+from typing import List, Sequence
 import pandas as pd
 from sqlalchemy import select, and_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..domain.models import StockData
+from ..domain.bar_builder import Bar
+from ..domain.corporate_actions import AdjustmentCache, get_adjustment_cache
+from ..metrics import DB_QUERY_SECONDS, DATAFRAME_BUILD_SECONDS
 from loguru import logger
 import pytz
 
+from .corporate_action_repository import CorporateActionRepository
+
 class StockRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
+    
+    async def _adjustments(self) -> AdjustmentCache:
+        """Process-wide corporate action factors, reloading them once the cache goes stale"""
+        cache = get_adjustment_cache()
+        if cache.is_stale():
+            with DB_QUERY_SECONDS.time(query="corporate_actions"):
+                cache.load(await CorporateActionRepository(self.db).get_all_factors())
+        return cache
         
     async def get_stock_data(
         self, 
         symbol: str, 
         lookback_days: int = 365,
-        ensure_latest: bool = True
+        ensure_latest: bool = True,
+        adjusted: bool = True
     ) -> pd.DataFrame:
-        """Get stock data from database"""
+        """
+        Get stock data from database
+        Args:
+            adjusted: Scale bars before splits and bonuses to the current share basis
+        """
         try:
             end_date = datetime.now(pytz.UTC)
             start_date = end_date - timedelta(days=lookback_days)
             
-            logger.info(f"Fetching data for {symbol} from {start_date} to {end_date}")
+            logger.debug("Fetching data for {} from {} to {}", symbol, start_date, end_date)
             
             # Get data
             query = select(StockData).where(
@@ -32,32 +52,36 @@ class StockRepository:
                 )
             ).order_by(StockData.timestamp.desc())
             
-            # Debug query
-            logger.debug(f"Query: {query}")
+            # Compiling the statement is expensive, only do it when DEBUG is on
+            logger.opt(lazy=True).debug("Query: {}", lambda: str(query))
             
-            result = await self.db.execute(query)
-            records = result.scalars().all()
+            with DB_QUERY_SECONDS.time(query="stock_data"):
+                result = await self.db.execute(query)
+                records = result.scalars().all()
             
             # Log record count
-            logger.info(f"Found {len(records) if records else 0} records for {symbol}")
+            logger.debug("Found {} records for {}", len(records), symbol)
             
             if not records:
                 logger.warning(f"No data found in DB for {symbol}")
                 return pd.DataFrame()
                 
             # Convert to dataframe
-            df = pd.DataFrame([{
-                'timestamp': r.timestamp,
-                'open': r.open,
-                'high': r.high,
-                'low': r.low,
-                'close': r.close,
-                'volume': r.volume
-            } for r in records])
+            with DATAFRAME_BUILD_SECONDS.time(source="stock_data"):
+                df = pd.DataFrame([{
+                    'timestamp': r.timestamp,
+                    'open': r.open,
+                    'high': r.high,
+                    'low': r.low,
+                    'close': r.close,
+                    'volume': r.volume
+                } for r in records])
             
             # Log dataframe info
-            logger.info(f"DataFrame shape: {df.shape}")
-            logger.info(f"Date range: {df['timestamp'].min()} to {df['timestamp'].max()}")
+            logger.opt(lazy=True).debug(
+                "DataFrame shape: {}, date range: {} to {}",
+                lambda: df.shape, lambda: df['timestamp'].min(), lambda: df['timestamp'].max()
+            )
             
             if ensure_latest:
                 # Check if latest data is from today or yesterday (for market holidays)
@@ -71,9 +95,100 @@ class StockRepository:
             df.set_index('timestamp', inplace=True)
             df.sort_index(inplace=True)
             
+            if adjusted:
+                (await self._adjustments()).adjust_frame(symbol, df)
+            
             return df
             
         except Exception as e:
             logger.error(f"Error getting stock data for {symbol}: {str(e)}")
             logger.exception("Full traceback:")
-            raise 
\ No newline at end of file
+            raise 
+
+    async def get_stock_panel(
+        self,
+        symbols: List[str],
+        lookback_days: int = 365,
+        adjusted: bool = True
+    ) -> pd.DataFrame:
+        """
+        Get stock data for many symbols in a single query
+        Args:
+            adjusted: Scale bars before splits and bonuses to the current share basis
+        Returns:
+            Long-format DataFrame with symbol, timestamp and OHLCV columns
+        """
+        try:
+            end_date = datetime.now(pytz.UTC)
+            start_date = end_date - timedelta(days=lookback_days)
+            
+            # Select columns rather than ORM objects to avoid per-row object construction
+            query = select(
+                StockData.symbol,
+                StockData.timestamp,
+                StockData.open,
+                StockData.high,
+                StockData.low,
+                StockData.close,
+                StockData.volume
+            ).where(
+                and_(
+                    StockData.symbol.in_(symbols),
+                    StockData.timestamp >= start_date,
+                    StockData.timestamp <= end_date
+                )
+            ).order_by(StockData.symbol, StockData.timestamp)
+            
+            with DB_QUERY_SECONDS.time(query="stock_panel"):
+                result = await self.db.execute(query)
+                rows = result.all()
+            with DATAFRAME_BUILD_SECONDS.time(source="stock_panel"):
+                panel = pd.DataFrame(
+                    rows,
+                    columns=['symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume']
+                )
+            if adjusted:
+                (await self._adjustments()).adjust_panel(panel)
+            return panel
+            
+        except Exception as e:
+            logger.error(f"Error getting stock panel for {len(symbols)} symbols: {str(e)}")
+            raise
+
+    async def store_bars(self, bars: Sequence[Bar]) -> int:
+        """
+        Insert completed bars, skipping any (symbol, timestamp) already stored.
+        The unique index decides, so bars written concurrently by ingestion
+        are skipped rather than duplicated.
+        Returns:
+            Number of rows inserted
+        """
+        if not bars:
+            return 0
+        try:
+            created_at = datetime.now(pytz.UTC)
+            values = [
+                {
+                    "symbol": bar.symbol,
+                    "timestamp": bar.timestamp,
+                    "open": bar.open,
+                    "high": bar.high,
+                    "low": bar.low,
+                    "close": bar.close,
+                    "volume": bar.volume,
+                    "created_at": created_at
+                }
+                for bar in bars
+            ]
+            query = insert(StockData).values(values).on_conflict_do_nothing(
+                index_elements=[StockData.symbol, StockData.timestamp]
+            )
+            with DB_QUERY_SECONDS.time(query="insert_bars"):
+                result = await self.db.execute(query)
+            await self.db.commit()
+            logger.debug("Stored {} of {} bars", result.rowcount, len(bars))
+            return result.rowcount
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error storing {len(bars)} bars: {str(e)}")
+            raise
@@ -0,0 +1,169 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set
+import pytz
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import distinct_on
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+from ..config.settings import settings
+from ..domain.llm_trade import TradeDecision, TradingSignal
+from ..domain.models import TradingSignalRecord
+from .database import AsyncWriteSessionLocal
+
+def signal_row(
+    symbol: str,
+    signal: TradingSignal,
+    current_price: Optional[float] = None,
+    as_of: Optional[datetime] = None,
+    model_name: Optional[str] = None
+) -> Dict:
+    """trading_signals row for a decision, stamped with the current time"""
+    return {
+        "symbol": symbol,
+        "decision": signal.decision.value,
+        "entry_price": signal.entry_price,
+        "stop_loss": signal.stop_loss,
+        "allocation_percentage": signal.allocation_percentage,
+        "reasoning": list(signal.reasoning),
+        "current_price": current_price,
+        "as_of": as_of,
+        "model_name": model_name,
+        "created_at": datetime.now(pytz.UTC)
+    }
+
+def record_to_signal(record: TradingSignalRecord) -> TradingSignal:
+    return TradingSignal(
+        decision=TradeDecision(record.decision),
+        entry_price=record.entry_price,
+        stop_loss=record.stop_loss,
+        allocation_percentage=record.allocation_percentage,
+        reasoning=list(record.reasoning or [])
+    )
+
+class TradeRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def store_signals(self, rows: Sequence[Dict]) -> int:
+        """Insert signal rows built by signal_row in one statement"""
+        if not rows:
+            return 0
+        try:
+            await self.db.execute(insert(TradingSignalRecord), list(rows))
+            await self.db.commit()
+            return len(rows)
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error storing {len(rows)} trading signals: {str(e)}")
+            raise
+
+    async def store_signal(self, symbol: str, signal: TradingSignal, **kwargs) -> None:
+        """Store one signal immediately; prefer SignalWriter on request paths"""
+        await self.store_signals([signal_row(symbol, signal, **kwargs)])
+
+    async def get_latest_signals(self, symbols: Sequence[str]) -> Dict[str, TradingSignalRecord]:
+        """
+        Latest signal per symbol in one query: DISTINCT ON (symbol) walks the
+        (symbol, created_at) index backwards
+        """
+        if not symbols:
+            return {}
+        try:
+            query = select(TradingSignalRecord).where(
+                TradingSignalRecord.symbol.in_(list(symbols))
+            ).order_by(
+                TradingSignalRecord.symbol, TradingSignalRecord.created_at.desc()
+            ).ext(distinct_on(TradingSignalRecord.symbol))
+            result = await self.db.execute(query)
+            return {record.symbol: record for record in result.scalars().all()}
+        except Exception as e:
+            logger.error(f"Error getting latest signals for {len(symbols)} symbols: {str(e)}")
+            raise
+
+    async def get_signal_history(self, symbol: str, limit: int = 20) -> List[TradingSignalRecord]:
+        """Most recent signals for a symbol, newest first"""
+        try:
+            query = select(TradingSignalRecord).where(
+                TradingSignalRecord.symbol == symbol
+            ).order_by(TradingSignalRecord.created_at.desc()).limit(limit)
+            result = await self.db.execute(query)
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error(f"Error getting signal history for {symbol}: {str(e)}")
+            raise
+
+class SignalWriter:
+    """
+    Buffers signal rows and writes them in batches from a background task,
+    so request handlers never wait on the insert. Rows are flushed when the
+    buffer reaches batch_size or flush_seconds after the first buffered row.
+    Buffered rows are visible through `pending_latest` until written.
+    """
+
+    def __init__(
+        self,
+        session_factory=AsyncWriteSessionLocal,
+        batch_size: int = settings.SIGNAL_BATCH_SIZE,
+        flush_seconds: float = settings.SIGNAL_FLUSH_SECONDS
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._rows: List[Dict] = []
+        self._latest: Dict[str, TradingSignalRecord] = {}
+        self._timer: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()  # Strong references until done
+        self._lock = asyncio.Lock()
+
+    def add(self, row: Dict) -> None:
+        """Buffer a row from signal_row; must be called from the event loop"""
+        self._rows.append(row)
+        self._latest[row["symbol"]] = TradingSignalRecord(**row)
+        if len(self._rows) >= self.batch_size:
+            task = asyncio.get_running_loop().create_task(self.flush())
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.get_running_loop().create_task(self._flush_later())
+
+    def pending_latest(self, symbol: str) -> Optional[TradingSignalRecord]:
+        """Newest buffered, not yet written, signal for a symbol"""
+        return self._latest.get(symbol)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_seconds)
+        # Shielded so close() cancelling the timer cannot interrupt a write
+        await asyncio.shield(self.flush())
+
+    async def flush(self) -> int:
+        """Write all buffered rows; a failed batch and the rest stay buffered and are retried"""
+        async with self._lock:
+            rows, self._rows = self._rows, []
+            stored = 0
+            for i in range(0, len(rows), self.batch_size):
+                batch = rows[i:i + self.batch_size]
+                try:
+                    async with self.session_factory() as db:
+                        stored += await TradeRepository(db).store_signals(batch)
+                except Exception as e:
+                    logger.error(f"Failed to store {len(rows) - i} trading signals, will retry: {str(e)}")
+                    self._rows = rows[i:] + self._rows
+                    self._timer = asyncio.get_running_loop().create_task(self._flush_later())
+                    break
+            for row in rows[:stored]:
+                pending = self._latest.get(row["symbol"])
+                if pending is not None and pending.created_at == row["created_at"]:
+                    del self._latest[row["symbol"]]
+            if stored:
+                logger.debug("Stored {} trading signals", stored)
+            return stored
+
+    async def close(self) -> None:
+        """Cancel the timer and write whatever is buffered"""
+        if self._timer is not None:
+            self._timer.cancel()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        await self.flush()
@@ -3,23 +3,21 @@ from typing import List, Optional
 import asyncio
 import aiohttp
 from tenacity import retry, stop_after_attempt, wait_exponential
-from ratelimit import limits, sleep_and_retry
 from loguru import logger
 from kiteconnect import KiteConnect
 from ..domain.models import StockData
 from ..config.settings import settings
-from ..service.instrument_service import InstrumentService
+from ..service.instrument_service import InstrumentService, get_symbol_index
+from .database import AsyncSessionLocal
+from .instrument_repository import InstrumentRepository
+from .rate_limiter import AsyncRateLimiter
+from ..metrics import ZERODHA_REQUEST_SECONDS, ZERODHA_RATE_LIMIT_WAIT_SECONDS
 from dataclasses import dataclass
 
 ONE_MINUTE = 60
 MAX_CALLS_PER_MINUTE = 60  # Zerodha's rate limit
 CHUNK_SIZE_DAYS = 365  # Process 1 year at a time
 
-@sleep_and_retry
-@limits(calls=MAX_CALLS_PER_MINUTE, period=ONE_MINUTE)
-def call_api():
-    return True
-
 @dataclass
 class HistoricalData:
     timestamp: datetime
@@ -30,17 +28,47 @@ class HistoricalData:
     volume: int
 
 class ZerodhaClient:
-    def __init__(self, instrument_service: InstrumentService):
-        self.base_url = "https://api.kite.trade"
+    def __init__(
+        self,
+        instrument_service: Optional[InstrumentService] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        rate_limiter: Optional[AsyncRateLimiter] = None
+    ):
+        """
+        Args:
+            instrument_service: Token lookup; when omitted the process-wide symbol index
+                is used, loaded or backed by the instruments table on a miss
+            session: Shared HTTP session; a session per request is opened when omitted
+            rate_limiter: Shared limiter so all clients respect one API budget
+        """
+        self.base_url = settings.ZERODHA_BASE_URL
         self.api_key = settings.ZERODHA_API_KEY
         self.instrument_service = instrument_service
+        self.session = session
+        self.rate_limiter = rate_limiter or AsyncRateLimiter(MAX_CALLS_PER_MINUTE, ONE_MINUTE)
+
+    async def _get_instrument_token(self, symbol: str) -> Optional[int]:
+        if self.instrument_service is not None:
+            return await self.instrument_service.get_instrument_token(symbol)
+        index = get_symbol_index()
+        token = index.get_token(symbol) if index is not None else None
+        if token is not None:
+            return token
+        # No index loaded in this process yet, or it predates the last sync
+        async with AsyncSessionLocal() as db:
+            return await InstrumentService(db, InstrumentRepository()).get_instrument_token(symbol)
+
+    async def _get_json(self, session: aiohttp.ClientSession, url: str, params: dict, headers: dict) -> dict:
+        async with session.get(url, params=params, headers=headers) as response:
+            if response.status != 200:
+                error_data = await response.json()
+                raise Exception(f"Failed to fetch historical data: {error_data}")
+            return await response.json()
         
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10)
     )
-    @sleep_and_retry
-    @limits(calls=MAX_CALLS_PER_MINUTE, period=ONE_MINUTE)
     async def fetch_historical_data(
         self, 
         symbol: str, 
@@ -60,7 +88,7 @@ class ZerodhaClient:
         """
         try:
             # Get instrument token
-            instrument_token = await self.instrument_service.get_instrument_token(symbol)
+            instrument_token = await self._get_instrument_token(symbol)
             if not instrument_token:
                 raise ValueError(f"Instrument token not found for symbol: {symbol}")
 
@@ -80,36 +108,37 @@ class ZerodhaClient:
                 "Authorization": f"token {self.api_key}:{settings.ZERODHA_ACCESS_TOKEN}"
             }
             
-            logger.debug(f"Fetching historical data for {symbol} from {from_str} to {to_str}")
+            logger.debug("Fetching historical data for {} from {} to {}", symbol, from_str, to_str)
+            
+            with ZERODHA_RATE_LIMIT_WAIT_SECONDS.time():
+                await self.rate_limiter.acquire()
+            with ZERODHA_REQUEST_SECONDS.time(endpoint="historical"):
+                if self.session is not None:
+                    data = await self._get_json(self.session, url, params, headers)
+                else:
+                    async with aiohttp.ClientSession() as session:
+                        data = await self._get_json(session, url, params, headers)
+            
+            if data["status"] != "success":
+                raise Exception(f"API returned error: {data}")
+            
+            # Convert candles to HistoricalData objects
+            historical_data = []
+            for candle in data["data"]["candles"]:
+                timestamp = datetime.fromisoformat(candle[0].replace("+0530", ""))
+                historical_data.append(
+                    HistoricalData(
+                        timestamp=timestamp,
+                        open=float(candle[1]),
+                        high=float(candle[2]),
+                        low=float(candle[3]),
+                        close=float(candle[4]),
+                        volume=int(candle[5])
+                    )
+                )
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, headers=headers) as response:
-                    if response.status != 200:
-                        error_data = await response.json()
-                        raise Exception(f"Failed to fetch historical data: {error_data}")
-                    
-                    data = await response.json()
-                    
-                    if data["status"] != "success":
-                        raise Exception(f"API returned error: {data}")
-                    
-                    # Convert candles to HistoricalData objects
-                    historical_data = []
-                    for candle in data["data"]["candles"]:
-                        timestamp = datetime.fromisoformat(candle[0].replace("+0530", ""))
-                        historical_data.append(
-                            HistoricalData(
-                                timestamp=timestamp,
-                                open=float(candle[1]),
-                                high=float(candle[2]),
-                                low=float(candle[3]),
-                                close=float(candle[4]),
-                                volume=int(candle[5])
-                            )
-                        )
-                    
-                    logger.info(f"Fetched {len(historical_data)} candles for {symbol}")
-                    return historical_data
+            logger.debug("Fetched {} candles for {}", len(historical_data), symbol)
+            return historical_data
             
         except Exception as e:
             logger.error(f"Error fetching historical data for {symbol}: {str(e)}")
@@ -7,7 +7,7 @@ from ..config.settings import settings
 
 class ZerodhaAuthRepository:
     def __init__(self):
-        self.base_url = "https://api.kite.trade"
+        self.base_url = settings.ZERODHA_BASE_URL
         self.login_url = "https://kite.zerodha.com/connect/login"
         self.api_key = settings.ZERODHA_API_KEY
         self.api_secret = settings.ZERODHA_API_SECRET
@@ -1,12 +1,18 @@
+from typing import Optional, Union
+import aiohttp
 from loguru import logger
 from ..config.settings import settings
+from .rate_limiter import AsyncRateLimiter
 from .zerodha import ZerodhaClient
 from .mock_zerodha import MockZerodhaClient
 
-def get_zerodha_client():
+def get_zerodha_client(
+    session: Optional[aiohttp.ClientSession] = None,
+    rate_limiter: Optional[AsyncRateLimiter] = None
+) -> Union[ZerodhaClient, MockZerodhaClient]:
     if settings.USE_MOCK_ZERODHA:
         logger.info("Using Mock Zerodha Client")
         return MockZerodhaClient()
     else:
         logger.info("Using Real Zerodha Client")
-        return ZerodhaClient() 
\ No newline at end of file
+        return ZerodhaClient(session=session, rate_limiter=rate_limiter)
@@ -0,0 +1,85 @@
+import asyncio
+from collections import deque
+from typing import Deque, Iterable, List, Optional, Set
+
+from ..config.settings import settings
+from ..domain.signal_evaluator import Alert
+from ..metrics import ALERTS_DROPPED, SIGNAL_ALERTS
+
+RECENT_ALERTS = 500
+
+class Subscription:
+    """One subscriber's alert queue, optionally filtered by symbol and rule"""
+
+    def __init__(self, queue_size: int, symbols: Optional[Set[str]] = None, rules: Optional[Set[str]] = None):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.symbols = symbols or None
+        self.rules = rules or None
+        self.dropped = 0
+
+    def wants(self, alert: Alert) -> bool:
+        return (self.symbols is None or alert.symbol in self.symbols) and \
+            (self.rules is None or alert.rule in self.rules)
+
+    def offer(self, alert: Alert) -> None:
+        """Enqueue without blocking; a full queue loses its oldest alert"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            ALERTS_DROPPED.inc()
+        self.queue.put_nowait(alert)
+
+    async def get(self) -> Alert:
+        return await self.queue.get()
+
+class AlertBroker:
+    """
+    Fans alerts out to WebSocket/SSE subscribers. Publishing never waits on a
+    subscriber, so a slow client cannot stall the ticker loop.
+    """
+
+    def __init__(self, queue_size: int = settings.ALERT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscriptions: List[Subscription] = []
+        self._recent: Deque[Alert] = deque(maxlen=RECENT_ALERTS)
+
+    def subscribe(self, symbols: Optional[Iterable[str]] = None, rules: Optional[Iterable[str]] = None) -> Subscription:
+        subscription = Subscription(
+            self.queue_size,
+            set(symbols) if symbols else None,
+            set(rules) if rules else None
+        )
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def publish(self, alerts: List[Alert]) -> None:
+        for alert in alerts:
+            SIGNAL_ALERTS.inc(rule=alert.rule)
+            self._recent.append(alert)
+            for subscription in self._subscriptions:
+                if subscription.wants(alert):
+                    subscription.offer(alert)
+
+    def recent(self, limit: int = RECENT_ALERTS) -> List[Alert]:
+        """Most recent alerts, oldest first"""
+        return list(self._recent)[-limit:] if limit else []
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+_alert_broker: Optional[AlertBroker] = None
+
+def get_alert_broker() -> AlertBroker:
+    global _alert_broker
+    if _alert_broker is None:
+        _alert_broker = AlertBroker()
+    return _alert_broker
+
+def set_alert_broker(broker: Optional[AlertBroker]) -> None:
+    global _alert_broker
+    _alert_broker = broker
@@ -1,26 +1,19 @@
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .market_service import MarketService
 from .stock_service import StockService
 from ..repository.zerodha import ZerodhaClient
-from ..repository.instrument_repository import InstrumentRepository
-from ..service.instrument_service import InstrumentService
 from ..domain.market_analysis import MarketCondition
 from ..domain.stock_analysis import StockAnalysis
 
 class AnalysisService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, stock_service: Optional[StockService] = None):
         self.db = db
-        # Initialize required services
-        instrument_repo = InstrumentRepository()
-        instrument_service = InstrumentService(db, instrument_repo)
-        zerodha_client = ZerodhaClient(instrument_service)
-        
         self.market_service = MarketService(db)
-        self.stock_service = StockService(db, zerodha_client)
+        self.stock_service = stock_service or StockService(db, ZerodhaClient())
     
     async def analyze_stock(self, symbol: str) -> Dict:
         """
@@ -64,7 +57,11 @@ class AnalysisService:
                         "ema_30": stock_analysis.volume_ema_30,
                         "increase_pct": stock_analysis.volume_increase_pct,
                         "is_high": stock_analysis.is_volume_high
-                    }
+                    },
+                    "candle_patterns": (
+                        stock_analysis.candle_patterns.to_dict()
+                        if stock_analysis.candle_patterns else None
+                    )
                 },
                 "last_10_days": [{
                     "date": day.date.isoformat(),
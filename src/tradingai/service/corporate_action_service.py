@@ -0,0 +1,44 @@
+from datetime import date
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+from ..domain.corporate_actions import adjustment_factor, get_adjustment_cache
+from ..domain.models import CorporateAction
+from ..domain.timeframes import get_series_cache
+from ..repository.corporate_action_repository import CorporateActionRepository
+from .instrument_service import InstrumentService
+
+class CorporateActionService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repo = CorporateActionRepository(db)
+        self.instrument_service = InstrumentService(db, None)
+
+    async def record_action(
+        self,
+        symbol: str,
+        ex_date: date,
+        action_type: str,
+        ratio: Optional[str] = None,
+        factor: Optional[float] = None
+    ) -> CorporateAction:
+        """
+        Record a split, bonus or explicit adjustment and drop this process's
+        cached factors and series for the symbol. Other processes pick the
+        action up within ADJUSTMENT_CACHE_TTL_SECONDS.
+        """
+        is_valid, _ = await self.instrument_service.validate_symbols([symbol])
+        if not is_valid:
+            raise ValueError(f"Unknown symbol: {symbol}")
+        (symbol,) = await self.instrument_service.canonical_symbols([symbol])
+        price_factor = adjustment_factor(action_type, ratio, factor)
+
+        action = await self.repo.record_action(symbol, ex_date, action_type, price_factor, ratio)
+        get_adjustment_cache().invalidate()
+        get_series_cache().invalidate(symbol)
+        logger.info(f"Recorded {action_type} for {symbol} with ex-date {ex_date}, factor {price_factor:.6g}")
+        return action
+
+    async def get_actions(self, symbol: str) -> List[CorporateAction]:
+        return await self.repo.get_actions(symbol)
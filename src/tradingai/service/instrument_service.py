@@ -1,105 +1,163 @@
-from datetime import datetime
-import csv
-from io import StringIO
-import aiohttp
-from typing import Dict, Optional, List, Tuple
+from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from loguru import logger
 
 from ..domain.models import Instrument
+from ..domain.symbol_index import InstrumentEntry, SymbolIndex
+from ..metrics import DB_QUERY_SECONDS
 from ..repository.instrument_repository import InstrumentRepository
+from ..repository.instrument_sync_repository import InstrumentSyncRepository, InstrumentSyncSummary
+
+INSTRUMENT_COPY_BATCH_SIZE = 1000
+
+# Process-wide symbol index, replaced whole after every reload
+_symbol_index: Optional[SymbolIndex] = None
+
+def get_symbol_index() -> Optional[SymbolIndex]:
+    """Current symbol index, or None if it has not been loaded in this process"""
+    return _symbol_index
+
+def set_symbol_index(index: SymbolIndex) -> None:
+    global _symbol_index
+    _symbol_index = index
 
 class InstrumentService:
     def __init__(self, db: AsyncSession, instrument_repository: InstrumentRepository):
         self.db = db
         self.repository = instrument_repository
-        self.instruments_cache: Dict[str, int] = {}  # symbol -> token mapping
         
-    async def fetch_instruments(self) -> None:
-        """Fetch instruments from repository and store in database"""
+    async def fetch_instruments(self) -> InstrumentSyncSummary:
+        """
+        Fetch instruments from repository and store in database.
+        The dump is streamed in batches straight into the sync staging table.
+        """
         try:
-            instruments = await self.repository.fetch_instruments()
+            sync_repo = InstrumentSyncRepository(self.db)
+            await sync_repo.create_staging()
             
-            # Update cache
-            for instrument in instruments:
-                self.instruments_cache[instrument['tradingsymbol']] = instrument['instrument_token']
+            async for batch in self.repository.fetch_instrument_batches(batch_size=INSTRUMENT_COPY_BATCH_SIZE):
+                await sync_repo.copy_batch(batch)
             
-            # Bulk insert/update instruments
-            await self.update_instruments(instruments)
+            summary = await sync_repo.apply()
+            await self.load_symbol_index()
             
-            logger.info(f"Successfully updated {len(instruments)} instruments")
+            logger.info(
+                f"Instrument sync: {summary.inserted} new, {summary.updated} changed, "
+                f"{summary.delisted} delisted, {summary.unchanged} unchanged"
+            )
+            return summary
             
         except Exception as e:
+            await self.db.rollback()
             logger.error(f"Error updating instruments: {str(e)}")
             raise
 
-    async def update_instruments(self, instruments: list) -> None:
-        """Update instruments in database"""
+    async def update_instruments(self, instruments: list) -> InstrumentSyncSummary:
+        """
+        Sync instruments table with the given instruments.
+        Rows are COPYed to staging and only new or changed rows are upserted;
+        instruments missing from the dump are removed.
+        """
         try:
-            # Insert new instruments, update if exists
-            for instrument in instruments:
-                await self.db.merge(Instrument(**instrument))
-            await self.db.commit()
+            sync_repo = InstrumentSyncRepository(self.db)
+            await sync_repo.create_staging()
+            for i in range(0, len(instruments), INSTRUMENT_COPY_BATCH_SIZE):
+                await sync_repo.copy_batch(instruments[i:i + INSTRUMENT_COPY_BATCH_SIZE])
+            summary = await sync_repo.apply()
+            await self.load_symbol_index()
             
-            logger.info(f"Updated {len(instruments)} instruments")
+            logger.info(
+                f"Instrument sync: {summary.inserted} new, {summary.updated} changed, "
+                f"{summary.delisted} delisted, {summary.unchanged} unchanged"
+            )
+            return summary
         except Exception as e:
             await self.db.rollback()
             logger.error(f"Error updating instruments: {str(e)}")
             raise
 
+    async def load_symbol_index(self) -> SymbolIndex:
+        """Rebuild the process-wide symbol index from the database and swap it in"""
+        try:
+            query = select(
+                Instrument.tradingsymbol,
+                Instrument.instrument_token,
+                Instrument.name,
+                Instrument.exchange,
+                Instrument.instrument_type,
+                Instrument.segment
+            )
+            with DB_QUERY_SECONDS.time(query="symbol_index"):
+                result = await self.db.execute(query)
+                rows = result.all()
+            index = SymbolIndex(
+                InstrumentEntry(symbol, token, name or "", exchange or "", instrument_type or "", segment or "")
+                for symbol, token, name, exchange, instrument_type, segment in rows
+            )
+            set_symbol_index(index)
+            logger.info(f"Symbol index loaded with {len(index)} instruments (version {index.version})")
+            return index
+        except Exception as e:
+            logger.error(f"Error loading symbol index: {str(e)}")
+            raise
+
+    async def get_symbol_index(self) -> SymbolIndex:
+        """Process-wide symbol index, loaded on first use"""
+        index = get_symbol_index()
+        if index is None:
+            index = await self.load_symbol_index()
+        return index
+
     async def get_instrument_token(self, symbol: str) -> Optional[int]:
         """Get instrument token for a symbol"""
         try:
-            # Try cache first
-            logger.debug(f"Looking up token for symbol: {symbol}")
-            if symbol in self.instruments_cache:
-                logger.debug(f"Found in cache: {symbol} -> {self.instruments_cache[symbol]}")
-                return self.instruments_cache[symbol]
+            index = await self.get_symbol_index()
+            token = index.get_token(symbol)
+            if token is not None:
+                return token
             
-            # Try database
-            logger.debug(f"Cache miss, querying database for: {symbol}")
+            # The index may be stale if another process synced instruments
             query = select(Instrument.instrument_token).where(Instrument.tradingsymbol == symbol)
-            result = await self.db.execute(query)
-            token = result.scalar_one_or_none()
-            
-            if token:
-                logger.debug(f"Found in DB: {symbol} -> {token}")
-                self.instruments_cache[symbol] = token
-                return token
+            with DB_QUERY_SECONDS.time(query="instrument_token"):
+                result = await self.db.execute(query)
+                token = result.scalar_one_or_none()
             
-            logger.warning(f"No token found for symbol: {symbol}")
-            return None
+            if token is None:
+                logger.warning(f"No token found for symbol: {symbol}")
+            return token
             
         except Exception as e:
             logger.error(f"Error getting instrument token for {symbol}: {str(e)}")
-            logger.exception("Full token lookup error traceback:")
             raise
 
-    async def refresh_cache(self) -> None:
-        """Refresh the instruments cache from database"""
+    async def get_all_symbols(self) -> List[str]:
+        """Get all trading symbols, sorted alphabetically"""
         try:
-            logger.debug("Refreshing instruments cache")
-            query = select(Instrument.tradingsymbol, Instrument.instrument_token)
-            result = await self.db.execute(query)
-            self.instruments_cache = {row[0]: row[1] for row in result.fetchall()}
-            logger.debug(f"Cache refreshed with {len(self.instruments_cache)} instruments")
-            
+            index = await self.get_symbol_index()
+            return index.symbols
         except Exception as e:
-            logger.error("Error refreshing cache")
-            logger.exception("Full cache refresh error traceback:")
+            logger.error(f"Error getting symbols: {str(e)}")
             raise
 
-    async def get_all_symbols(self) -> List[str]:
-        """Get all trading symbols from database"""
+    async def get_equity_symbols(self, exchange: str = "NSE", instrument_type: str = "EQ") -> List[str]:
+        """Get equity trading symbols for an exchange, sorted alphabetically; indices are excluded"""
         try:
-            query = select(Instrument.tradingsymbol)
-            result = await self.db.execute(query)
-            symbols = [row[0] for row in result.scalars().all()]
-            logger.info(f"Found {len(symbols)} symbols in database")
-            return symbols
+            index = await self.get_symbol_index()
+            entries = index.iter_entries(exchange=exchange, instrument_type=instrument_type)
+            return [e.tradingsymbol for e in entries if not e.is_index]
         except Exception as e:
-            logger.error(f"Error getting symbols: {str(e)}")
+            logger.error(f"Error getting equity symbols: {str(e)}")
+            raise
+
+    async def canonical_symbols(self, symbols: List[str]) -> List[str]:
+        """Exchange spelling of each symbol; call after validate_symbols, unknown symbols pass through"""
+        try:
+            index = await self.get_symbol_index()
+            entries = [index.lookup(symbol) for symbol in symbols]
+            return [entry.tradingsymbol if entry else symbol for entry, symbol in zip(entries, symbols)]
+        except Exception as e:
+            logger.error(f"Error resolving symbols: {str(e)}")
             raise
 
     async def validate_symbols(self, symbols: List[str]) -> Tuple[bool, List[str]]:
@@ -109,15 +167,8 @@ class InstrumentService:
             Tuple of (is_valid, invalid_symbols)
         """
         try:
-            # Get all valid symbols from DB
-            valid_symbols = await self.get_all_symbols()
-            
-            # Find invalid symbols with case-insensitive comparison
-            invalid_symbols = []
-            for symbol in symbols:
-                if symbol.upper() not in {s.upper() for s in valid_symbols}:
-                    invalid_symbols.append(symbol)
-            
+            index = await self.get_symbol_index()
+            invalid_symbols = index.invalid_symbols(symbols)
             is_valid = len(invalid_symbols) == 0
             return is_valid, invalid_symbols
             
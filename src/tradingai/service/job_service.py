@@ -0,0 +1,79 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+from ..domain.models import Job
+from ..repository.job_repository import JobRepository
+
+JOB_HISTORICAL = "historical"
+JOB_DAILY_UPDATE = "daily_update"
+JOB_UNIVERSE_SCREENER = "universe_screener"
+JOB_RELATIVE_STRENGTH = "relative_strength"
+JOB_SECTOR_PERFORMANCE = "sector_performance"
+
+class JobService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.job_repo = JobRepository(db)
+
+    async def submit_historical(self, symbols: List[str], from_date: datetime, to_date: datetime) -> Job:
+        """Queue a historical backfill for symbols"""
+        return await self.job_repo.enqueue(
+            JOB_HISTORICAL,
+            payload={
+                "symbols": symbols,
+                "from_date": from_date.isoformat(),
+                "to_date": to_date.isoformat()
+            },
+            total_symbols=len(symbols)
+        )
+
+    async def submit_daily_update(self, symbols: List[str]) -> Job:
+        """Queue a daily update for symbols"""
+        return await self.job_repo.enqueue(
+            JOB_DAILY_UPDATE,
+            payload={"symbols": symbols},
+            total_symbols=len(symbols)
+        )
+
+    async def submit_universe_screener(self) -> Job:
+        """Queue a universe screener run"""
+        return await self.job_repo.enqueue(JOB_UNIVERSE_SCREENER, payload={})
+
+    async def submit_relative_strength(self) -> Job:
+        """Queue a relative strength ranking of the universe"""
+        return await self.job_repo.enqueue(JOB_RELATIVE_STRENGTH, payload={})
+
+    async def submit_sector_performance(self) -> Job:
+        """Queue a sector performance and market breadth run"""
+        return await self.job_repo.enqueue(JOB_SECTOR_PERFORMANCE, payload={})
+
+    async def get_job_status(self, job_id: int) -> Optional[Dict]:
+        """Get job status including per-symbol progress"""
+        try:
+            job = await self.job_repo.get(job_id)
+            if job is None:
+                return None
+            
+            completed = job.completed_symbols or []
+            symbols = job.payload.get("symbols", [])
+            return {
+                "job_id": job.id,
+                "job_type": job.job_type,
+                "status": job.status,
+                "attempts": job.attempts,
+                "max_attempts": job.max_attempts,
+                "progress": {
+                    "completed": len(completed),
+                    "total": job.total_symbols,
+                    "remaining_symbols": [s for s in symbols if s not in set(completed)]
+                },
+                "records_inserted": job.records_inserted,
+                "error": job.error,
+                "created_at": job.created_at.isoformat() if job.created_at else None,
+                "finished_at": job.finished_at.isoformat() if job.finished_at else None
+            }
+        except Exception as e:
+            logger.error(f"Error getting status for job {job_id}: {str(e)}")
+            raise
@@ -1,23 +1,78 @@
 from datetime import date
+import time
+from typing import Dict, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from loguru import logger
 
+from ..config.settings import settings
 from ..domain.models import MarketConditionModel
-from ..domain.market_analysis import MarketCondition, MarketDirection
+from ..domain.market_analysis import MarketAnalysis, MarketCondition, MarketDirection
+from ..domain.sector_analysis import SectorSnapshot
+from ..repository.sector_repository import SectorRepository
+
+# (loaded at, snapshot) of the latest stored sector run, shared by requests in this process
+_sector_snapshot: Optional[Tuple[float, Optional[SectorSnapshot]]] = None
+
+def invalidate_sector_snapshot() -> None:
+    """Reload the sector snapshot on next use"""
+    global _sector_snapshot
+    _sector_snapshot = None
 
 class MarketService:
     def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_latest_market_condition(self) -> MarketCondition:
-        """Get the latest market condition"""
+    async def get_sector_snapshot(self) -> Optional[SectorSnapshot]:
+        """
+        Latest sector table and breadth, loaded once per SECTOR_CACHE_TTL_SECONDS.
+        None if no run is stored or it cannot be loaded; sector context is optional.
+        """
+        global _sector_snapshot
+        if _sector_snapshot is not None and time.monotonic() - _sector_snapshot[0] < settings.SECTOR_CACHE_TTL_SECONDS:
+            return _sector_snapshot[1]
+        try:
+            snapshot = await SectorRepository(self.db).get_snapshot()
+        except Exception as e:
+            logger.error(f"Error loading sector snapshot: {str(e)}")
+            return None
+        _sector_snapshot = (time.monotonic(), snapshot)
+        return snapshot
+    
+    async def get_sector_context(self, symbol: str) -> Optional[Dict]:
+        """The symbol's sector standing from the latest snapshot"""
+        snapshot = await self.get_sector_snapshot()
+        return snapshot.sector_context(symbol) if snapshot else None
+    
+    async def get_market_analysis(self) -> MarketAnalysis:
+        """Market condition with sector performance and breadth from the latest run"""
+        snapshot = await self.get_sector_snapshot()
+        if snapshot is None:
+            return MarketAnalysis(
+                condition=self.get_latest_market_condition(),
+                nifty_trend={},
+                sector_performance={},
+                market_breadth={}
+            )
+        return MarketAnalysis(
+            condition=self.get_latest_market_condition(snapshot.breadth.pct_above_sma_50),
+            nifty_trend={"returns": snapshot.breadth.benchmark_returns, "as_of": snapshot.run_date.isoformat()},
+            sector_performance={s.sector: s.to_dict() for s in snapshot.sectors},
+            market_breadth={**snapshot.breadth.to_dict(), "as_of": snapshot.run_date.isoformat()}
+        )
+    
+    def get_latest_market_condition(self, breadth: Optional[float] = None) -> MarketCondition:
+        """
+        Get the latest market condition
+        Args:
+            breadth: Fraction of the universe above its 50-day SMA, from the sector snapshot
+        """
         try:
             # For now, return a default condition
             # TODO: Implement actual market analysis
             score = 5  # Example score
             direction = MarketDirection.BULLISH
-            breadth = 0.5
+            breadth = 0.5 if breadth is None else breadth
 
             # Generate context based on conditions
             context = self._generate_market_context(direction, score, breadth)
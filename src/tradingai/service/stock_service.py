@@ -1,31 +1,52 @@
 from datetime import datetime, timedelta
 import pytz
-from typing import List, Tuple, Dict
+import pandas as pd
+from typing import List, Tuple, Dict, Optional, Callable, Awaitable
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import insert, select, and_
+from sqlalchemy import select, and_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from loguru import logger
 from dataclasses import asdict
 
 from ..repository.zerodha import ZerodhaClient, get_zerodha_client
-from ..domain.models import StockData
+from ..domain.models import StockData, TradingSignalRecord
 from ..domain.stock_analysis import DefaultStockAnalyzer, StockAnalysis
 from ..service.instrument_service import InstrumentService
 from ..repository.stock_repository import StockRepository
+from ..repository.trade_repository import SignalWriter, TradeRepository, record_to_signal, signal_row
 from ..domain.llm_trade import LLMTradeAnalyzer, TradingSignal
+from ..domain.trade_gate import TradeGate
+from ..domain.trading_calendar import get_trading_calendar, session_bounds, to_ist_date
+from ..domain.gap_planner import plan_backfill
 from ..config.settings import settings
 from ..service.market_service import MarketService
+from ..service.tick_ingestion_service import get_bar_builder
+from ..domain.bar_builder import append_live_bar
+from ..domain.timeframes import TimeframeIndicators, apply_live_bar, compute_indicators, get_series_cache
 
 class StockService:
-    def __init__(self, db: AsyncSession, zerodha_client: ZerodhaClient):
+    def __init__(
+        self,
+        db: AsyncSession,
+        zerodha_client: ZerodhaClient,
+        llm_analyzer: Optional[LLMTradeAnalyzer] = None,
+        signal_writer: Optional[SignalWriter] = None
+    ):
         self.db = db
         self.zerodha_client = zerodha_client
         self.stock_repo = StockRepository(db)
-        self.llm_analyzer = LLMTradeAnalyzer(
+        self.trade_repo = TradeRepository(db)
+        # Without a writer, signals are inserted inline
+        self.signal_writer = signal_writer
+        # Pass the app-wide analyzer to avoid building a new LLM client per request
+        self.llm_analyzer = llm_analyzer or LLMTradeAnalyzer(
             model_name=settings.LLM_MODEL_NAME
         )
         self.instrument_service = InstrumentService(db, None)
         self.market_service = MarketService(db)
+        self.trade_gate = TradeGate()
+        self.calendar = get_trading_calendar()
     
     async def initialize(self):
         """Initialize service by fetching instruments"""
@@ -55,18 +76,28 @@ class StockService:
         self, 
         symbols: List[str], 
         from_date: datetime, 
-        to_date: datetime
+        to_date: datetime,
+        on_symbol_complete: Optional[Callable[[str, int], Awaitable[None]]] = None
     ) -> int:
+        """
+        Fetch and store historical data for symbols.
+        on_symbol_complete(symbol, records) is awaited after each symbol is fully
+        stored, so callers can checkpoint progress.
+        """
         total_records = 0
+        from_date = self.convert_to_utc(from_date)
+        to_date = self.convert_to_utc(to_date)
         
         try:
             # Add debug log
-            logger.info(f"Fetching historical data for symbols: {symbols}")
+            logger.info("Fetching historical data for {} symbols", len(symbols))
             
             # Validate symbols first
             is_valid, invalid_symbols = await self.instrument_service.validate_symbols(symbols)
             if not is_valid:
                 raise ValueError(f"Invalid symbols found: {invalid_symbols}")
+            # Validation is case-insensitive; fetch and store under the exchange spelling
+            symbols = await self.instrument_service.canonical_symbols(symbols)
 
             # Get instrument tokens
             for symbol in symbols:
@@ -74,24 +105,44 @@ class StockService:
                 if not token:
                     logger.error(f"No instrument token found for {symbol}")
                     raise ValueError(f"No instrument token found for {symbol}")
-                logger.info(f"Found token {token} for {symbol}")
+                logger.debug("Found token {} for {}", token, symbol)
 
             for symbol in symbols:
                 try:
-                    logger.info(f"Processing symbol: {symbol}")
+                    logger.debug("Processing symbol: {}", symbol)
                     
                     # Get existing records first
                     existing_timestamps = await self.get_existing_records(symbol, from_date, to_date)
-                    logger.info(f"Found {len(existing_timestamps)} existing records for {symbol}")
+                    logger.debug("Found {} existing records for {}", len(existing_timestamps), symbol)
                     
-                    # Fetch data from Zerodha
-                    stock_data = await self.zerodha_client.fetch_historical_data(
-                        symbol, 
-                        from_date, 
-                        to_date
+                    # Only request the trading sessions that are missing
+                    fetch_ranges = plan_backfill(
+                        self.calendar,
+                        to_ist_date(from_date),
+                        to_ist_date(to_date),
+                        {to_ist_date(ts) for ts in existing_timestamps},
+                        settings.BACKFILL_MAX_SPAN_DAYS,
+                        settings.BACKFILL_MAX_GAP_SESSIONS
                     )
+                    if not fetch_ranges:
+                        logger.debug("No missing sessions for {}", symbol)
+                        if on_symbol_complete:
+                            await on_symbol_complete(symbol, 0)
+                        continue
                     
-                    logger.debug(f"Received {len(stock_data)} records from Zerodha")
+                    logger.debug("Fetching {} missing date ranges for {}", len(fetch_ranges), symbol)
+                    
+                    # Fetch data from Zerodha
+                    stock_data = []
+                    for fetch_range in fetch_ranges:
+                        range_from, range_to = session_bounds(fetch_range.start, fetch_range.end)
+                        stock_data.extend(await self.zerodha_client.fetch_historical_data(
+                            symbol, 
+                            range_from, 
+                            range_to
+                        ))
+                    
+                    logger.debug("Received {} records from Zerodha", len(stock_data))
                     
                     # Prepare values for insert, skipping existing records
                     values = []
@@ -111,7 +162,7 @@ class StockService:
                                 continue
                             
                             record = {
-                                "symbol": str(symbol),
+                                "symbol": symbol,
                                 "timestamp": timestamp,
                                 "open": float(data.open),
                                 "high": float(data.high),
@@ -124,40 +175,55 @@ class StockService:
                             if all(v is not None for v in record.values()):
                                 values.append(record)
                             else:
-                                logger.warning(f"Skipping record with None values: {record}")
+                                logger.warning("Skipping record with None values for {} at {}", symbol, timestamp)
                         except Exception as conv_error:
-                            logger.error(f"Data conversion error: {str(conv_error)}")
-                            logger.error(f"Problematic record data: {vars(data)}")
+                            logger.error(
+                                "Data conversion error for {} at {}: {}",
+                                symbol, getattr(data, "timestamp", None), conv_error
+                            )
                             continue
                     
-                    logger.info(f"Skipped {skipped} existing records for {symbol}")
+                    logger.debug("Skipped {} existing records for {}", skipped, symbol)
                     
                     if not values:
-                        logger.info(f"No new records to insert for {symbol}")
+                        logger.debug("No new records to insert for {}", symbol)
+                        if on_symbol_complete:
+                            await on_symbol_complete(symbol, 0)
                         continue
                     
-                    logger.info(f"Inserting {len(values)} new records for {symbol}")
+                    logger.debug("Inserting {} new records for {}", len(values), symbol)
                     
                     # Insert in smaller batches
                     batch_size = 100
+                    symbol_records = 0
+                    symbol_failed = False
                     for i in range(0, len(values), batch_size):
                         batch = values[i:i + batch_size]
                         try:
-                            stmt = insert(StockData).values(batch)
-                            await self.db.execute(stmt)
+                            # Bars flushed by live ingestion since the existence check are skipped
+                            stmt = insert(StockData).values(batch).on_conflict_do_nothing(
+                                index_elements=[StockData.symbol, StockData.timestamp]
+                            )
+                            result = await self.db.execute(stmt)
                             await self.db.commit()
                             
-                            total_records += len(batch)
-                            logger.info(f"Successfully inserted batch of {len(batch)} records")
+                            total_records += result.rowcount
+                            symbol_records += result.rowcount
+                            logger.debug("Inserted batch of {} records", result.rowcount)
                         
                         except Exception as insert_error:
                             error_msg = str(insert_error)
-                            logger.error(f"Insert error: {error_msg}")
-                            logger.error(f"First record in failed batch: {batch[0]}")
+                            logger.error(
+                                "Insert error for {} (batch starting {}): {}",
+                                symbol, batch[0]["timestamp"], error_msg
+                            )
                             await self.db.rollback()
+                            symbol_failed = True
                             continue
                     
-                    logger.info(f"Completed processing {len(values)} new records for {symbol}")
+                    logger.info("Stored {} new records for {}", symbol_records, symbol)
+                    if on_symbol_complete and not symbol_failed:
+                        await on_symbol_complete(symbol, symbol_records)
                     
                 except Exception as e:
                     logger.error(f"Error processing symbol {symbol}: {str(e)}")
@@ -173,20 +239,27 @@ class StockService:
             await self.db.rollback()
             return 0
 
-    async def fetch_daily_update(self, symbols: List[str]) -> int:
+    async def fetch_daily_update(
+        self,
+        symbols: List[str],
+        on_symbol_complete: Optional[Callable[[str, int], Awaitable[None]]] = None
+    ) -> int:
         """
-        Fetch last trading day's data. 
-        Includes a buffer of 5 days to handle weekends and holidays.
+        Fetch the latest completed sessions.
+        Looks back DAILY_UPDATE_LOOKBACK_DAYS so missed runs are caught up;
+        only sessions missing from the database are requested.
         """
-        end_date = datetime.now(pytz.UTC)
-        start_date = end_date - timedelta(days=5)  # 5 days buffer
+        end_session = self.calendar.last_complete_session()
+        start_session = end_session - timedelta(days=settings.DAILY_UPDATE_LOOKBACK_DAYS)
+        start_date, end_date = session_bounds(start_session, end_session)
         
         logger.info(f"Fetching daily update from {start_date} to {end_date}")
         
         return await self.fetch_and_store_historical_data(
             symbols=symbols,
             from_date=start_date,
-            to_date=end_date
+            to_date=end_date,
+            on_symbol_complete=on_symbol_complete
         ) 
 
     async def analyze_stock(self, symbol: str) -> StockAnalysis:
@@ -194,7 +267,7 @@ class StockService:
         Analyze a stock and return technical analysis results
         """
         try:
-            logger.info(f"Starting analysis for {symbol}")
+            logger.debug("Starting analysis for {}", symbol)
             
             # Check if data exists in DB first
             query = select(StockData).where(StockData.symbol == symbol).limit(1)
@@ -216,14 +289,19 @@ class StockService:
                 logger.error(f"Got empty DataFrame for {symbol}")
                 raise ValueError(f"No data found for symbol {symbol}")
             
-            logger.info(f"Got {len(df)} records for analysis")
-            logger.debug(f"Data range: {df.index.min()} to {df.index.max()}")
+            # Include today's partial bar when the ticker runs in this process
+            builder = get_bar_builder()
+            if builder is not None:
+                df = append_live_bar(df, builder.live_day(symbol))
+            
+            logger.debug("Got {} records for analysis", len(df))
+            logger.opt(lazy=True).debug("Data range: {} to {}", df.index.min, df.index.max)
             
             # Create analyzer and get analysis
             analyzer = DefaultStockAnalyzer(df)
             analysis = analyzer.analyze(symbol)
             
-            logger.info(f"Successfully analyzed {symbol}")
+            logger.debug("Analyzed {}", symbol)
             return analysis
             
         except Exception as e:
@@ -231,6 +309,62 @@ class StockService:
             logger.exception("Full traceback:")
             raise
 
+    async def analyze_timeframes(self, symbol: str, timeframes: List[str]) -> Dict[str, TimeframeIndicators]:
+        """
+        Indicators on daily, weekly and/or monthly bars. The daily series is
+        loaded and resampled once, then served from the series cache.
+        """
+        try:
+            cache = get_series_cache()
+            frames = cache.get(symbol)
+            if frames is None:
+                daily = await self.stock_repo.get_stock_data(symbol, lookback_days=settings.TIMEFRAME_LOOKBACK_DAYS)
+                if daily.empty:
+                    raise ValueError(f"No historical data found for {symbol}. Please fetch historical data first.")
+                frames = cache.put(symbol, daily)
+            
+            builder = get_bar_builder()
+            live_day = builder.live_day(symbol) if builder is not None else None
+            return {
+                timeframe: compute_indicators(apply_live_bar(frames[timeframe], live_day, timeframe), timeframe)
+                for timeframe in timeframes
+            }
+        except Exception as e:
+            logger.error(f"Error analyzing timeframes for {symbol}: {str(e)}")
+            raise
+
+    async def get_latest_signals(self, symbols: List[str]) -> Dict[str, TradingSignalRecord]:
+        """Latest stored signal per symbol, including ones still buffered for writing"""
+        latest = await self.trade_repo.get_latest_signals(symbols)
+        if self.signal_writer is not None:
+            for symbol in symbols:
+                pending = self.signal_writer.pending_latest(symbol)
+                if pending is not None and (symbol not in latest or pending.created_at > latest[symbol].created_at):
+                    latest[symbol] = pending
+        return latest
+
+    async def _reusable_signal(self, symbol: str, as_of: datetime) -> Optional[TradingSignalRecord]:
+        """A recent decision made on the same latest bar, if any"""
+        if not settings.SIGNAL_REUSE_SECONDS:
+            return None
+        record = (await self.get_latest_signals([symbol])).get(symbol)
+        if record is None or record.as_of != as_of:
+            return None
+        if datetime.now(pytz.UTC) - record.created_at > timedelta(seconds=settings.SIGNAL_REUSE_SECONDS):
+            return None
+        return record
+
+    async def _store_signal(self, symbol: str, signal: TradingSignal, current_price: float, as_of: datetime) -> None:
+        row = signal_row(symbol, signal, current_price, as_of, self.llm_analyzer.model_name)
+        if self.signal_writer is not None:
+            self.signal_writer.add(row)
+            return
+        try:
+            await self.trade_repo.store_signals([row])
+        except Exception as e:
+            # The decision is still returned; losing the record only costs a future LLM call
+            logger.error(f"Error storing trading signal for {symbol}: {str(e)}")
+
     async def analyze_stock_with_decision(self, symbol: str) -> Tuple[Dict, TradingSignal]:
         """
         Analyze stock and get LLM trading decision
@@ -241,19 +375,26 @@ class StockService:
             # Get stock analysis first
             stock_analysis = await self.analyze_stock(symbol)
             
-            # Get market condition with context
-            market_condition = self.market_service.get_latest_market_condition()
+            # Get market condition with context; breadth and sector come from the cached daily snapshot
+            snapshot = await self.market_service.get_sector_snapshot()
+            market_condition = self.market_service.get_latest_market_condition(
+                snapshot.breadth.pct_above_sma_50 if snapshot else None
+            )
+            market_data = {
+                "direction": market_condition.direction,
+                "score": market_condition.score,
+                "breadth": market_condition.breadth,
+                "context": market_condition.context
+            }
+            sector_context = snapshot.sector_context(symbol) if snapshot else None
+            if sector_context is not None:
+                market_data["sector"] = sector_context
             
             # Convert StockAnalysis object to dict
             analysis_data = {
                 "symbol": stock_analysis.symbol,
                 "current_price": stock_analysis.current_price,
-                "market_condition": {
-                    "direction": market_condition.direction,
-                    "score": market_condition.score,
-                    "breadth": market_condition.breadth,
-                    "context": market_condition.context
-                },
+                "market_condition": market_data,
                 "technical_analysis": {
                     "sma_30_week": stock_analysis.sma_30_week,
                     "is_above_30_week": stock_analysis.is_above_30_week,
@@ -274,7 +415,11 @@ class StockService:
                         "ema_30": stock_analysis.volume_ema_30,
                         "increase_pct": stock_analysis.volume_increase_pct,
                         "is_high": stock_analysis.is_volume_high
-                    }
+                    },
+                    "candle_patterns": (
+                        stock_analysis.candle_patterns.to_dict()
+                        if stock_analysis.candle_patterns else None
+                    )
                 },
                 "last_10_days": [{
                     "date": day.date.isoformat(),
@@ -286,19 +431,33 @@ class StockService:
                 } for day in stock_analysis.last_10_days]
             }
             
+            # Answer obvious no-trade setups locally
+            gate_result = self.trade_gate.evaluate(market_condition, stock_analysis)
+            if gate_result.skip_llm:
+                logger.info(f"Trade gate rule '{gate_result.rule}' matched for {symbol}, skipping LLM")
+                return analysis_data, gate_result.hold_signal()
+            
+            # Reuse a recent decision made on the same bar
+            as_of = pd.Timestamp(stock_analysis.last_10_days[0].date).to_pydatetime()
+            stored = await self._reusable_signal(symbol, as_of)
+            if stored is not None:
+                logger.info(f"Reusing trading signal for {symbol} from {stored.created_at}, skipping LLM")
+                self.trade_gate.stats.record_reuse()
+                return analysis_data, record_to_signal(stored)
+            
             # Get LLM trading decision
+            technical_analysis = {
+                key: value for key, value in analysis_data["technical_analysis"].items()
+                if key != "candle_patterns"
+            }
             trading_signal = await self.llm_analyzer.analyze(
                 market_data=analysis_data["market_condition"],
-                technical_analysis=analysis_data["technical_analysis"],
-                price_action=analysis_data["last_10_days"]
+                technical_analysis=technical_analysis,
+                price_action=analysis_data["last_10_days"],
+                candle_patterns=analysis_data["technical_analysis"]["candle_patterns"]
             )
             
-            # # Store the signal
-            # await self.stock_repo.store_trading_signal(
-            #     symbol=symbol,
-            #     signal=trading_signal,
-            #     analysis_data=analysis_data
-            # )
+            await self._store_signal(symbol, trading_signal, stock_analysis.current_price, as_of)
             
             return analysis_data, trading_signal
             
@@ -0,0 +1,143 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional
+import pytz
+from loguru import logger
+
+from ..config.settings import settings
+from ..domain.bar_builder import Bar, BarBuilder
+from ..domain.signal_evaluator import SignalEvaluator
+from ..domain.symbol_index import SymbolIndex
+from ..metrics import TICKER_TICKS, TICKER_BARS_STORED
+from ..repository.database import AsyncWriteSessionLocal
+from ..repository.kite_ticker import KiteTickerClient
+from ..repository.stock_repository import StockRepository
+from .alert_broker import AlertBroker, get_alert_broker
+
+BAR_BATCH_SIZE = 1000
+
+# Process-wide bar builder; analysis reads live bars from it when the ticker runs in-process
+_bar_builder: Optional[BarBuilder] = None
+
+def get_bar_builder() -> Optional[BarBuilder]:
+    """Live bar builder, or None if no ticker runs in this process"""
+    return _bar_builder
+
+def set_bar_builder(builder: Optional[BarBuilder]) -> None:
+    global _bar_builder
+    _bar_builder = builder
+
+def resolve_tokens(index: SymbolIndex, symbols: List[str], max_tokens: int) -> Dict[int, str]:
+    """Instrument token -> symbol for the given symbols, or for NSE equities when none are given"""
+    if symbols:
+        tokens = {}
+        for symbol in symbols:
+            token = index.get_token(symbol)
+            if token is None:
+                logger.warning(f"No instrument token for ticker symbol {symbol}")
+            else:
+                tokens[token] = symbol
+    else:
+        tokens = {
+            entry.instrument_token: entry.tradingsymbol
+            for entry in index.iter_entries(exchange="NSE", instrument_type="EQ")
+            if not entry.is_index
+        }
+    if len(tokens) > max_tokens:
+        logger.warning(f"Subscribing to the first {max_tokens} of {len(tokens)} instruments")
+        tokens = dict(list(tokens.items())[:max_tokens])
+    return tokens
+
+async def seed_evaluator(
+    evaluator: SignalEvaluator,
+    db,
+    symbols: List[str],
+    lookback_days: int = settings.ALERT_SEED_LOOKBACK_DAYS
+) -> int:
+    """Warm up the evaluator from stored daily bars; returns symbols seeded"""
+    panel = await StockRepository(db).get_stock_panel(symbols, lookback_days)
+    seeded = 0
+    for symbol, rows in panel.groupby("symbol", sort=False):
+        evaluator.seed(symbol, zip(rows["timestamp"], rows["close"], rows["volume"]))
+        seeded += 1
+    logger.info(f"Seeded signal evaluator for {seeded} of {len(symbols)} symbols")
+    return seeded
+
+class TickIngestionService:
+    """
+    Streams ticks into a BarBuilder and periodically writes completed daily
+    bars to stock_data. Minute bars stay in memory. With an evaluator, the
+    live daily bar is checked against the analyzer rules on every minute
+    close and completed daily bars are committed to it; alerts go to the broker.
+    """
+
+    def __init__(
+        self,
+        ticker: KiteTickerClient,
+        builder: BarBuilder,
+        session_factory=AsyncWriteSessionLocal,
+        flush_seconds: float = settings.TICKER_FLUSH_SECONDS,
+        evaluator: Optional[SignalEvaluator] = None,
+        broker: Optional[AlertBroker] = None
+    ):
+        self.ticker = ticker
+        self.builder = builder
+        self.session_factory = session_factory
+        self.flush_seconds = flush_seconds
+        self.evaluator = evaluator
+        self.broker = broker or get_alert_broker()
+        self._pending: List[Bar] = []  # Bars whose write failed, retried on the next flush
+        if evaluator is not None:
+            builder.on_minute_close = self._on_minute_close
+
+    def _on_minute_close(self, day: Bar) -> None:
+        alerts = self.evaluator.on_live_bar(day)
+        if alerts:
+            self.broker.publish(alerts)
+
+    async def flush(self, now: Optional[datetime] = None) -> int:
+        """Write daily bars whose session has ended; returns rows inserted"""
+        self.builder.close_sessions(now or datetime.now(pytz.UTC))
+        completed = self.builder.drain_completed()
+        if self.evaluator is not None:
+            for bar in completed:
+                alerts = self.evaluator.on_day_close(bar)
+                if alerts:
+                    self.broker.publish(alerts)
+        # Bars missing the session's start would stick: the backfill skips stored sessions
+        partial = [bar for bar in completed if not bar.session_ohlc]
+        if partial:
+            logger.info(f"Not storing {len(partial)} daily bars without session open/high/low; the backfill will fetch them")
+        bars = self._pending + [bar for bar in completed if bar.session_ohlc]
+        self._pending = []
+        stored = 0
+        for i in range(0, len(bars), BAR_BATCH_SIZE):
+            batch = bars[i:i + BAR_BATCH_SIZE]
+            try:
+                async with self.session_factory() as db:
+                    stored += await StockRepository(db).store_bars(batch)
+            except Exception as e:
+                logger.error(f"Failed to store {len(batch)} live bars, will retry: {str(e)}")
+                self._pending.extend(batch)
+        if stored:
+            TICKER_BARS_STORED.inc(stored)
+            logger.info(f"Stored {stored} live daily bars")
+        return stored
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            await self.flush()
+
+    async def run(self, tokens: Dict[int, str]) -> None:
+        """Consume the ticker until cancelled; remaining completed bars are flushed on the way out"""
+        if not tokens:
+            logger.warning("No instruments to subscribe to; ticker not started")
+            return
+        flusher = asyncio.create_task(self._flush_loop())
+        try:
+            async for ticks in self.ticker.stream(list(tokens)):
+                TICKER_TICKS.inc(self.builder.on_ticks(ticks, tokens))
+        finally:
+            flusher.cancel()
+            await asyncio.shield(self.flush())
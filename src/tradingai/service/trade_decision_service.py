@@ -25,7 +25,9 @@ class TradeDecisionService:
             # Store the signal
             await self.trade_repo.store_signal(
                 symbol=stock_analysis["symbol"],
-                signal=signal
+                signal=signal,
+                current_price=stock_analysis.get("current_price"),
+                model_name=self.analyzer.model_name
             )
             
             return signal
@@ -1,13 +1,13 @@
 from loguru import logger
 from ..config.settings import settings
-from ..repository.database import AsyncSessionLocal
+from ..repository.database import AsyncWriteSessionLocal
 from ..repository.zerodha import ZerodhaClient
 from ..service.stock_service import StockService
 
 async def run_daily_update():
     """Run daily update for all configured symbols"""
     try:
-        async with AsyncSessionLocal() as db:
+        async with AsyncWriteSessionLocal() as db:
             zerodha_client = ZerodhaClient()
             service = StockService(db, zerodha_client)
             
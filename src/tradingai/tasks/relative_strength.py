@@ -0,0 +1,71 @@
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional
+import pandas as pd
+from loguru import logger
+
+from ..config.settings import settings
+from ..container import init_container
+from ..domain.relative_strength import (
+    RelativeStrength,
+    compute_rs_ratios,
+    rank_relative_strength,
+    to_relative_strength,
+)
+from ..repository.database import AsyncSessionLocal, AsyncWriteSessionLocal
+from ..repository.relative_strength_repository import RelativeStrengthRepository
+from ..repository.stock_repository import StockRepository
+from .universe_screener import _stage
+
+async def run_relative_strength(run_date: Optional[date] = None) -> List[RelativeStrength]:
+    """
+    Rank the NSE equity universe by relative strength versus the benchmark
+    index. RS ratios are computed per chunk of symbols (they only depend on
+    the symbol and the benchmark); percentile ranks are taken once over the
+    whole universe.
+    """
+    run_date = run_date or date.today()
+    chunk_size = settings.SCREENER_CHUNK_SIZE
+    timings: Dict[str, float] = defaultdict(float)
+    try:
+        async with AsyncSessionLocal() as db:
+            instrument_service = init_container().instrument_service(db)
+            stock_repo = StockRepository(db)
+            
+            with _stage("universe", timings):
+                symbols = await instrument_service.get_equity_symbols()
+                benchmark = await stock_repo.get_stock_data(
+                    settings.RS_BENCHMARK_SYMBOL, lookback_days=settings.RS_LOOKBACK_DAYS
+                )
+            if benchmark.empty:
+                raise ValueError(
+                    f"No data for benchmark {settings.RS_BENCHMARK_SYMBOL}; fetch its history first"
+                )
+            logger.info(f"Computing relative strength for {len(symbols)} symbols in chunks of {chunk_size}")
+            
+            chunks = []
+            for start in range(0, len(symbols), chunk_size):
+                chunk = symbols[start:start + chunk_size]
+                with _stage("load", timings):
+                    panel = await stock_repo.get_stock_panel(chunk, lookback_days=settings.RS_LOOKBACK_DAYS)
+                with _stage("ratios", timings):
+                    chunks.append(compute_rs_ratios(panel, benchmark['close']))
+        
+        with _stage("rank", timings):
+            ratios = pd.concat(chunks) if chunks else compute_rs_ratios(pd.DataFrame(), benchmark['close'])
+            rankings = to_relative_strength(rank_relative_strength(ratios))
+        
+        with _stage("persist", timings):
+            async with AsyncWriteSessionLocal() as db:
+                await RelativeStrengthRepository(db).replace_rankings(run_date, rankings)
+        
+        logger.info(f"Relative strength complete for {run_date}: {len(rankings)} of {len(symbols)} symbols ranked")
+        for name, seconds in timings.items():
+            logger.info(f"Relative strength stage '{name}' took {seconds:.2f}s")
+        
+        return rankings
+        
+    except Exception as e:
+        logger.error(f"Relative strength failed: {str(e)}")
+        logger.exception("Full traceback:")
+        raise
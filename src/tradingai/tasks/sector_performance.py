@@ -0,0 +1,88 @@
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Optional
+import pandas as pd
+from loguru import logger
+
+from ..config.settings import settings
+from ..container import init_container
+from ..domain.sector_analysis import (
+    SectorSnapshot,
+    aggregate_sectors,
+    benchmark_returns,
+    compute_market_breadth,
+    compute_symbol_metrics,
+    to_sector_performance,
+)
+from ..repository.database import AsyncSessionLocal, AsyncWriteSessionLocal
+from ..repository.sector_repository import SectorRepository, load_sector_map
+from ..repository.stock_repository import StockRepository
+from ..service.market_service import invalidate_sector_snapshot
+from .universe_screener import _stage
+
+async def run_sector_performance(run_date: Optional[date] = None) -> SectorSnapshot:
+    """
+    Aggregate the NSE equity universe into sector returns, breadth and
+    momentum, plus market-wide breadth. Symbol metrics are computed per
+    chunk; the sector groupby runs once over all of them.
+    """
+    run_date = run_date or date.today()
+    chunk_size = settings.SCREENER_CHUNK_SIZE
+    timings: Dict[str, float] = defaultdict(float)
+    try:
+        if settings.SECTOR_MAP_FILE:
+            with _stage("sectors", timings):
+                sector_map = load_sector_map(settings.SECTOR_MAP_FILE)
+                async with AsyncWriteSessionLocal() as db:
+                    changed = await SectorRepository(db).update_sectors(sector_map)
+            logger.info(f"Applied {len(sector_map)} sectors from {settings.SECTOR_MAP_FILE}, {changed} instruments changed")
+
+        async with AsyncSessionLocal() as db:
+            instrument_service = init_container().instrument_service(db)
+            stock_repo = StockRepository(db)
+
+            with _stage("universe", timings):
+                symbols = await instrument_service.get_equity_symbols()
+                symbol_sectors = await SectorRepository(db).get_symbol_sectors()
+                benchmark = await stock_repo.get_stock_data(
+                    settings.RS_BENCHMARK_SYMBOL, lookback_days=settings.SECTOR_LOOKBACK_DAYS
+                )
+            if not symbol_sectors:
+                logger.warning("No instrument has a sector; set SECTOR_MAP_FILE to classify the universe")
+            logger.info(f"Computing sector performance for {len(symbols)} symbols in chunks of {chunk_size}")
+            # Every chunk is measured over the benchmark's sessions
+            sessions = benchmark.index if not benchmark.empty else None
+
+            chunks = []
+            for start in range(0, len(symbols), chunk_size):
+                chunk = symbols[start:start + chunk_size]
+                with _stage("load", timings):
+                    panel = await stock_repo.get_stock_panel(chunk, lookback_days=settings.SECTOR_LOOKBACK_DAYS)
+                with _stage("metrics", timings):
+                    chunks.append(compute_symbol_metrics(panel, sessions))
+
+        with _stage("aggregate", timings):
+            metrics = pd.concat(chunks) if chunks else compute_symbol_metrics(pd.DataFrame())
+            sectors = to_sector_performance(aggregate_sectors(metrics, symbol_sectors))
+            breadth = compute_market_breadth(
+                metrics, benchmark_returns(benchmark['close']) if not benchmark.empty else None
+            )
+
+        with _stage("persist", timings):
+            async with AsyncWriteSessionLocal() as db:
+                await SectorRepository(db).replace_snapshot(run_date, sectors, breadth)
+        invalidate_sector_snapshot()
+
+        logger.info(
+            f"Sector performance complete for {run_date}: {len(sectors)} sectors, "
+            f"{breadth.symbols} of {len(symbols)} symbols in breadth"
+        )
+        for name, seconds in timings.items():
+            logger.info(f"Sector performance stage '{name}' took {seconds:.2f}s")
+
+        return SectorSnapshot(run_date, breadth, sectors, symbol_sectors)
+
+    except Exception as e:
+        logger.error(f"Sector performance failed: {str(e)}")
+        logger.exception("Full traceback:")
+        raise
@@ -0,0 +1,56 @@
+"""
+Live tick ingestion. Runs inside the API process when TICKER_ENABLED is set
+(so analysis can read the live bar and alerts reach /alerts subscribers), or
+standalone to only persist bars:
+
+    python -m src.tradingai.tasks.ticker
+"""
+import asyncio
+import signal
+from loguru import logger
+
+from ..config.logging import LoggingConfig, setup_logging
+from ..config.settings import settings
+from ..container import AppContainer, init_container, close_container
+from ..domain.bar_builder import BarBuilder
+from ..domain.signal_evaluator import SignalEvaluator
+from ..repository.database import AsyncSessionLocal
+from ..repository.kite_ticker import KiteTickerClient
+from ..service.tick_ingestion_service import TickIngestionService, resolve_tokens, seed_evaluator, set_bar_builder
+
+async def run_ticker(container: AppContainer) -> None:
+    """Subscribe to the configured instruments and build live bars until cancelled"""
+    async with AsyncSessionLocal() as db:
+        index = await container.instrument_service(db).get_symbol_index()
+    tokens = resolve_tokens(index, settings.TICKER_SYMBOLS, settings.TICKER_MAX_TOKENS)
+    evaluator = None
+    if settings.SIGNAL_ALERTS_ENABLED and tokens:
+        evaluator = SignalEvaluator(settings.ALERT_VOLUME_SPIKE_RATIO)
+        async with AsyncSessionLocal() as db:
+            await seed_evaluator(evaluator, db, list(tokens.values()))
+    builder = BarBuilder(settings.TICKER_MINUTE_BARS)
+    service = TickIngestionService(
+        KiteTickerClient(session=container.http_session), builder, evaluator=evaluator
+    )
+    set_bar_builder(builder)
+    try:
+        await service.run(tokens)
+    finally:
+        set_bar_builder(None)
+
+async def main() -> None:
+    container = init_container()
+    task = asyncio.create_task(run_ticker(container))
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, task.cancel)
+    try:
+        await task
+    except asyncio.CancelledError:
+        logger.info("Ticker stopped")
+    finally:
+        await close_container()
+
+if __name__ == "__main__":
+    setup_logging(LoggingConfig.from_settings(settings))
+    asyncio.run(main())
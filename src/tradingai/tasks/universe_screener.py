@@ -0,0 +1,100 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date
+from typing import Dict, List, Optional
+from loguru import logger
+
+from ..config.settings import settings
+from ..container import init_container
+from ..domain.screener import (
+    ScreenCandidate,
+    ScreenCriteria,
+    Shortlist,
+    compute_screen_indicators,
+    filter_stage2,
+    to_candidates,
+)
+from ..repository.database import AsyncSessionLocal, AsyncWriteSessionLocal
+from ..repository.screener_repository import ScreenerRepository
+from ..repository.stock_repository import StockRepository
+
+@contextmanager
+def _stage(name: str, timings: Dict[str, float]):
+    """Accumulate wall time spent in a pipeline stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] += time.perf_counter() - start
+
+async def run_universe_screener(
+    run_date: Optional[date] = None,
+    ingest: Optional[bool] = None
+) -> List[ScreenCandidate]:
+    """
+    Screen the NSE equity universe for Stage-2 uptrend candidates.
+    Symbols are processed in fixed-size chunks and only the top
+    SCREENER_SHORTLIST_SIZE candidates are retained, so memory stays
+    bounded regardless of universe size.
+    """
+    run_date = run_date or date.today()
+    ingest = settings.SCREENER_INGEST if ingest is None else ingest
+    criteria = ScreenCriteria(min_volume_ratio=settings.SCREENER_MIN_VOLUME_RATIO)
+    chunk_size = settings.SCREENER_CHUNK_SIZE
+    timings: Dict[str, float] = defaultdict(float)
+    shortlist = Shortlist(settings.SCREENER_SHORTLIST_SIZE)
+    screened = 0
+    
+    # Ingestion checks for existing rows before inserting, so it must not read a lagging replica
+    session_factory = AsyncWriteSessionLocal if ingest else AsyncSessionLocal
+    try:
+        async with session_factory() as db:
+            container = init_container()
+            instrument_service = container.instrument_service(db)
+            stock_repo = StockRepository(db)
+            stock_service = container.stock_service(db) if ingest else None
+            
+            with _stage("universe", timings):
+                symbols = await instrument_service.get_equity_symbols()
+            logger.info(f"Screening {len(symbols)} symbols in chunks of {chunk_size}")
+            
+            for start in range(0, len(symbols), chunk_size):
+                chunk = symbols[start:start + chunk_size]
+                
+                if stock_service is not None:
+                    with _stage("ingest", timings):
+                        await stock_service.fetch_daily_update(chunk)
+                
+                with _stage("load", timings):
+                    panel = await stock_repo.get_stock_panel(
+                        chunk, lookback_days=settings.SCREENER_LOOKBACK_DAYS
+                    )
+                with _stage("indicators", timings):
+                    indicators = compute_screen_indicators(panel)
+                with _stage("filter", timings):
+                    candidates = filter_stage2(indicators, criteria)
+                with _stage("rank", timings):
+                    shortlist.add(to_candidates(candidates))
+                
+                screened += indicators.shape[0]
+                logger.debug(f"Screened chunk {start // chunk_size + 1}: {len(candidates)} candidates")
+            
+            ranked = shortlist.ranked()
+            
+            with _stage("persist", timings):
+                await ScreenerRepository(db).replace_shortlist(run_date, ranked)
+        
+        logger.info(
+            f"Universe screener complete for {run_date}: {screened} screened, "
+            f"{len(ranked)} shortlisted"
+        )
+        for name, seconds in timings.items():
+            logger.info(f"Screener stage '{name}' took {seconds:.2f}s")
+        
+        return ranked
+        
+    except Exception as e:
+        logger.error(f"Universe screener failed: {str(e)}")
+        logger.exception("Full traceback:")
+        raise
@@ -0,0 +1,157 @@
+"""
+Ingestion worker. Run separately from the API process:
+
+    python -m src.tradingai.tasks.worker
+"""
+import asyncio
+import os
+import signal
+import socket
+from datetime import datetime
+from typing import Optional
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.logging import LoggingConfig, setup_logging
+from ..config.settings import settings
+from ..container import init_container, close_container
+from ..domain.models import Job
+from ..repository.database import AsyncWriteSessionLocal
+from ..repository.job_repository import JobLockLost, JobRepository
+from ..service.job_service import (
+    JOB_HISTORICAL, JOB_DAILY_UPDATE, JOB_UNIVERSE_SCREENER, JOB_RELATIVE_STRENGTH, JOB_SECTOR_PERFORMANCE
+)
+from .relative_strength import run_relative_strength
+from .sector_performance import run_sector_performance
+from .universe_screener import run_universe_screener
+
+async def _run_symbol_job(db: AsyncSession, job: Job) -> None:
+    """Run a per-symbol ingestion job, resuming after the last checkpoint"""
+    job_repo = JobRepository(db)
+    symbols = job.payload["symbols"]
+    completed = set(job.completed_symbols or [])
+    remaining = [s for s in symbols if s not in completed]
+    if completed:
+        logger.info(f"Resuming job {job.id}: {len(completed)} done, {len(remaining)} remaining")
+    
+    async def checkpoint(symbol: str, records: int) -> None:
+        await job_repo.checkpoint(job.id, job.locked_by, symbol, records)
+    
+    stock_service = init_container().stock_service(db)
+    
+    if job.job_type == JOB_HISTORICAL:
+        await stock_service.fetch_and_store_historical_data(
+            remaining,
+            datetime.fromisoformat(job.payload["from_date"]),
+            datetime.fromisoformat(job.payload["to_date"]),
+            on_symbol_complete=checkpoint
+        )
+    else:
+        await stock_service.fetch_daily_update(remaining, on_symbol_complete=checkpoint)
+    
+    # Symbols that errored were not checkpointed; fail so the retry picks them up
+    job = await job_repo.get(job.id)
+    completed = set(job.completed_symbols or [])
+    incomplete = [s for s in symbols if s not in completed]
+    if incomplete:
+        raise RuntimeError(f"{len(incomplete)} symbols incomplete: {incomplete}")
+
+async def run_job(db: AsyncSession, job: Job) -> None:
+    """Dispatch a claimed job to its handler"""
+    if job.job_type in (JOB_HISTORICAL, JOB_DAILY_UPDATE):
+        await _run_symbol_job(db, job)
+    elif job.job_type == JOB_UNIVERSE_SCREENER:
+        await run_universe_screener()
+    elif job.job_type == JOB_RELATIVE_STRENGTH:
+        await run_relative_strength()
+    elif job.job_type == JOB_SECTOR_PERFORMANCE:
+        await run_sector_performance()
+    else:
+        raise ValueError(f"Unknown job type: {job.job_type}")
+
+async def _heartbeat(job_id: int, worker_id: str, job_task: asyncio.Task, lock_lost: asyncio.Event) -> None:
+    """
+    Keep a running job's lock fresh so it is not reclaimed mid-run, and
+    cancel the job once another worker has reclaimed it.
+    Uses its own session; the job's session is busy with the job itself.
+    """
+    while True:
+        await asyncio.sleep(settings.JOB_HEARTBEAT_INTERVAL_SECONDS)
+        try:
+            async with AsyncWriteSessionLocal() as db:
+                if not await JobRepository(db).heartbeat(job_id, worker_id):
+                    logger.warning(f"Worker {worker_id} lost the lock on job {job_id}, stopping it")
+                    lock_lost.set()
+                    job_task.cancel()
+                    return
+        except Exception as e:
+            logger.error(f"Heartbeat for job {job_id} failed: {str(e)}")
+
+async def process_next_job(worker_id: str) -> bool:
+    """
+    Claim and run a single job.
+    Returns:
+        True if a job was processed, False if the queue was empty
+    """
+    async with AsyncWriteSessionLocal() as db:
+        job = await JobRepository(db).claim_next(worker_id)
+    if job is None:
+        return False
+    
+    logger.info(f"Worker {worker_id} running {job.job_type} job {job.id} (attempt {job.attempts})")
+    async with AsyncWriteSessionLocal() as db:
+        job_repo = JobRepository(db)
+        lock_lost = asyncio.Event()
+        job_task = asyncio.create_task(run_job(db, job))
+        heartbeat = asyncio.create_task(_heartbeat(job.id, worker_id, job_task, lock_lost))
+        try:
+            try:
+                await job_task
+            finally:
+                heartbeat.cancel()
+            if await job_repo.complete(job.id, worker_id):
+                logger.info(f"Job {job.id} completed")
+        except asyncio.CancelledError:
+            if not lock_lost.is_set():
+                raise
+            logger.warning(f"Job {job.id} stopped after worker {worker_id} lost its lock")
+            await db.rollback()
+        except JobLockLost as e:
+            logger.warning(f"Job {job.id} stopped: {str(e)}")
+            await db.rollback()
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {str(e)}")
+            await db.rollback()
+            await job_repo.fail(job.id, worker_id, str(e))
+    return True
+
+async def run_worker(worker_id: Optional[str] = None) -> None:
+    """Poll the job queue until SIGINT/SIGTERM, finishing the current job first"""
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    
+    init_container()
+    logger.info(f"Worker {worker_id} started")
+    try:
+        while not stop.is_set():
+            try:
+                if await process_next_job(worker_id):
+                    continue
+            except Exception as e:
+                logger.error(f"Worker {worker_id} error: {str(e)}")
+                logger.exception("Full traceback:")
+            
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=settings.JOB_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        await close_container()
+    logger.info(f"Worker {worker_id} stopped")
+
+if __name__ == "__main__":
+    setup_logging(LoggingConfig.from_settings(settings))
+    asyncio.run(run_worker())
@@ -0,0 +1,67 @@
+import pytest
+import pandas as pd
+
+from tradingai.domain.candle_patterns import (
+    detect_candle_patterns,
+    detect_candle_patterns_bulk,
+    label_candles,
+)
+
+def make_frame(candles):
+    index = pd.date_range("2024-01-01", periods=len(candles), freq="D", tz="UTC", name="timestamp")
+    return pd.DataFrame(candles, columns=["open", "high", "low", "close"], index=index)
+
+def test_label_candles():
+    """Body above half the range is MC, otherwise IC"""
+    df = make_frame([
+        (100, 110, 99, 109),   # MC
+        (100, 110, 90, 101),   # IC
+        (100, 100, 100, 100),  # zero range -> IC
+    ])
+    assert list(label_candles(df)) == ["MC", "IC", "IC"]
+
+def test_latest_group_levels():
+    """Entry/stop levels come from the most recent multi-candle group"""
+    df = make_frame([
+        (100, 110, 99, 109),   # MC
+        (109, 115, 108, 114),  # MC
+        (114, 118, 108, 113),  # IC
+        (113, 117, 109, 114),  # IC
+    ])
+    patterns = detect_candle_patterns(df)
+
+    assert patterns.labels == ["MC", "MC", "IC", "IC"]
+    assert [g.length for g in patterns.groups] == [2, 2]
+    assert patterns.latest_group.candle_type == "IC"
+    assert patterns.bullish_entry == 118
+    assert patterns.bullish_stop == 108
+    assert patterns.bearish_entry == 108
+    assert patterns.bearish_stop == 118
+
+def test_no_clear_group_when_alternating():
+    """Alternating IC/MC candles never form a group"""
+    df = make_frame([
+        (100, 110, 99, 109),   # MC
+        (100, 110, 90, 101),   # IC
+        (100, 110, 99, 109),   # MC
+    ])
+    patterns = detect_candle_patterns(df)
+    assert not patterns.has_clear_group
+    assert patterns.bullish_stop is None
+
+def test_bulk_groups_do_not_span_symbols():
+    """Groups are computed independently per symbol"""
+    a = make_frame([(100, 110, 99, 109), (109, 115, 108, 114)]).assign(symbol="AAA")
+    b = make_frame([(50, 55, 49, 54), (54, 56, 44, 55)]).assign(symbol="BBB")
+
+    result = detect_candle_patterns_bulk(pd.concat([a, b]))
+
+    assert result["AAA"].latest_group.length == 2
+    assert not result["BBB"].has_clear_group
+    assert result["BBB"].labels == ["MC", "IC"]
+
+def test_lookback_limits_candles():
+    df = make_frame([(100, 110, 99, 109)] * 15)
+    patterns = detect_candle_patterns(df, lookback=10)
+    assert len(patterns.labels) == 10
+    assert patterns.latest_group.length == 10
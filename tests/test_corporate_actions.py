@@ -0,0 +1,85 @@
+from datetime import date
+from unittest.mock import AsyncMock, patch
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingai.domain.corporate_actions import (
+    AdjustmentCache,
+    adjustment_factor,
+    set_adjustment_cache,
+    get_adjustment_cache,
+)
+from tradingai.domain.symbol_index import InstrumentEntry, SymbolIndex
+from tradingai.domain.timeframes import SeriesCache, get_series_cache, set_series_cache
+from tradingai.service.corporate_action_service import CorporateActionService
+
+def make_frame() -> pd.DataFrame:
+    """Daily bars across a 1:5 split on Jan 4; stored at IST midnight in UTC like stock_data"""
+    index = pd.DatetimeIndex(pd.date_range("2024-01-01", periods=6, tz="Asia/Kolkata").tz_convert("UTC"), name="timestamp")
+    close = [500.0, 505.0, 510.0, 102.0, 103.0, 104.0]
+    return pd.DataFrame({
+        "open": close, "high": close, "low": close, "close": close,
+        "volume": [1000, 1000, 1000, 5000, 5000, 5000]
+    }, index=index)
+
+def test_adjustment_factor():
+    assert adjustment_factor("split", "1:5") == pytest.approx(0.2)
+    assert adjustment_factor("bonus", "1:2") == pytest.approx(2 / 3)
+    assert adjustment_factor("adjustment", factor=0.97) == 0.97
+    with pytest.raises(ValueError):
+        adjustment_factor("split", "5")
+    with pytest.raises(ValueError):
+        adjustment_factor("dividend", "1:1")
+
+def test_adjust_frame_removes_split_gap():
+    cache = AdjustmentCache()
+    cache.load([("ZOTA", date(2024, 1, 4), 0.2)])
+    df = cache.adjust_frame("ZOTA", make_frame(), as_of=date(2024, 1, 10))
+
+    assert df["close"].tolist() == pytest.approx([100.0, 101.0, 102.0, 102.0, 103.0, 104.0])
+    assert df["volume"].tolist() == [5000] * 6
+
+def test_factors_compound_and_ignore_future_actions():
+    cache = AdjustmentCache()
+    cache.load([("ZOTA", date(2024, 1, 5), 0.5), ("ZOTA", date(2024, 1, 3), 0.2), ("ZOTA", date(2024, 2, 1), 0.1)])
+    dates = np.array(["2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"], dtype="datetime64[D]")
+
+    factors = cache.factors("ZOTA", dates, as_of=date(2024, 1, 10))
+    assert factors.tolist() == pytest.approx([0.1, 0.5, 0.5, 1.0])
+    assert cache.factors("ZOTA", dates, as_of=date(2024, 1, 2)) is None
+    assert cache.factors("OTHER", dates) is None
+
+def test_adjust_panel_only_touches_symbols_with_actions():
+    cache = AdjustmentCache()
+    cache.load([("ZOTA", date(2024, 1, 4), 0.2)])
+    frame = make_frame().reset_index()
+    panel = pd.concat([frame.assign(symbol="ZOTA"), frame.assign(symbol="TCS")], ignore_index=True)
+
+    cache.adjust_panel(panel, as_of=date(2024, 1, 10))
+
+    assert panel.loc[panel["symbol"] == "ZOTA", "close"].iloc[0] == pytest.approx(100.0)
+    assert panel.loc[panel["symbol"] == "TCS", "close"].iloc[0] == 500.0
+
+@pytest.mark.asyncio
+async def test_recording_an_action_invalidates_caches():
+    series_cache = SeriesCache()
+    series_cache.put("ZOTA", make_frame())
+    set_series_cache(series_cache)
+    adjustments = AdjustmentCache()
+    adjustments.load([])
+    set_adjustment_cache(adjustments)
+    try:
+        service = CorporateActionService(AsyncMock())
+        index = SymbolIndex([InstrumentEntry("ZOTA", 12345)])
+        with patch.object(service.instrument_service, "get_symbol_index", AsyncMock(return_value=index)), \
+             patch.object(service.repo, "record_action", new_callable=AsyncMock) as record:
+            await service.record_action("zota", date(2024, 1, 4), "split", "1:5")
+
+        assert record.call_args.args[0] == "ZOTA"
+        assert record.call_args.args[3] == pytest.approx(0.2)
+        assert get_series_cache().get("ZOTA") is None
+        assert get_adjustment_cache().is_stale()
+    finally:
+        set_series_cache(None)
+        set_adjustment_cache(None)
@@ -0,0 +1,52 @@
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from tradingai.domain.models import Instrument
+from tradingai.repository.database import ReplicaHealth, RoutingSession
+from tradingai.repository.job_repository import JobRepository
+
+primary = create_async_engine("postgresql+asyncpg://user@primary/tradingai").sync_engine
+replica = create_async_engine("postgresql+asyncpg://user@replica/tradingai").sync_engine
+
+def make_session(health=None):
+    return RoutingSession(primary=primary, replica=replica, replica_health=health)
+
+def test_plain_selects_go_to_replica():
+    session = make_session()
+    assert session.get_bind(clause=select(Instrument)) is replica
+
+def test_writes_and_locking_reads_go_to_primary():
+    assert make_session().get_bind(clause=insert(Instrument)) is primary
+    assert make_session().get_bind(clause=select(Instrument).with_for_update()) is primary
+    assert make_session().get_bind(clause=text("SELECT 1")) is primary
+    assert make_session().get_bind() is primary
+
+def test_session_stays_on_primary_after_write():
+    session = make_session()
+    session.get_bind(clause=insert(Instrument))
+    assert session.get_bind(clause=select(Instrument)) is primary
+
+def test_unhealthy_replica_falls_back_to_primary():
+    health = ReplicaHealth(retry_seconds=60)
+    health.mark_failed()
+    assert make_session(health).get_bind(clause=select(Instrument)) is primary
+    health.retry_seconds = 0
+    assert make_session(health).get_bind(clause=select(Instrument)) is replica
+
+def test_without_replica_everything_uses_primary():
+    session = RoutingSession(primary=primary)
+    assert session.get_bind(clause=select(Instrument)) is primary
+
+def test_use_primary_option_keeps_a_select_on_primary():
+    session = make_session()
+    assert session.get_bind(clause=select(Instrument).execution_options(use_primary=True)) is primary
+    assert make_session().get_bind(clause=select(Instrument).execution_options(populate_existing=True)) is replica
+
+@pytest.mark.asyncio
+async def test_job_status_reads_use_primary():
+    db = AsyncMock()
+    db.execute.return_value = MagicMock()
+    await JobRepository(db).get(1)
+    assert make_session().get_bind(clause=db.execute.call_args.args[0]) is primary
@@ -0,0 +1,119 @@
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import patch
+import aiohttp
+import pytest
+from aiohttp.test_utils import TestServer
+
+from tradingai.devtools.fake_kite import FakeKiteConfig, create_app
+from tradingai.domain.symbol_index import InstrumentEntry, SymbolIndex
+from tradingai.repository.instrument_repository import InstrumentRepository
+from tradingai.repository.zerodha import ZerodhaClient
+from tradingai.repository.zerodha_auth_repository import ZerodhaAuthRepository
+from tradingai.config.settings import settings
+from tradingai.service.instrument_service import InstrumentService, set_symbol_index
+
+@pytest.mark.asyncio
+async def test_clients_against_fake_kite():
+    async with TestServer(create_app(FakeKiteConfig(instruments=120, historical_rate_limit=0))) as server:
+        base_url = str(server.make_url("")).rstrip("/")
+        async with aiohttp.ClientSession() as session:
+            repository = InstrumentRepository(session=session)
+            repository.base_url = base_url
+            instruments = await repository.fetch_instruments()
+            assert len(instruments) == 12  # 10 NSE equities plus NIFTY 50 and NIFTY BANK
+            assert instruments[0]["tradingsymbol"] == "RELIANCE"
+
+            set_symbol_index(SymbolIndex([
+                InstrumentEntry(i["tradingsymbol"], i["instrument_token"], i["name"], i["exchange"], i["instrument_type"])
+                for i in instruments
+            ]))
+            try:
+                client = ZerodhaClient(session=session)
+                client.base_url = base_url
+                candles = await client.fetch_historical_data("TCS", datetime(2024, 1, 1), datetime(2024, 1, 31))
+            finally:
+                set_symbol_index(None)
+            assert len(candles) == 21  # 26 Jan and 22 Jan are NSE holidays
+            assert candles[0].timestamp == datetime(2024, 1, 1)
+
+        auth = ZerodhaAuthRepository()
+        auth.base_url = base_url
+        token = await auth.exchange_token("abc")
+        assert token["data"]["access_token"] == "fake-abc"
+
+@pytest.mark.asyncio
+async def test_synced_benchmark_index_can_be_fetched():
+    """The RS benchmark comes through the instrument sync and resolves to a token, but is not an equity"""
+    async with TestServer(create_app(FakeKiteConfig(instruments=24, historical_rate_limit=0))) as server:
+        base_url = str(server.make_url("")).rstrip("/")
+        async with aiohttp.ClientSession() as session:
+            repository = InstrumentRepository(session=session)
+            repository.base_url = base_url
+            instruments = await repository.fetch_instruments()
+
+            set_symbol_index(SymbolIndex([
+                InstrumentEntry(
+                    i["tradingsymbol"], i["instrument_token"], i["name"], i["exchange"], i["instrument_type"], i["segment"]
+                )
+                for i in instruments
+            ]))
+            try:
+                service = InstrumentService(None, None)
+                assert (await service.validate_symbols([settings.RS_BENCHMARK_SYMBOL]))[0]
+                assert settings.RS_BENCHMARK_SYMBOL not in await service.get_equity_symbols()
+
+                client = ZerodhaClient(session=session)
+                client.base_url = base_url
+                candles = await client.fetch_historical_data(
+                    settings.RS_BENCHMARK_SYMBOL, datetime(2024, 1, 1), datetime(2024, 1, 31)
+                )
+            finally:
+                set_symbol_index(None)
+            assert len(candles) == 21
+
+@pytest.mark.asyncio
+async def test_client_loads_the_symbol_index_on_demand():
+    """A client without an instrument service loads the index itself instead of failing the lookup"""
+    async with TestServer(create_app(FakeKiteConfig(instruments=24, historical_rate_limit=0))) as server:
+        base_url = str(server.make_url("")).rstrip("/")
+        async with aiohttp.ClientSession() as session:
+            repository = InstrumentRepository(session=session)
+            repository.base_url = base_url
+            instruments = await repository.fetch_instruments()
+
+            async def load_symbol_index(self):
+                index = SymbolIndex(
+                    InstrumentEntry(i["tradingsymbol"], i["instrument_token"], i["name"], i["exchange"], i["instrument_type"])
+                    for i in instruments
+                )
+                set_symbol_index(index)
+                return index
+
+            @asynccontextmanager
+            async def no_session():
+                yield None
+
+            set_symbol_index(None)
+            try:
+                with patch("tradingai.repository.zerodha.AsyncSessionLocal", no_session), \
+                     patch.object(InstrumentService, "load_symbol_index", load_symbol_index):
+                    client = ZerodhaClient(session=session)
+                    client.base_url = base_url
+                    candles = await client.fetch_historical_data("TCS", datetime(2024, 1, 1), datetime(2024, 1, 31))
+            finally:
+                set_symbol_index(None)
+            assert len(candles) == 21
+
+@pytest.mark.asyncio
+async def test_fake_kite_throttles_historical_calls():
+    async with TestServer(create_app(FakeKiteConfig(instruments=12, historical_rate_limit=2))) as server:
+        async with aiohttp.ClientSession() as session:
+            url = server.make_url("/instruments/historical/1/day")
+            params = {"from": "2024-01-01 00:00:00", "to": "2024-01-05 00:00:00"}
+            headers = {"Authorization": "token key:access"}
+            statuses = []
+            for _ in range(3):
+                async with session.get(url, params=params, headers=headers) as response:
+                    statuses.append(response.status)
+            assert statuses == [200, 200, 429]
@@ -0,0 +1,74 @@
+import pytest
+from datetime import date, datetime
+import pytz
+
+from tradingai.domain.trading_calendar import TradingCalendar
+from tradingai.domain.gap_planner import DateRange, find_missing_ranges, merge_ranges, plan_backfill
+
+@pytest.fixture
+def calendar():
+    # Wednesday 2024-01-03 is a holiday for these tests
+    return TradingCalendar(holidays=[date(2024, 1, 3)])
+
+def test_sessions_skip_weekends_and_holidays(calendar):
+    sessions = calendar.sessions(date(2024, 1, 1), date(2024, 1, 8))
+    assert sessions == [
+        date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 4),
+        date(2024, 1, 5), date(2024, 1, 8)
+    ]
+
+def test_last_complete_session(calendar):
+    ist = pytz.timezone('Asia/Kolkata')
+    # Before close on Thursday the last complete session is Tuesday (Wednesday is a holiday)
+    assert calendar.last_complete_session(ist.localize(datetime(2024, 1, 4, 10, 0))) == date(2024, 1, 2)
+    assert calendar.last_complete_session(ist.localize(datetime(2024, 1, 4, 16, 0))) == date(2024, 1, 4)
+    # Sunday falls back to Friday
+    assert calendar.last_complete_session(ist.localize(datetime(2024, 1, 7, 12, 0))) == date(2024, 1, 5)
+
+def test_find_missing_ranges_treats_holidays_as_contiguous(calendar):
+    sessions = calendar.sessions(date(2024, 1, 1), date(2024, 1, 8))
+    missing = find_missing_ranges(sessions, existing={date(2024, 1, 1), date(2024, 1, 8)})
+    assert missing == [DateRange(date(2024, 1, 2), date(2024, 1, 5))]
+
+def test_fully_stored_range_needs_no_requests(calendar):
+    sessions = set(calendar.sessions(date(2024, 1, 1), date(2024, 1, 31)))
+    assert plan_backfill(calendar, date(2024, 1, 1), date(2024, 1, 31), sessions, 365) == []
+
+def test_nearby_gaps_are_merged_into_one_request(calendar):
+    existing = set(calendar.sessions(date(2024, 1, 1), date(2024, 1, 31)))
+    existing -= {date(2024, 1, 2), date(2024, 1, 8)}
+    plan = plan_backfill(calendar, date(2024, 1, 1), date(2024, 1, 31), existing, 365, max_gap_sessions=3)
+    assert plan == [DateRange(date(2024, 1, 2), date(2024, 1, 8))]
+
+def test_distant_gaps_are_requested_separately(calendar):
+    existing = set(calendar.sessions(date(2024, 1, 1), date(2024, 1, 31)))
+    existing -= {date(2024, 1, 2), date(2024, 1, 30)}
+    plan = plan_backfill(calendar, date(2024, 1, 1), date(2024, 1, 31), existing, 365, max_gap_sessions=3)
+    assert plan == [DateRange(date(2024, 1, 2), date(2024, 1, 2)), DateRange(date(2024, 1, 30), date(2024, 1, 30))]
+
+def test_long_ranges_are_split():
+    plan = merge_ranges([DateRange(date(2024, 1, 1), date(2024, 1, 25))], max_span_days=10)
+    assert plan == [
+        DateRange(date(2024, 1, 1), date(2024, 1, 10)),
+        DateRange(date(2024, 1, 11), date(2024, 1, 20)),
+        DateRange(date(2024, 1, 21), date(2024, 1, 25)),
+    ]
+    assert all(r.span_days <= 10 for r in plan)
+
+def test_nse_calendar_covers_2026():
+    calendar = TradingCalendar()
+    assert not calendar.is_trading_day(date(2026, 10, 20))  # Dussehra
+    assert calendar.is_trading_day(date(2026, 10, 19))
+    assert 2026 in calendar.covered_years
+
+def test_uncovered_year_warns_once(calendar):
+    from loguru import logger
+    messages = []
+    sink = logger.add(messages.append, level="WARNING")
+    try:
+        calendar.sessions(date(2024, 12, 30), date(2025, 1, 3))
+        calendar.sessions(date(2025, 1, 6), date(2025, 1, 10))
+    finally:
+        logger.remove(sink)
+    assert len(messages) == 1
+    assert "2025" in messages[0]
@@ -0,0 +1,29 @@
+import pytest
+
+from tradingai.repository.instrument_repository import parse_instrument_stream
+
+CSV = (
+    "instrument_token,exchange_token,tradingsymbol,name,last_price,expiry,strike,tick_size,lot_size,instrument_type,segment,exchange\r\n"
+    "408065,1594,INFY,INFOSYS,0,,0,0.05,1,EQ,NSE,NSE\r\n"
+    "256265,1001,NIFTY 50,NIFTY 50,0,,0,0,0,EQ,INDICES,NSE\r\n"
+    "12345,48,NIFTY24JANFUT,NIFTY,0,2024-01-25,0,0.05,50,FUT,NFO-FUT,NFO\r\n"
+    "2953217,11536,TCS,\"TATA CONSULTANCY SERVICES, LTD\",0,,0,0.05,1,EQ,NSE,NSE\r\n"
+    "500112,500112,SBIN,STATE BANK,0,,0,0.05,1,EQ,BSE,BSE"
+).encode()
+
+async def chunked(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [7, 64, 10_000])
+async def test_parse_instrument_stream_filters_segments(chunk_size):
+    """Rows split across chunks are reassembled and only NSE equity and index rows are kept"""
+    batches = [b async for b in parse_instrument_stream(chunked(CSV, chunk_size), batch_size=1)]
+    instruments = [i for batch in batches for i in batch]
+
+    assert [i["tradingsymbol"] for i in instruments] == ["INFY", "NIFTY 50", "TCS"]
+    assert instruments[1]["segment"] == "INDICES"
+    assert instruments[2]["name"] == "TATA CONSULTANCY SERVICES, LTD"
+    assert instruments[0]["instrument_token"] == 408065
+    assert instruments[0]["tick_size"] == 0.05
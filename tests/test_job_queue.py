@@ -0,0 +1,174 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+import pytz
+from sqlalchemy.dialects import postgresql
+
+from tradingai.config.settings import settings
+from tradingai.domain.models import Job, JobStatus
+from tradingai.repository.job_repository import JobLockLost, JobRepository
+from tradingai.service.job_service import JOB_DAILY_UPDATE, JOB_UNIVERSE_SCREENER
+from tradingai.tasks import worker
+
+def make_job(**values) -> Job:
+    defaults = dict(
+        id=7, job_type=JOB_DAILY_UPDATE, status=JobStatus.RUNNING, payload={"symbols": ["TCS", "INFY", "SBIN"]},
+        completed_symbols=[], attempts=1, max_attempts=3, locked_by="worker-1"
+    )
+    return Job(**{**defaults, **values})
+
+def make_db(job=None) -> AsyncMock:
+    db = AsyncMock()
+    db.add = MagicMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = job
+    db.execute.return_value = result
+    return db
+
+def compiled(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+@pytest.mark.asyncio
+async def test_enqueue_adds_a_runnable_job():
+    db = make_db()
+    job = await JobRepository(db).enqueue(JOB_DAILY_UPDATE, {"symbols": ["TCS"]}, total_symbols=1)
+
+    db.add.assert_called_once_with(job)
+    db.commit.assert_awaited_once()
+    assert job.status == JobStatus.QUEUED
+    assert job.completed_symbols == []
+    assert job.max_attempts == settings.JOB_MAX_ATTEMPTS
+    assert job.run_after <= datetime.now(pytz.UTC)
+
+@pytest.mark.asyncio
+async def test_claim_skips_locked_rows_and_reclaims_stale_ones():
+    job = make_job(status=JobStatus.QUEUED, attempts=0)
+    db = make_db(job)
+    before = datetime.now(pytz.UTC)
+    claimed = await JobRepository(db).claim_next("worker-1")
+
+    query = db.execute.call_args.args[0]
+    sql = compiled(query)
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "jobs.locked_at <" in sql
+    params = query.compile(dialect=postgresql.dialect()).params
+    stale_before = next(v for k, v in params.items() if k.startswith("locked_at"))
+    assert stale_before <= before - timedelta(seconds=settings.JOB_LOCK_TIMEOUT_SECONDS) + timedelta(seconds=1)
+
+    assert claimed is job
+    assert job.status == JobStatus.RUNNING
+    assert job.attempts == 1
+    assert job.locked_by == "worker-1"
+
+@pytest.mark.asyncio
+async def test_claim_returns_none_when_queue_is_empty():
+    db = make_db(None)
+    assert await JobRepository(db).claim_next("worker-1") is None
+    db.commit.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_failed_job_is_requeued_with_backoff():
+    repo = JobRepository(make_db())
+    with patch.object(repo, "get", AsyncMock(return_value=make_job(attempts=2))), \
+         patch.object(repo, "_update", new_callable=AsyncMock) as update:
+        await repo.fail(7, "worker-1", "timeout")
+
+    values = update.call_args.kwargs
+    assert values["status"] == JobStatus.QUEUED
+    assert values["locked_by"] is None
+    backoff = (values["run_after"] - datetime.now(pytz.UTC)).total_seconds()
+    assert backoff == pytest.approx(settings.JOB_RETRY_BACKOFF_SECONDS * 2, abs=5)
+
+@pytest.mark.asyncio
+async def test_job_out_of_attempts_fails_permanently():
+    repo = JobRepository(make_db())
+    with patch.object(repo, "get", AsyncMock(return_value=make_job(attempts=3))), \
+         patch.object(repo, "_update", new_callable=AsyncMock) as update:
+        await repo.fail(7, "worker-1", "timeout")
+
+    assert update.call_args.kwargs["status"] == JobStatus.FAILED
+    assert update.call_args.kwargs["finished_at"] is not None
+
+@pytest.mark.asyncio
+async def test_symbol_job_resumes_after_checkpoint():
+    job = make_job(completed_symbols=["TCS"])
+    stock_service = MagicMock()
+    stock_service.fetch_daily_update = AsyncMock()
+    container = MagicMock()
+    container.stock_service.return_value = stock_service
+    finished = make_job(completed_symbols=["TCS", "INFY", "SBIN"])
+
+    with patch.object(worker, "init_container", return_value=container), \
+         patch.object(JobRepository, "get", AsyncMock(return_value=finished)):
+        await worker._run_symbol_job(AsyncMock(), job)
+
+    assert stock_service.fetch_daily_update.call_args.args[0] == ["INFY", "SBIN"]
+
+@pytest.mark.asyncio
+async def test_running_job_keeps_its_lock_fresh(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_HEARTBEAT_INTERVAL_SECONDS", 0.01)
+
+    @asynccontextmanager
+    async def sessions():
+        yield AsyncMock()
+
+    async def slow_screener():
+        await asyncio.sleep(0.05)
+
+    job = make_job(job_type=JOB_UNIVERSE_SCREENER)
+    with patch.object(worker, "AsyncWriteSessionLocal", sessions), \
+         patch.object(worker, "run_universe_screener", slow_screener), \
+         patch.object(JobRepository, "claim_next", AsyncMock(return_value=job)), \
+         patch.object(JobRepository, "heartbeat", AsyncMock(return_value=True)) as heartbeat, \
+         patch.object(JobRepository, "complete", new_callable=AsyncMock) as complete:
+        assert await worker.process_next_job("worker-1")
+        beats = heartbeat.await_count
+        await asyncio.sleep(0.03)
+
+    assert beats >= 2
+    assert heartbeat.await_count == beats  # Stopped with the job
+    heartbeat.assert_awaited_with(7, "worker-1")
+    complete.assert_awaited_once_with(7, "worker-1")
+
+@pytest.mark.asyncio
+async def test_lost_lock_stops_the_running_job(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_HEARTBEAT_INTERVAL_SECONDS", 0.01)
+    finished = asyncio.Event()
+
+    @asynccontextmanager
+    async def sessions():
+        yield AsyncMock()
+
+    async def endless_screener():
+        await asyncio.sleep(10)
+        finished.set()
+
+    job = make_job(job_type=JOB_UNIVERSE_SCREENER)
+    with patch.object(worker, "AsyncWriteSessionLocal", sessions), \
+         patch.object(worker, "run_universe_screener", endless_screener), \
+         patch.object(JobRepository, "claim_next", AsyncMock(return_value=job)), \
+         patch.object(JobRepository, "heartbeat", AsyncMock(return_value=False)), \
+         patch.object(JobRepository, "complete", new_callable=AsyncMock) as complete, \
+         patch.object(JobRepository, "fail", new_callable=AsyncMock) as fail:
+        assert await asyncio.wait_for(worker.process_next_job("worker-1"), timeout=1)
+
+    assert not finished.is_set()
+    complete.assert_not_awaited()
+    fail.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_updates_require_the_lock():
+    db = make_db()
+    db.execute.return_value.rowcount = 0
+    repo = JobRepository(db)
+
+    with pytest.raises(JobLockLost):
+        await repo.checkpoint(7, "worker-1", "TCS", 10)
+    assert "jobs.locked_by = " in compiled(db.execute.call_args.args[0])
+    assert not await repo.complete(7, "worker-1")
+    assert "jobs.locked_by = " in compiled(db.execute.call_args.args[0])
+
+    with patch.object(repo, "get", AsyncMock(return_value=make_job(locked_by="worker-2"))):
+        assert not await repo.fail(7, "worker-1", "timeout")
@@ -0,0 +1,120 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import patch
+import aiohttp
+import pandas as pd
+import pytest
+import pytz
+from aiohttp.test_utils import TestServer
+
+from tradingai.devtools.fake_ticker import FakeTickerConfig, create_app, pack_full_packet, pack_message
+from tradingai.domain.bar_builder import BarBuilder, append_live_bar
+from tradingai.domain.trading_calendar import IST
+from tradingai.repository.kite_ticker import KiteTickerClient, parse_ticks
+from tradingai.repository.stock_repository import StockRepository
+from tradingai.service.tick_ingestion_service import TickIngestionService
+
+def ist(*args) -> int:
+    return int(IST.localize(datetime(*args)).timestamp())
+
+def test_parse_full_packets():
+    message = pack_message([
+        pack_full_packet(408065, 1523.45, 1000, ist(2024, 1, 2, 9, 15, 3)),
+        pack_full_packet(738561, 2890.1, 250, ist(2024, 1, 2, 9, 15, 4)),
+    ])
+    ticks = parse_ticks(message)
+    assert [t.instrument_token for t in ticks] == [408065, 738561]
+    assert ticks[0].last_price == pytest.approx(1523.45)
+    assert ticks[0].volume_traded == 1000
+    assert ticks[1].exchange_time == ist(2024, 1, 2, 9, 15, 4)
+    assert ticks[0].day_open == pytest.approx(1523.45)
+    assert parse_ticks(b"\x00") == []
+
+def test_daily_bar_uses_session_ohlc_from_packets():
+    """A ticker started mid-session still builds the full day's bar from the packet's open/high/low"""
+    (tick,) = parse_ticks(pack_message([
+        pack_full_packet(408065, 1510.0, 5000, ist(2024, 1, 2, 13, 0), ohlc=(1500.0, 1530.0, 1490.0))
+    ]))
+    builder = BarBuilder()
+    builder.on_ticks([tick], {408065: "INFY"})
+    builder.on_tick("INFY", 1535.0, 5100, ist(2024, 1, 2, 13, 1), 1500.0, 1535.0, 1490.0)
+    day = builder.live_day("INFY")
+    assert (day.open, day.high, day.low, day.close) == (1500.0, 1535.0, 1490.0, 1535.0)
+    assert day.session_ohlc
+
+@pytest.mark.asyncio
+async def test_bars_without_session_ohlc_are_not_stored():
+    builder = BarBuilder()
+    builder.on_tick("TCS", 100.0, 1000, ist(2024, 1, 2, 13, 0))  # LTP mode, joined mid-session
+    builder.on_tick("INFY", 1510.0, 5000, ist(2024, 1, 2, 13, 0), 1500.0, 1530.0, 1490.0)
+    stored = []
+
+    @asynccontextmanager
+    async def sessions():
+        yield None
+
+    async def store_bars(self, bars):
+        stored.extend(bars)
+        return len(bars)
+
+    service = TickIngestionService(ticker=None, builder=builder, session_factory=sessions)
+    with patch.object(StockRepository, "store_bars", store_bars):
+        assert await service.flush(IST.localize(datetime(2024, 1, 2, 15, 31))) == 1
+    assert [bar.symbol for bar in stored] == ["INFY"]
+
+def test_bar_builder_minute_and_daily_bars():
+    builder = BarBuilder(minute_history=2)
+    builder.on_tick("TCS", 100.0, 1000, ist(2024, 1, 2, 9, 15, 1))
+    builder.on_tick("TCS", 102.0, 1100, ist(2024, 1, 2, 9, 15, 30))
+    builder.on_tick("TCS", 99.0, 1150, ist(2024, 1, 2, 9, 15, 59))
+    builder.on_tick("TCS", 101.0, 1300, ist(2024, 1, 2, 9, 16, 0))
+
+    first, live = builder.minute_bars("TCS")
+    assert (first.open, first.high, first.low, first.close, first.volume) == (100.0, 102.0, 99.0, 99.0, 150)
+    assert live.volume == 150
+    day = builder.live_day("TCS")
+    assert (day.open, day.high, day.low, day.close, day.volume) == (100.0, 102.0, 99.0, 101.0, 1300)
+    assert day.timestamp == IST.localize(datetime(2024, 1, 2))
+
+    # Ring buffer keeps only the most recent completed minutes
+    for minute in range(17, 22):
+        builder.on_tick("TCS", 101.0, 1300 + minute, ist(2024, 1, 2, 9, minute, 0))
+    assert len(builder.minute_bars("TCS")) == 3
+
+    assert builder.drain_completed() == []
+    builder.close_sessions(IST.localize(datetime(2024, 1, 2, 15, 31)))
+    (completed,) = builder.drain_completed()
+    assert completed.close == 101.0
+    assert builder.live_day("TCS") is None
+    # A late tick must not reopen the flushed session
+    builder.on_tick("TCS", 105.0, 1400, ist(2024, 1, 2, 15, 40))
+    assert builder.live_day("TCS") is None
+
+def test_append_live_bar():
+    index = pd.DatetimeIndex([pd.Timestamp("2024-01-01 18:30", tz="UTC")], name="timestamp")
+    df = pd.DataFrame({"open": [1.0], "high": [1.0], "low": [1.0], "close": [1.0], "volume": [10]}, index=index)
+    builder = BarBuilder()
+    builder.on_tick("TCS", 2.0, 20, ist(2024, 1, 3, 10, 0))
+    combined = append_live_bar(df, builder.live_day("TCS"))
+    assert len(combined) == 2
+    assert combined.index[-1] == pd.Timestamp("2024-01-02 18:30", tz="UTC")
+    assert append_live_bar(combined, builder.live_day("TCS")) is combined
+
+@pytest.mark.asyncio
+async def test_ticker_client_streams_from_fake_ticker():
+    async with TestServer(create_app(FakeTickerConfig(interval_seconds=0.01))) as server:
+        async with aiohttp.ClientSession() as session:
+            client = KiteTickerClient(session=session, url=str(server.make_url("/")))
+            builder = BarBuilder()
+            symbols = {408065: "INFY", 738561: "RELIANCE"}
+            batches = 0
+            stream = client.stream(list(symbols))
+            async for ticks in stream:
+                builder.on_ticks(ticks, symbols)
+                batches += 1
+                if batches == 3:
+                    break
+            await stream.aclose()
+    assert sorted(builder.symbols) == ["INFY", "RELIANCE"]
+    assert builder.live_minute("INFY").close > 0
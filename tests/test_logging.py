@@ -0,0 +1,39 @@
+import io
+from unittest.mock import patch
+from loguru import logger
+
+from tradingai.config.logging import LogFilter, LoggingConfig, setup_logging
+
+def record(name: str, level: str, line: int = 1, message: str = "msg"):
+    return {"name": name, "level": logger.level(level), "line": line, "message": message, "extra": {}}
+
+def test_module_levels_use_longest_prefix():
+    log_filter = LogFilter("INFO", {"tradingai.repository": "WARNING", "tradingai.repository.zerodha": "DEBUG"}, 0)
+    assert log_filter(record("tradingai.service.stock_service", "INFO"))
+    assert not log_filter(record("tradingai.repository.stock_repository", "INFO"))
+    assert log_filter(record("tradingai.repository.zerodha", "DEBUG"))
+    assert not log_filter(record("tradingai.service.stock_service", "DEBUG"))
+
+def test_rate_limit_applies_per_call_site_and_spares_warnings():
+    log_filter = LogFilter("INFO", {}, rate_limit_per_minute=2)
+    assert [log_filter(record("mod", "INFO", line=10)) for _ in range(3)] == [True, True, False]
+    assert log_filter(record("mod", "INFO", line=11))
+    assert log_filter(record("mod", "WARNING", line=10))
+
+def test_suppressed_count_is_shown_by_each_sink_without_changing_the_message():
+    console = io.StringIO()
+    setup_logging(LoggingConfig(file=None, enqueue=False, rate_limit_per_minute=1), console=console)
+    other = io.StringIO()
+    logger.add(other, format="{message}", level="INFO")
+    try:
+        with patch("tradingai.config.logging.time.monotonic", side_effect=[0.0, 1.0, 100.0]):
+            for _ in range(3):
+                logger.info("tick")
+    finally:
+        logger.remove()
+
+    lines = console.getvalue().splitlines()
+    assert len(lines) == 2
+    assert lines[1].endswith("tick (1 similar messages suppressed)")
+    assert other.getvalue().splitlines() == ["tick"] * 3
+
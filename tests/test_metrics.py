@@ -0,0 +1,44 @@
+import pytest
+
+from tradingai.metrics import MetricsRegistry, timed
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("query_seconds", "Query time", ("query",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, query="a")
+    histogram.observe(0.5, query="a")
+    histogram.observe(5.0, query="a")
+    text = registry.render()
+    assert 'query_seconds_bucket{query="a",le="0.1"} 1' in text
+    assert 'query_seconds_bucket{query="a",le="1"} 2' in text
+    assert 'query_seconds_bucket{query="a",le="+Inf"} 3' in text
+    assert 'query_seconds_count{query="a"} 3' in text
+
+def test_counter_and_timed_decorator():
+    registry = MetricsRegistry()
+    counter = registry.counter("tokens", "Tokens", ("kind",))
+    histogram = registry.histogram("work_seconds", "Work")
+    counter.inc(10, kind="prompt")
+
+    @timed(histogram)
+    def work():
+        return 42
+
+    assert work() == 42
+    text = registry.render()
+    assert "# HELP tokens_total Tokens\n# TYPE tokens_total counter\n" in text
+    assert 'tokens_total{kind="prompt"} 10' in text
+    assert "work_seconds_count 1" in text
+
+@pytest.mark.asyncio
+async def test_disabled_registry_is_a_no_op():
+    registry = MetricsRegistry(enabled=False)
+    histogram = registry.histogram("work_seconds", "Work")
+
+    async def work():
+        return 1
+
+    assert timed(histogram)(work) is work
+    with histogram.time():
+        await work()
+    assert registry.render() == "\n"
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+
+from tradingai.repository.mock_data import MINUTES_PER_SESSION, generate_candles, get_mock_historical_data
+from tradingai.repository.mock_zerodha import MockZerodhaClient, MockZerodhaError
+
+def test_minute_candles_cover_sessions_only():
+    # 2024-01-06/07 is a weekend
+    candles = generate_candles("TCS", datetime(2024, 1, 5), datetime(2024, 1, 8, 23, 59), interval="minute")
+    assert len(candles) == 2 * MINUTES_PER_SESSION
+    assert str(candles.timestamp[0]) == "2024-01-05T09:15"
+    assert str(candles.timestamp[-1]) == "2024-01-08T15:29"
+
+def test_candles_are_seeded_and_consistent():
+    a = generate_candles("TCS", datetime(2024, 1, 1), datetime(2024, 3, 31), seed=7)
+    b = generate_candles("TCS", datetime(2024, 1, 1), datetime(2024, 3, 31), seed=7)
+    other = generate_candles("INFY", datetime(2024, 1, 1), datetime(2024, 3, 31), seed=7)
+    assert np.array_equal(a.close, b.close)
+    assert not np.array_equal(a.close, other.close)
+    assert (a.high >= np.maximum(a.open, a.close)).all()
+    assert (a.low <= np.minimum(a.open, a.close)).all()
+    assert (a.volume > 0).all()
+
+@pytest.mark.asyncio
+async def test_mock_client_injects_errors():
+    client = MockZerodhaClient(latency_seconds=0, error_rate=1.0)
+    with pytest.raises(MockZerodhaError):
+        await client.fetch_historical_data("TCS", datetime(2024, 1, 1), datetime(2024, 1, 10))
+
+    rows = await MockZerodhaClient(latency_seconds=0, error_rate=0).fetch_historical_data(
+        "TCS", datetime(2024, 1, 1), datetime(2024, 1, 10)
+    )
+    assert len(rows) == 8
+    assert isinstance(rows[0].timestamp, datetime)
+
+@pytest.mark.parametrize("interval, a, b, c", [
+    ("day", datetime(2024, 1, 1), datetime(2024, 2, 15), datetime(2024, 3, 31)),
+    ("minute", datetime(2024, 1, 4), datetime(2024, 1, 5, 12, 0), datetime(2024, 1, 9, 23, 59)),
+])
+def test_split_ranges_continue_the_same_walk(interval, a, b, c):
+    whole = generate_candles("TCS", a, c, interval=interval, seed=3)
+    first = generate_candles("TCS", a, b - timedelta(minutes=1), interval=interval, seed=3)
+    second = generate_candles("TCS", b, c, interval=interval, seed=3)
+    for field in ("timestamp", "open", "high", "low", "close", "volume"):
+        assert np.array_equal(getattr(whole, field), np.concatenate([getattr(first, field), getattr(second, field)]))
+
+def test_mock_historical_data_defaults_to_daily_candles():
+    candles = get_mock_historical_data("TCS", datetime(2024, 1, 1), datetime(2024, 1, 10))["data"]["candles"]
+    assert len(candles) == 8
@@ -0,0 +1,14 @@
+import time
+import pytest
+
+from tradingai.repository.rate_limiter import AsyncRateLimiter
+
+@pytest.mark.asyncio
+async def test_rate_limiter_waits_for_window():
+    limiter = AsyncRateLimiter(calls=2, period=0.2)
+    start = time.monotonic()
+    await limiter.acquire()
+    await limiter.acquire()
+    assert time.monotonic() - start < 0.1
+    await limiter.acquire()
+    assert time.monotonic() - start >= 0.19
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingai.domain.relative_strength import compute_rs_ratios, rank_relative_strength, to_relative_strength
+
+SESSIONS = 300
+
+@pytest.fixture
+def timestamps():
+    return pd.date_range("2023-01-02 18:30", periods=SESSIONS, freq="B", tz="UTC")
+
+def panel_for(timestamps, closes: dict) -> pd.DataFrame:
+    frames = [
+        pd.DataFrame({"symbol": symbol, "timestamp": timestamps[-len(values):], "close": values})
+        for symbol, values in closes.items()
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+def test_rs_ratios_and_ranking(timestamps):
+    steps = np.arange(SESSIONS)
+    benchmark = pd.Series(100 * 1.001 ** steps, index=timestamps)
+    panel = panel_for(timestamps, {
+        "FAST": 50 * 1.003 ** steps,
+        "SLOW": 80 * 1.0005 ** steps,
+        "FLAT": np.full(SESSIONS, 10.0),
+        "NEW": 20 * 1.004 ** steps[:100],  # Listed 100 sessions ago
+    })
+
+    ratios = compute_rs_ratios(panel, benchmark)
+    assert ratios.loc["FAST", "rs_63"] == pytest.approx((1.003 / 1.001) ** 63)
+    assert ratios.loc["FLAT", "rs_252"] == pytest.approx(1.001 ** -252)
+    assert np.isnan(ratios.loc["NEW", "rs_126"]) and not np.isnan(ratios.loc["NEW", "rs_63"])
+
+    rankings = to_relative_strength(rank_relative_strength(ratios))
+    assert [rs.symbol for rs in rankings] == ["NEW", "FAST", "SLOW", "FLAT"]
+    assert rankings[0].rating == 99 and rankings[-1].rating == 25
+    assert rankings[0].ratios[252] is None
+    assert rankings[1].ranks[252] == pytest.approx(100.0)
+
+def test_rs_ratios_empty_panel(timestamps):
+    benchmark = pd.Series(np.ones(SESSIONS), index=timestamps)
+    ratios = compute_rs_ratios(pd.DataFrame(), benchmark)
+    assert ratios.empty
+    assert rank_relative_strength(ratios).empty
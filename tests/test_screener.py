@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingai.domain.screener import (
+    SMA_30_WEEK_PERIOD,
+    ScreenCandidate,
+    ScreenCriteria,
+    Shortlist,
+    compute_screen_indicators,
+    filter_stage2,
+    to_candidates,
+)
+
+SESSIONS = 200
+
+@pytest.fixture
+def panel():
+    """UP accelerates on rising volume, DOWN declines, SHORT lacks 30 weeks of history"""
+    timestamps = pd.date_range("2024-01-01 18:30", periods=SESSIONS, freq="B", tz="UTC")
+    steps = np.arange(SESSIONS)
+    volume = np.full(SESSIONS, 1000.0)
+    volume[-5:] = 3000.0
+    frames = [
+        pd.DataFrame({"symbol": "UP", "timestamp": timestamps, "close": 100 * 1.0001 ** (steps ** 1.5), "volume": volume}),
+        pd.DataFrame({"symbol": "DOWN", "timestamp": timestamps, "close": 100 * 0.998 ** steps, "volume": volume}),
+        pd.DataFrame({"symbol": "SHORT", "timestamp": timestamps[-100:], "close": 50 * 1.01 ** steps[:100], "volume": volume[-100:]}),
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+def candidate(symbol: str, score: float) -> ScreenCandidate:
+    return ScreenCandidate(symbol, score, close=100.0, sma_30_week=90.0, macd_histogram=1.0, volume_ratio=1.5)
+
+def test_indicators_per_symbol(panel):
+    indicators = compute_screen_indicators(panel)
+    up = panel[panel["symbol"] == "UP"]
+
+    assert sorted(indicators.index) == ["DOWN", "SHORT", "UP"]
+    assert indicators.loc["UP", "close"] == pytest.approx(up["close"].iloc[-1])
+    assert indicators.loc["UP", "sma_30_week"] == pytest.approx(up["close"].iloc[-SMA_30_WEEK_PERIOD:].mean())
+    assert indicators.loc["UP", "volume_ratio"] == pytest.approx(3000 / (45 * 1000 + 5 * 3000) * 50)
+    assert indicators.loc["UP", "macd_histogram"] > indicators.loc["UP", "macd_histogram_prev"] > 0
+    assert np.isnan(indicators.loc["SHORT", "sma_30_week"])
+
+def test_empty_panel_has_indicator_columns():
+    indicators = compute_screen_indicators(pd.DataFrame())
+    assert indicators.empty
+    assert "macd_histogram_prev" in indicators.columns
+
+def test_filter_stage2_keeps_uptrends_only(panel):
+    indicators = compute_screen_indicators(panel)
+    assert list(filter_stage2(indicators, ScreenCriteria()).index) == ["UP"]
+    assert filter_stage2(indicators, ScreenCriteria(min_volume_ratio=5.0)).empty
+
+def test_filter_stage2_rising_macd_is_optional():
+    indicators = pd.DataFrame({
+        "close": [110.0], "sma_30_week": [100.0], "macd_histogram": [1.0],
+        "macd_histogram_prev": [2.0], "volume_ratio": [1.5]
+    }, index=["FADING"])
+    assert filter_stage2(indicators, ScreenCriteria()).empty
+    assert list(filter_stage2(indicators, ScreenCriteria(require_rising_macd=False)).index) == ["FADING"]
+
+def test_candidates_are_scored(panel):
+    candidates = to_candidates(filter_stage2(compute_screen_indicators(panel), ScreenCriteria()))
+    assert [c.symbol for c in candidates] == ["UP"]
+    assert candidates[0].score > 0
+
+def test_shortlist_keeps_top_scores_across_chunks():
+    shortlist = Shortlist(size=3)
+    shortlist.add([candidate("A", 1.0), candidate("B", 5.0)])
+    shortlist.add([candidate("C", 3.0), candidate("D", 0.5), candidate("E", 4.0)])
+    shortlist.add([])
+
+    assert len(shortlist) == 3
+    assert [c.symbol for c in shortlist.ranked()] == ["B", "E", "C"]
@@ -0,0 +1,108 @@
+from datetime import date
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingai.domain.sector_analysis import (
+    aggregate_sectors,
+    benchmark_returns,
+    compute_market_breadth,
+    compute_symbol_metrics,
+    to_sector_performance,
+    SectorSnapshot,
+)
+from tradingai.repository.sector_repository import load_sector_map
+
+def make_panel(growth: dict, sessions: int = 260) -> pd.DataFrame:
+    """Long-format panel where each symbol compounds at a fixed daily rate"""
+    timestamps = pd.bdate_range("2023-01-02", periods=sessions, tz="UTC")
+    frames = [
+        pd.DataFrame({"symbol": symbol, "timestamp": timestamps, "close": 100.0 * (1 + rate) ** np.arange(sessions)})
+        for symbol, rate in growth.items()
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+def test_symbol_metrics():
+    metrics = compute_symbol_metrics(make_panel({"UP": 0.01, "DOWN": -0.01}))
+
+    assert metrics.loc["UP", "return_1"] == pytest.approx(0.01)
+    assert metrics.loc["DOWN", "return_5"] == pytest.approx(0.99 ** 5 - 1)
+    assert metrics.loc["UP", "above_sma_50"] == 1.0
+    assert metrics.loc["DOWN", "above_sma_50"] == 0.0
+    assert metrics.loc["UP", "new_high"] == 1.0
+    assert metrics.loc["DOWN", "new_low"] == 1.0
+
+def test_short_history_leaves_breadth_unknown():
+    metrics = compute_symbol_metrics(make_panel({"NEW": 0.01}, sessions=30))
+
+    assert metrics.loc["NEW", "return_21"] == pytest.approx(1.01 ** 21 - 1)
+    assert np.isnan(metrics.loc["NEW", "return_63"])
+    assert np.isnan(metrics.loc["NEW", "above_sma_50"])
+    assert np.isnan(metrics.loc["NEW", "new_high"])
+
+def test_chunks_align_to_benchmark_sessions():
+    """A chunk whose symbols all missed the last session is measured over the same sessions as the rest"""
+    panel = make_panel({"LIVE": 0.01, "HALTED": 0.02})
+    sessions = pd.Index(panel["timestamp"].unique())
+    stale = panel[(panel["symbol"] == "HALTED") & (panel["timestamp"] < sessions[-1])]
+
+    metrics = compute_symbol_metrics(stale, sessions)
+    assert np.isnan(metrics.loc["HALTED", "return_1"])
+    assert metrics.loc["HALTED", "return_5"] == pytest.approx(1.02 ** 4 - 1)
+
+    breadth = compute_market_breadth(compute_symbol_metrics(pd.concat([panel[panel["symbol"] == "LIVE"], stale]), sessions))
+    assert (breadth.symbols, breadth.advancers, breadth.decliners, breadth.unchanged) == (2, 1, 0, 0)
+
+def test_sectors_ranked_by_momentum():
+    metrics = compute_symbol_metrics(make_panel({"A1": 0.01, "A2": 0.005, "B1": -0.01, "B2": 0.0, "X": 0.02}))
+    sectors = to_sector_performance(aggregate_sectors(metrics, {"A1": "IT", "A2": "IT", "B1": "Banks", "B2": "Banks"}))
+
+    assert [s.sector for s in sectors] == ["IT", "Banks"]
+    it, banks = sectors
+    assert it.rank == 1 and it.symbols == 2
+    assert it.returns[1] == pytest.approx((0.01 + 0.005) / 2)
+    assert it.advancers == 2 and it.advance_ratio == 1.0
+    assert banks.decliners == 1 and banks.advance_ratio == 0.0
+    assert it.momentum > banks.momentum
+
+def test_market_breadth_covers_unclassified_symbols():
+    metrics = compute_symbol_metrics(make_panel({"A": 0.01, "B": -0.01, "C": 0.0, "D": 0.02}))
+    breadth = compute_market_breadth(metrics, benchmark_returns(pd.Series(100.0 * 1.01 ** np.arange(30))))
+
+    assert (breadth.symbols, breadth.advancers, breadth.decliners, breadth.unchanged) == (4, 2, 1, 1)
+    assert breadth.advance_decline_ratio == 2.0
+    # The flat symbol sits at both its 52-week high and low
+    assert (breadth.new_highs, breadth.new_lows) == (3, 2)
+    assert breadth.benchmark_returns[5] == pytest.approx(1.01 ** 5 - 1)
+    assert breadth.benchmark_returns[63] is None
+
+def test_sector_context():
+    metrics = compute_symbol_metrics(make_panel({"A1": 0.01, "B1": -0.01}))
+    snapshot = SectorSnapshot(
+        run_date=date(2024, 1, 2),
+        breadth=compute_market_breadth(metrics),
+        sectors=to_sector_performance(aggregate_sectors(metrics, {"A1": "IT", "B1": "Banks"})),
+        symbol_sectors={"A1": "IT", "B1": "Banks"}
+    )
+
+    context = snapshot.sector_context("B1")
+    assert context["name"] == "Banks"
+    assert (context["rank"], context["sectors"]) == (2, 2)
+    assert snapshot.sector_context("UNKNOWN") is None
+
+def test_load_sector_map(tmp_path):
+    path = tmp_path / "ind_nifty50list.csv"
+    path.write_text(
+        "Company Name,Industry,Symbol,Series,ISIN Code\n"
+        "Infosys Ltd.,Information Technology,INFY,EQ,INE009A01021\n"
+        "HDFC Bank Ltd.,Financial Services,HDFCBANK,EQ,INE040A01034\n"
+    )
+
+    assert load_sector_map(str(path)) == {"INFY": "Information Technology", "HDFCBANK": "Financial Services"}
+
+def test_load_sector_map_requires_columns(tmp_path):
+    path = tmp_path / "sectors.csv"
+    path.write_text("Name,Symbol\nInfosys,INFY\n")
+
+    with pytest.raises(ValueError):
+        load_sector_map(str(path))
@@ -0,0 +1,116 @@
+import asyncio
+from datetime import date, datetime, timedelta
+import pandas as pd
+import pytest
+
+from tradingai.domain.bar_builder import Bar, BarBuilder
+from tradingai.domain.signal_evaluator import (
+    BULLISH, RULE_MACD_FLIP, RULE_SMA_CROSS, RULE_VOLUME_SPIKE, Alert, SignalEvaluator
+)
+from tradingai.domain.trading_calendar import IST
+from tradingai.repository.mock_data import generate_candles
+from tradingai.api.alerts import alerts_websocket
+from tradingai.service.alert_broker import AlertBroker, set_alert_broker
+
+def day_bar(symbol: str, day: date, close: float, volume: int, open_: float = None) -> Bar:
+    open_ = close if open_ is None else open_
+    return Bar(symbol, IST.localize(datetime.combine(day, datetime.min.time())),
+               open_, max(open_, close), min(open_, close), close, volume)
+
+def test_incremental_indicators_match_analyzer():
+    df = generate_candles("INFY", datetime(2023, 1, 1), datetime(2024, 6, 30)).to_frame()
+    evaluator = SignalEvaluator()
+    evaluator.seed("INFY", zip(df["timestamp"].dt.to_pydatetime(), df["close"], df["volume"]))
+    indicators = evaluator.indicators("INFY")
+
+    close = df["close"]
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    histogram = macd - macd.ewm(span=9, adjust=False).mean()
+    assert indicators.sma_30_week == pytest.approx(close.rolling(window=150).mean().iloc[-1])
+    assert indicators.macd_histogram == pytest.approx(histogram.iloc[-1])
+    assert indicators.bollinger_middle == pytest.approx(close.rolling(window=20).mean().iloc[-1])
+    assert indicators.volume_ema_30 == pytest.approx(df["volume"].ewm(span=30).mean().iloc[-1])
+
+def test_alerts_fire_once_per_session():
+    start = date(2024, 1, 1)
+    history = [(IST.localize(datetime.combine(start + timedelta(days=i), datetime.min.time())), 100.0 - i * 0.01, 1000)
+               for i in range(200)]
+    evaluator = SignalEvaluator(volume_spike_ratio=2.0)
+    evaluator.seed("TCS", history)
+    today = start + timedelta(days=200)
+
+    # A breakout in the live bar raises provisional alerts
+    alerts = evaluator.on_live_bar(day_bar("TCS", today, 110.0, 5000, open_=98.0))
+    assert {a.rule for a in alerts} == {RULE_SMA_CROSS, RULE_MACD_FLIP, RULE_VOLUME_SPIKE}
+    assert all(a.provisional and a.direction == BULLISH for a in alerts)
+
+    # Neither later minutes nor the session close repeat them
+    assert evaluator.on_live_bar(day_bar("TCS", today, 111.0, 6000, open_=98.0)) == []
+    assert evaluator.on_day_close(day_bar("TCS", today, 111.0, 6000, open_=98.0)) == []
+    assert evaluator.indicators("TCS").close == 111.0
+    # Sessions already in the history are ignored
+    assert evaluator.on_day_close(day_bar("TCS", today, 50.0, 6000)) == []
+
+def test_builder_reports_minute_close():
+    seen = []
+    builder = BarBuilder(on_minute_close=lambda day: seen.append(day.close))
+    base = int(IST.localize(datetime(2024, 1, 2, 9, 15)).timestamp())
+    builder.on_tick("TCS", 100.0, 10, base)
+    builder.on_tick("TCS", 101.0, 20, base + 30)
+    assert seen == []
+    builder.on_tick("TCS", 102.0, 30, base + 60)
+    assert seen == [102.0]
+
+@pytest.mark.asyncio
+async def test_broker_filters_and_drops_oldest():
+    broker = AlertBroker(queue_size=2)
+    tcs = broker.subscribe(symbols=["TCS"])
+    everything = broker.subscribe()
+    now = IST.localize(datetime(2024, 1, 2))
+    alerts = [Alert(symbol, RULE_SMA_CROSS, BULLISH, now, 1.0, False) for symbol in ("TCS", "INFY", "TCS")]
+    broker.publish(alerts)
+
+    assert tcs.queue.qsize() == 2 and tcs.dropped == 0
+    assert everything.dropped == 1
+    assert (await asyncio.wait_for(everything.get(), 1)).symbol == "INFY"
+    broker.unsubscribe(tcs)
+    assert broker.subscriber_count == 1
+    assert len(broker.recent()) == 3
+
+class FakeWebSocket:
+    """Accepts, records sent messages and disconnects once `close` is set"""
+
+    def __init__(self):
+        self.sent = []
+        self.close = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def receive(self):
+        await self.close.wait()
+        return {"type": "websocket.disconnect", "code": 1000}
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+@pytest.mark.asyncio
+async def test_websocket_delivers_alerts_and_unsubscribes_on_disconnect():
+    broker = AlertBroker()
+    set_alert_broker(broker)
+    websocket = FakeWebSocket()
+    alert = Alert("TCS", RULE_SMA_CROSS, BULLISH, IST.localize(datetime(2024, 1, 2)), 1.0, False)
+    try:
+        handler = asyncio.create_task(alerts_websocket(websocket, symbols="TCS"))
+        await asyncio.sleep(0)
+        assert broker.subscriber_count == 1
+        broker.publish([alert])
+        await asyncio.sleep(0.01)
+        assert [message["symbol"] for message in websocket.sent] == ["TCS"]
+
+        # With no alerts pending, the disconnect alone must end the handler
+        websocket.close.set()
+        await asyncio.wait_for(handler, 1)
+        assert broker.subscriber_count == 0
+    finally:
+        set_alert_broker(None)
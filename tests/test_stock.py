@@ -7,8 +7,10 @@ import pandas as pd
 
 from tradingai.service.stock_service import StockService
 from tradingai.domain.stock_analysis import StockAnalysis, DailyData, BollingerBands
-from tradingai.domain.market_analysis import MarketDirection
+from tradingai.domain.market_analysis import MarketDirection, MarketCondition
 from tradingai.domain.llm_trade import TradingSignal
+from tradingai.domain.models import TradingSignalRecord
+from tradingai.domain.symbol_index import InstrumentEntry, SymbolIndex
 
 @pytest.fixture
 def mock_db():
@@ -34,13 +36,15 @@ def stock_service(mock_db, mock_zerodha_client):
 async def test_fetch_historical_data_success(stock_service):
     """Test successful historical data fetch"""
     # Setup
-    symbols = ["ZOTA"]
+    symbols = ["zota"]  # Validated case-insensitively, stored under the exchange spelling
     from_date = datetime.now(pytz.UTC) - timedelta(days=10)
     to_date = datetime.now(pytz.UTC)
     
     # Mock instrument service
     stock_service.instrument_service.get_instrument_token = AsyncMock(return_value=12345)
-    stock_service.instrument_service.validate_symbols = AsyncMock(return_value=(True, []))
+    stock_service.instrument_service.get_symbol_index = AsyncMock(
+        return_value=SymbolIndex([InstrumentEntry("ZOTA", 12345)])
+    )
     
     # Mock get_existing_records to return empty set
     stock_service.get_existing_records = AsyncMock(return_value=set())
@@ -58,6 +62,7 @@ async def test_fetch_historical_data_success(stock_service):
     
     # Mock successful DB insert
     mock_result = AsyncMock()
+    mock_result.rowcount = 1
     stock_service.db.execute = AsyncMock(return_value=mock_result)
     stock_service.db.commit = AsyncMock()
     
@@ -68,7 +73,7 @@ async def test_fetch_historical_data_success(stock_service):
     
     # Assert
     assert total_records == 1  # One record inserted
-    assert stock_service.zerodha_client.fetch_historical_data.called
+    assert stock_service.zerodha_client.fetch_historical_data.call_args.args[0] == "ZOTA"
     assert stock_service.db.commit.called
 
 @pytest.mark.asyncio
@@ -224,4 +229,92 @@ async def test_analyze_stock_no_data(stock_service):
     
     with pytest.raises(ValueError) as exc_info:
         await stock_service.analyze_stock("NOSYMBOL")
-    assert "No historical data found" in str(exc_info.value) 
\ No newline at end of file
+    assert "No historical data found" in str(exc_info.value)
+
+@pytest.mark.asyncio
+async def test_analyze_stock_with_decision_gated(stock_service):
+    """Bearish market with a stock in downtrend returns HOLD without calling the LLM"""
+    mock_analysis = StockAnalysis(
+        symbol="ZOTA",
+        current_price=90.0,
+        sma_30_week=95.0,
+        is_above_30_week=False,
+        macd=-2.0,
+        macd_signal=-1.0,
+        macd_histogram=-1.0,
+        is_bullish_macd=False,
+        volume_ema_30=50000,
+        volume_increase_pct=-10.0,
+        is_volume_high=False,
+        bollinger=BollingerBands(
+            upper=105.0,
+            middle=100.0,
+            lower=95.0,
+            monthly_upper=110.0,
+            is_correction=True
+        ),
+        last_10_days=[]
+    )
+    market_condition = MarketCondition(
+        direction=MarketDirection.BEARISH,
+        score=-4,
+        breadth=0.3,
+        date=datetime.now(pytz.UTC).date()
+    )
+    
+    with patch.object(stock_service, 'analyze_stock', return_value=mock_analysis), \
+         patch.object(stock_service.market_service, 'get_latest_market_condition', return_value=market_condition), \
+         patch.object(stock_service.llm_analyzer, 'analyze', new_callable=AsyncMock) as mock_llm:
+        
+        _, trading_signal = await stock_service.analyze_stock_with_decision("ZOTA")
+        
+        assert trading_signal.decision == "HOLD"
+        assert not mock_llm.called
+
+@pytest.mark.asyncio
+async def test_analyze_stock_with_decision_reuses_stored_signal(stock_service):
+    """A decision already made on the same bar is returned without calling the LLM"""
+    bar_date = datetime(2024, 1, 2, tzinfo=pytz.UTC)
+    mock_analysis = StockAnalysis(
+        symbol="ZOTA",
+        current_price=100.0,
+        sma_30_week=95.0,
+        is_above_30_week=True,
+        macd=2.0,
+        macd_signal=1.0,
+        macd_histogram=1.0,
+        is_bullish_macd=True,
+        volume_ema_30=50000,
+        volume_increase_pct=10.0,
+        is_volume_high=True,
+        bollinger=BollingerBands(
+            upper=105.0,
+            middle=100.0,
+            lower=95.0,
+            monthly_upper=110.0,
+            is_correction=False
+        ),
+        last_10_days=[
+            DailyData(date=pd.Timestamp(bar_date), open=100.0, high=105.0, low=98.0, close=102.0, volume=10000)
+        ]
+    )
+    stored = TradingSignalRecord(
+        symbol="ZOTA",
+        decision="BUY",
+        entry_price=100.0,
+        stop_loss=95.0,
+        allocation_percentage=5.0,
+        reasoning=["Stored"],
+        as_of=bar_date,
+        created_at=datetime.now(pytz.UTC) - timedelta(minutes=5)
+    )
+    
+    with patch.object(stock_service, 'analyze_stock', return_value=mock_analysis), \
+         patch.object(stock_service.trade_repo, 'get_latest_signals', return_value={"ZOTA": stored}), \
+         patch.object(stock_service.llm_analyzer, 'analyze', new_callable=AsyncMock) as mock_llm:
+        
+        _, trading_signal = await stock_service.analyze_stock_with_decision("ZOTA")
+        
+        assert trading_signal.decision == "BUY"
+        assert trading_signal.reasoning == ["Stored"]
+        assert not mock_llm.called
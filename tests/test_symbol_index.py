@@ -0,0 +1,45 @@
+from tradingai.domain.symbol_index import InstrumentEntry, SymbolIndex
+
+ENTRIES = [
+    InstrumentEntry("TCS", 2953217, "TATA CONSULTANCY SERVICES", "NSE", "EQ"),
+    InstrumentEntry("INFY", 408065, "INFOSYS", "NSE", "EQ"),
+    InstrumentEntry("NIFTY 50", 256265, "NIFTY 50", "NSE", "EQ"),
+]
+
+def test_lookup_is_case_insensitive():
+    index = SymbolIndex(ENTRIES)
+    assert index.get_token("INFY") == 408065
+    assert index.get_token("infy") == 408065
+    assert index.get_token("WIPRO") is None
+    assert "tcs" in index
+
+def test_symbols_are_sorted_and_invalid_symbols_reported():
+    index = SymbolIndex(ENTRIES)
+    assert index.symbols == ["INFY", "NIFTY 50", "TCS"]
+    assert index.invalid_symbols(["tcs", "WIPRO", "INFY"]) == ["WIPRO"]
+
+def test_version_tracks_content():
+    assert SymbolIndex(ENTRIES).version == SymbolIndex(reversed(ENTRIES)).version
+    assert SymbolIndex(ENTRIES).version != SymbolIndex(ENTRIES[:2]).version
+
+def test_search_ranks_exact_then_prefix_then_fuzzy():
+    index = SymbolIndex(ENTRIES + [InstrumentEntry("TCSL", 1, "TCS LEISURE", "NSE", "EQ")])
+    results = index.search("tcs")
+    assert [(m.entry.tradingsymbol, m.match_type) for m in results[:2]] == [("TCS", "exact"), ("TCSL", "symbol_prefix")]
+    assert index.search("infosis")[0].entry.tradingsymbol == "INFY"
+    assert index.search("consultancy")[0].entry.tradingsymbol == "TCS"
+
+def test_search_finds_short_symbols_past_the_limit():
+    crowded = [InstrumentEntry(f"TCA{i:02d}", i, f"TCA {i}", "NSE", "EQ") for i in range(12)]
+    index = SymbolIndex(crowded + ENTRIES)
+    assert index.search("tcs", limit=3)[0].match_type == "exact"
+    results = index.search("tc", limit=3)
+    assert [m.entry.tradingsymbol for m in results] == ["TCS", "TCA00", "TCA01"]
+
+def test_keyset_pages_cover_filtered_entries():
+    index = SymbolIndex(ENTRIES + [InstrumentEntry("SENSEX", 2, "SENSEX", "BSE", "EQ")])
+    page, cursor = index.page(limit=2, exchange="NSE")
+    assert [e.tradingsymbol for e in page] == ["INFY", "NIFTY 50"]
+    page, cursor = index.page(limit=2, after=cursor, exchange="NSE")
+    assert [e.tradingsymbol for e in page] == ["TCS"]
+    assert cursor is None
@@ -0,0 +1,65 @@
+from datetime import datetime
+import pandas as pd
+import pytest
+
+from tradingai.domain.bar_builder import Bar
+from tradingai.domain.timeframes import (
+    DAY, MONTH, WEEK, SeriesCache, apply_live_bar, compute_indicators, resample_ohlcv
+)
+from tradingai.domain.trading_calendar import IST
+from tradingai.repository.mock_data import generate_candles
+
+@pytest.fixture
+def daily():
+    df = generate_candles("TCS", datetime(2023, 1, 1), datetime(2024, 1, 31)).to_frame()
+    # Stored like stock_data: midnight IST in UTC
+    df["timestamp"] = df["timestamp"].dt.tz_localize(IST).dt.tz_convert("UTC")
+    return df.set_index("timestamp")
+
+def test_weekly_bars_aggregate_ist_weeks(daily):
+    weekly = resample_ohlcv(daily, WEEK)
+    # Week of Jan 22 2024: Monday and Friday are holidays
+    week = daily[(daily.index >= "2024-01-22") & (daily.index < "2024-01-26")]
+    bar = weekly.loc[week.index[-1]]
+    assert bar["open"] == week["open"].iloc[0]
+    assert bar["high"] == week["high"].max()
+    assert bar["low"] == week["low"].min()
+    assert bar["close"] == week["close"].iloc[-1]
+    assert bar["volume"] == week["volume"].sum()
+    # Labelled with the last session, Thursday Jan 25 IST
+    assert week.index[-1].tz_convert(IST).date() == datetime(2024, 1, 25).date()
+
+    monthly = resample_ohlcv(daily, MONTH)
+    assert len(monthly) == 13
+    assert monthly["volume"].sum() == daily["volume"].sum()
+
+def test_apply_live_bar_updates_current_period(daily):
+    weekly = resample_ohlcv(daily, WEEK)
+    last = weekly.iloc[-1]
+    # Jan 31 2024 is a Wednesday; Feb 1 falls in the same week
+    live = Bar("TCS", IST.localize(datetime(2024, 2, 1)), 1.0, 1e6, 0.5, 2.0, 100)
+    updated = apply_live_bar(weekly, live, WEEK)
+    assert len(updated) == len(weekly)
+    assert (updated["open"].iloc[-1], updated["high"].iloc[-1], updated["low"].iloc[-1]) == (last["open"], 1e6, 0.5)
+    assert updated["volume"].iloc[-1] == last["volume"] + 100
+    assert weekly["close"].iloc[-1] == last["close"]  # Cached frame untouched
+
+    monthly = apply_live_bar(resample_ohlcv(daily, MONTH), live, MONTH)
+    assert monthly["close"].iloc[-1] == 2.0 and monthly["volume"].iloc[-1] == 100
+
+def test_compute_indicators_per_timeframe(daily):
+    day = compute_indicators(daily, DAY)
+    assert day.sma_30_week == pytest.approx(daily["close"].rolling(150).mean().iloc[-1])
+    week = compute_indicators(resample_ohlcv(daily, WEEK), WEEK)
+    assert week.sma_30_week is not None and week.bars < day.bars
+    month = compute_indicators(resample_ohlcv(daily, MONTH), MONTH)
+    assert month.bollinger_middle is None  # Fewer than 20 monthly bars
+
+def test_series_cache_lru(daily):
+    cache = SeriesCache(max_symbols=1, ttl_seconds=60)
+    frames = cache.put("TCS", daily)
+    assert cache.get("TCS") is frames
+    cache.put("INFY", daily)
+    assert cache.get("TCS") is None and len(cache) == 1
+    cache.invalidate("INFY")
+    assert cache.get("INFY") is None
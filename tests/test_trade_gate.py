@@ -0,0 +1,100 @@
+from datetime import date, datetime
+import pytest
+
+from tradingai.domain.candle_patterns import CandleGroup, CandlePatterns
+from tradingai.domain.market_analysis import MarketCondition, MarketDirection
+from tradingai.domain.stock_analysis import BollingerBands, StockAnalysis
+from tradingai.domain.trade_gate import (
+    RULE_BEARISH_DOWNTREND,
+    RULE_MISALIGNED_TREND,
+    RULE_NO_CANDLE_GROUP,
+    RULE_WEAK_MARKET_SCORE,
+    STORED_SIGNAL_RULE,
+    TradeGate,
+    TradeGateConfig,
+    TradeGateStats,
+)
+
+GROUP = CandleGroup("MC", datetime(2024, 1, 1), datetime(2024, 1, 2), 2, high=105.0, low=98.0)
+
+def market(direction: MarketDirection, score: int = 0) -> MarketCondition:
+    return MarketCondition(direction=direction, score=score, date=date(2024, 1, 2))
+
+def analysis(trend: str, patterns: CandlePatterns = None) -> StockAnalysis:
+    """A stock in an uptrend, a downtrend, or mixed (above the SMA with a negative histogram)"""
+    above = trend in ("up", "mixed")
+    histogram = 1.0 if trend == "up" else -1.0
+    return StockAnalysis(
+        symbol="ZOTA",
+        current_price=100.0,
+        sma_30_week=95.0 if above else 105.0,
+        is_above_30_week=above,
+        macd=histogram,
+        macd_signal=0.0,
+        macd_histogram=histogram,
+        is_bullish_macd=histogram > 0,
+        bollinger=BollingerBands(upper=105.0, middle=100.0, lower=95.0, monthly_upper=110.0, is_correction=False),
+        volume_ema_30=50000,
+        volume_increase_pct=0.0,
+        is_volume_high=False,
+        last_10_days=[],
+        candle_patterns=patterns
+    )
+
+@pytest.fixture
+def stats():
+    return TradeGateStats()
+
+def gate(stats: TradeGateStats, **config) -> TradeGate:
+    return TradeGate(TradeGateConfig(**config), stats)
+
+def test_bearish_downtrend_is_held(stats):
+    result = gate(stats).evaluate(market(MarketDirection.BEARISH), analysis("down"))
+    assert result.skip_llm and result.rule == RULE_BEARISH_DOWNTREND
+    assert result.hold_signal().decision == "HOLD"
+    assert not gate(stats, hold_on_bearish_downtrend=False, hold_on_misaligned_trend=False).evaluate(
+        market(MarketDirection.BEARISH), analysis("down")
+    ).skip_llm
+
+@pytest.mark.parametrize("direction, trend", [(MarketDirection.BEARISH, "up"), (MarketDirection.BULLISH, "down")])
+def test_misaligned_trend_is_held(stats, direction, trend):
+    result = gate(stats).evaluate(market(direction), analysis(trend))
+    assert result.skip_llm and result.rule == RULE_MISALIGNED_TREND
+    assert not gate(stats, hold_on_misaligned_trend=False).evaluate(market(direction), analysis(trend)).skip_llm
+
+def test_weak_market_score_is_held(stats):
+    result = gate(stats, min_market_score=2).evaluate(market(MarketDirection.BULLISH, score=1), analysis("up"))
+    assert result.skip_llm and result.rule == RULE_WEAK_MARKET_SCORE
+    assert not gate(stats, min_market_score=2).evaluate(market(MarketDirection.BULLISH, score=2), analysis("up")).skip_llm
+    assert not gate(stats).evaluate(market(MarketDirection.BULLISH, score=-6), analysis("up")).skip_llm
+
+def test_missing_candle_group_is_held(stats):
+    no_group = CandlePatterns(labels=["IC", "MC"])
+    result = gate(stats).evaluate(market(MarketDirection.BULLISH), analysis("up", no_group))
+    assert result.skip_llm and result.rule == RULE_NO_CANDLE_GROUP
+    with_group = CandlePatterns(labels=["MC", "MC"], groups=[GROUP], latest_group=GROUP)
+    assert not gate(stats).evaluate(market(MarketDirection.BULLISH), analysis("up", with_group)).skip_llm
+    # Patterns that were never computed do not block the LLM
+    assert not gate(stats).evaluate(market(MarketDirection.BULLISH), analysis("up")).skip_llm
+
+def test_mixed_setups_and_disabled_gate_reach_the_llm(stats):
+    assert not gate(stats).evaluate(market(MarketDirection.BEARISH), analysis("mixed")).skip_llm
+    assert not gate(stats, enabled=False).evaluate(market(MarketDirection.BEARISH), analysis("down")).skip_llm
+
+def test_stats_count_outcomes_by_rule(stats):
+    gate(stats).evaluate(market(MarketDirection.BEARISH), analysis("down"))
+    gate(stats).evaluate(market(MarketDirection.BEARISH), analysis("down"))
+    gate(stats).evaluate(market(MarketDirection.BULLISH), analysis("down"))
+    gate(stats).evaluate(market(MarketDirection.BULLISH), analysis("up"))
+    gate(stats).evaluate(market(MarketDirection.BULLISH), analysis("up"))
+    stats.record_reuse()
+
+    snapshot = stats.snapshot()
+    assert snapshot["evaluated"] == 5
+    assert snapshot["llm_calls"] == 1
+    assert snapshot["llm_calls_avoided"] == 4
+    assert snapshot["avoided_pct"] == pytest.approx(80.0)
+    assert snapshot["avoided_by_rule"] == {RULE_BEARISH_DOWNTREND: 2, RULE_MISALIGNED_TREND: 1, STORED_SIGNAL_RULE: 1}
+
+    stats.reset()
+    assert stats.snapshot()["evaluated"] == 0 and stats.snapshot()["avoided_pct"] == 0.0
@@ -0,0 +1,70 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from tradingai.domain.llm_trade import TradingSignal
+from tradingai.repository.trade_repository import SignalWriter, TradeRepository, signal_row
+
+def make_signal(decision: str = "BUY") -> TradingSignal:
+    return TradingSignal(
+        decision=decision, entry_price=100.0, stop_loss=95.0, allocation_percentage=5.0, reasoning=["test"]
+    )
+
+class FakeSessions:
+    """Session factory whose sessions record executed batches"""
+
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+
+    @asynccontextmanager
+    async def __call__(self):
+        db = AsyncMock()
+
+        async def execute(statement, rows):
+            if self.fail:
+                raise RuntimeError("database unavailable")
+            self.batches.append(rows)
+
+        db.execute.side_effect = execute
+        yield db
+
+@pytest.mark.asyncio
+async def test_signal_writer_batches_rows():
+    sessions = FakeSessions()
+    writer = SignalWriter(session_factory=sessions, batch_size=2, flush_seconds=60)
+    writer.add(signal_row("TCS", make_signal()))
+    assert writer.pending_latest("TCS").decision == "BUY"
+    assert sessions.batches == []
+
+    writer.add(signal_row("INFY", make_signal("HOLD")))
+    await asyncio.sleep(0)  # Full batch is written by a background task
+    await writer.close()
+
+    assert [[row["symbol"] for row in batch] for batch in sessions.batches] == [["TCS", "INFY"]]
+    assert writer.pending_latest("TCS") is None
+
+@pytest.mark.asyncio
+async def test_signal_writer_keeps_rows_on_failure():
+    sessions = FakeSessions(fail=True)
+    writer = SignalWriter(session_factory=sessions, batch_size=10, flush_seconds=60)
+    writer.add(signal_row("TCS", make_signal()))
+
+    assert await writer.flush() == 0
+    assert writer.pending_latest("TCS") is not None
+
+    sessions.fail = False
+    assert await writer.flush() == 1
+    assert writer.pending_latest("TCS") is None
+    await writer.close()
+
+@pytest.mark.asyncio
+async def test_latest_signals_use_distinct_on():
+    db = AsyncMock()
+    db.execute.return_value = MagicMock()
+    await TradeRepository(db).get_latest_signals(["TCS", "INFY"])
+
+    sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("SELECT DISTINCT ON (trading_signals.symbol)")